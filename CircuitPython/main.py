@@ -1,7 +1,11 @@
+import board
+import busio
 import mcp9808
+from mcp9808.busio_bus import BusioTransport
 import time
 
-sensor = mcp9808.MCP9808(0x18)
+i2c = busio.I2C(board.SCL, board.SDA)
+sensor = mcp9808.MCP9808(0x18, BusioTransport(i2c))
 
 sensor.shutdown(0)
 
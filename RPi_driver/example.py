@@ -1,9 +1,15 @@
 #!/usr/bin/python3
 
-import time, mcp9808
+import os, sys, time
 
+# Let the example find the mcp9808 package in the folder above
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
-sensor = mcp9808.MCP9808()
+import mcp9808
+from mcp9808.linux import LinuxI2C
+
+
+sensor = mcp9808.MCP9808(0x18, LinuxI2C(1))
 
 while True:
     print(sensor.readTemp())
@@ -1,9 +1,14 @@
-import mcp9808
-import time
-
-
-sensor = mcp9808.MCP9808(0x18)
-
-while True:
-    print(sensor.readTemp())
-    time.sleep(0.5)
+import os, sys, time
+
+# Let the example find the mcp9808 package in the folder above
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import mcp9808
+from mcp9808.i2cdriver_bus import I2CDriverTransport
+
+
+sensor = mcp9808.MCP9808(0x18, I2CDriverTransport("COM41"))
+
+while True:
+    print(sensor.readTemp())
+    time.sleep(0.5)
@@ -0,0 +1,18 @@
+"""
+Driver for the MCP9808 temperature sensor.
+
+The sensor itself is core.MCP9808.  It reaches the hardware through a
+transport, picked to suit where it is running:
+
+    linux.LinuxI2C                    - /dev/i2c-N, e.g. a Raspberry Pi
+    i2cdriver_bus.I2CDriverTransport  - an I2CDriver on a PC
+    busio_bus.BusioTransport          - CircuitPython boards
+    fake.FakeTransport                - in memory, no hardware needed
+
+Only the portable pieces are imported here, so import the backend module you
+need directly.
+"""
+
+from .core import MCP9808, Sample
+from .transport import Transport
+from .fake import FakeDevice, FakeTransport
@@ -0,0 +1,122 @@
+"""
+asyncio support.  Bus transactions are blocking system calls, so
+AsyncMCP9808 runs them on an I/O thread and awaits the result, leaving the
+event loop free for everything else.  This needs threads, so is for Linux
+and PCs rather than CircuitPython.
+
+    import asyncio, mcp9808
+    from mcp9808.aio import AsyncMCP9808
+
+    async def main():
+        sensor = AsyncMCP9808(mcp9808.MCP9808(0x18))
+        print(await sensor.readTemp())
+        await sensor.configure(alertMode=1, alertControl=1)
+        async for sample in sensor.samples():
+            print(sample.temperature)
+
+    asyncio.run(main())
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .scheduler import ConversionScheduler
+
+
+class AsyncMCP9808:
+
+
+    """
+    sensor is the MCP9808 to wrap.  executor is what the bus transactions
+    are run on.  If it isn't given the sensor gets an I/O thread of its own.
+    Sensors sharing a transport should share a single threaded executor too,
+    so their transactions stay in order on the bus.
+    """
+    def __init__(self, sensor, executor = None):
+        self.sensor = sensor
+        self._ownExecutor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers = 1,
+                                          thread_name_prefix = "mcp9808")
+        self.executor = executor
+
+
+    """
+    Internal function to run a blocking call on the I/O thread and wait for
+    it without blocking the event loop.
+    """
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        if kwargs:
+            return await loop.run_in_executor(
+                self.executor, lambda: function(*args, **kwargs))
+        return await loop.run_in_executor(self.executor, function, *args)
+
+
+    """
+    Any public MCP9808 function (readTemp, setTUpper, configure, alertStatus
+    and so on) can be called on an AsyncMCP9808 and awaited.
+    """
+    def __getattr__(self, name):
+        function = getattr(self.sensor, name)
+        if name.startswith("_") or not callable(function):
+            return function
+
+        async def call(*args, **kwargs):
+            return await self._run(function, *args, **kwargs)
+        call.__name__ = name
+        return call
+
+
+    """
+    Like MCP9808.readOnce, but the wait for the conversion is an
+    asyncio.sleep rather than holding up the I/O thread.
+    """
+    async def readOnce(self, margin = 0.1):
+        config = await self._run(self.sensor.getConfig)
+        if not config["shutdown"]:
+            return await self._run(self.sensor.readTemp)
+        await self._run(self.sensor.shutdown, 0)
+        try:
+            wait = await self._run(self.sensor.conversionTime)
+            await asyncio.sleep(wait * (1 + margin))
+            return await self._run(self.sensor.readTemp)
+        finally:
+            await self._run(self.sensor.shutdown, 1)
+
+
+    """
+    An async iterator of Samples.  With no interval one fresh Sample is given
+    per conversion, timed as ConversionScheduler does.  With an interval in
+    seconds the sensor is read that often instead, and each Sample is
+    flagged fresh or not in the same way.
+    """
+    async def samples(self, interval = None, margin = 0.05):
+        scheduler = await self._run(ConversionScheduler, self.sensor, margin)
+        loop = asyncio.get_running_loop()
+        nextRead = loop.time()
+        while True:
+            if interval is None:
+                await asyncio.sleep(scheduler.timeUntilDue())
+            else:
+                await asyncio.sleep(max(0, nextRead - loop.time()))
+                nextRead = nextRead + interval
+            sample = await self._run(scheduler.readNow)
+            if sample.fresh or interval is not None:
+                yield sample
+
+
+    """
+    Shut down the I/O thread, if this sensor owns it.
+    """
+    def close(self):
+        if self._ownExecutor:
+            self.executor.shutdown(wait = False)
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *exc):
+        self.close()
@@ -0,0 +1,253 @@
+"""
+Reacting to the ALERT pin instead of polling.  With the alert output
+enabled, the MCP9808 drives its ALERT pin when the temperature leaves the
+tLower - tUpper window (or passes tCrit).  Wiring that pin to a GPIO lets
+the host sleep until it changes, then do a single read to find out why.
+
+    from mcp9808.alert import AlertMonitor, GPIOLine
+
+    sensor.configure(alertMode=1, alertControl=1)
+    monitor = AlertMonitor(sensor, GPIOLine("/dev/gpiochip0", 17))
+    while True:
+        event = monitor.waitForAlert()
+        print(event.sample.alertBits, event.sample.temperature)
+
+GPIOLine uses the Linux GPIO character device.  Anything with the same
+wait() and close() functions can stand in for it, e.g. FakeLine for testing
+against a SimulatedMCP9808.
+"""
+
+import ctypes, fcntl, os, select, struct, threading, time
+
+# From linux/gpio.h (the v1 character device ABI)
+GPIOHANDLE_REQUEST_INPUT = 1 << 0
+GPIOEVENT_REQUEST_RISING_EDGE = 1 << 0
+GPIOEVENT_REQUEST_FALLING_EDGE = 1 << 1
+GPIOEVENT_REQUEST_BOTH_EDGES = GPIOEVENT_REQUEST_RISING_EDGE \
+    | GPIOEVENT_REQUEST_FALLING_EDGE
+GPIO_GET_LINEEVENT_IOCTL = 0xC030B404
+# struct gpioevent_data: u64 timestamp in ns, u32 event id, padded to 16
+GPIOEVENT_DATA = struct.Struct("=QI4x")
+
+EDGES = {
+    "rising": GPIOEVENT_REQUEST_RISING_EDGE,
+    "falling": GPIOEVENT_REQUEST_FALLING_EDGE,
+    "both": GPIOEVENT_REQUEST_BOTH_EDGES,
+}
+
+
+"""
+ctypes mirror of the kernel's struct gpioevent_request.
+"""
+class gpioevent_request(ctypes.Structure):
+    _fields_ = [("lineoffset", ctypes.c_uint32),
+                ("handleflags", ctypes.c_uint32),
+                ("eventflags", ctypes.c_uint32),
+                ("consumer_label", ctypes.c_char * 32),
+                ("fd", ctypes.c_int)]
+
+
+class GPIOLine:
+
+
+    """
+    chip is the GPIO chip device (e.g. "/dev/gpiochip0") and line the line
+    offset on it that ALERT is wired to.  edge is "rising", "falling" or
+    "both".  An active low alert (alertPolarity 0, the default) asserts on
+    the falling edge.
+    """
+    def __init__(self, chip, line, edge = "falling"):
+        request = gpioevent_request(line, GPIOHANDLE_REQUEST_INPUT,
+                                    EDGES[edge], b"mcp9808-alert", 0)
+        chipFd = os.open(chip, os.O_RDONLY)
+        try:
+            fcntl.ioctl(chipFd, GPIO_GET_LINEEVENT_IOCTL, request)
+        finally:
+            os.close(chipFd)
+        self.fd = request.fd
+
+
+    """
+    A function to wait for an edge.  Returns the kernel's timestamp of the
+    edge in seconds, or None if timeout (in seconds) runs out first.
+    """
+    def wait(self, timeout = None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        timestamp, eventId = GPIOEVENT_DATA.unpack(
+            os.read(self.fd, GPIOEVENT_DATA.size))
+        return timestamp / 1e9
+
+
+    """
+    Release the GPIO line.
+    """
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class FakeLine:
+
+
+    """
+    A stand-in for GPIOLine.  Edges can be made by calling trigger(), or if a
+    SimulatedMCP9808 is given, its alert output is watched every
+    pollInterval seconds and an edge is reported when it becomes asserted.
+    """
+    def __init__(self, device = None, pollInterval = 0.005):
+        self.device = device
+        self.pollInterval = pollInterval
+        self._event = threading.Event()
+        self._wasAsserted = False
+
+
+    """
+    A function to report an edge to whoever is waiting.
+    """
+    def trigger(self):
+        self._event.set()
+
+
+    """
+    A function to wait for an edge, like GPIOLine.wait.
+    """
+    def wait(self, timeout = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.device is not None:
+                asserted = self.device.alertAsserted()
+                if asserted and not self._wasAsserted:
+                    self._event.set()
+                self._wasAsserted = asserted
+                step = self.pollInterval
+            else:
+                step = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                step = remaining if step is None else min(step, remaining)
+            if self._event.wait(step):
+                self._event.clear()
+                return time.monotonic()
+
+
+    def close(self):
+        pass
+
+
+"""
+What happened when the ALERT pin fired.  edgeTime is when the edge was seen
+and sample is the Sample read straight afterwards, whose alert flags say
+which limit was crossed.
+"""
+class AlertEvent:
+
+
+    def __init__(self, edgeTime, sample):
+        self.edgeTime = edgeTime
+        self.sample = sample
+
+
+    def __repr__(self):
+        return "AlertEvent(" + str(self.edgeTime) + ", " + repr(self.sample) \
+            + ")"
+
+
+class AlertMonitor:
+
+
+    """
+    sensor is the MCP9808 whose ALERT pin is wired to line (a GPIOLine or
+    anything like it).  If clearInterrupt is True and the sensor is in
+    interrupt mode, the interrupt is cleared after each alert so the pin can
+    fire again.
+    """
+    def __init__(self, sensor, line, clearInterrupt = True):
+        self.sensor = sensor
+        self.line = line
+        self.clearInterrupt = clearInterrupt
+        # The last error the monitor thread hit, and how many there have been
+        self.error = None
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+
+    """
+    A function to wait for the ALERT pin to fire.  Reads the temperature and
+    alert flags once (and clears the interrupt if set to) and returns an
+    AlertEvent, or None if timeout (in seconds) runs out first.
+    """
+    def waitForAlert(self, timeout = None):
+        edgeTime = self.line.wait(timeout)
+        if edgeTime is None:
+            return None
+        return self._handleEdge(edgeTime)
+
+
+    """
+    Internal function to read the sensor after an edge (and clear the
+    interrupt if set to) and make the AlertEvent.
+    """
+    def _handleEdge(self, edgeTime):
+        sample = self.sensor.readSample()
+        if self.clearInterrupt and self.sensor.getConfig()["alertMode"]:
+            self.sensor.intClear(1)
+        return AlertEvent(edgeTime, sample)
+
+
+    """
+    Internal function to note an error hit by the monitor thread.
+    """
+    def _recordError(self, error):
+        self.error = error
+        self.errors = self.errors + 1
+
+
+    """
+    A function to start a thread that calls callback with every AlertEvent.
+    Errors don't stop the thread: they are kept in self.error and counted in
+    self.errors.  If the sensor can't be read after an edge, the read is
+    tried again every retryInterval seconds so the alert isn't lost.
+    Exceptions raised by callback are recorded the same way.
+    """
+    def start(self, callback, retryInterval = 0.1):
+        self._stop.clear()
+
+        def run():
+            edgeTime = None
+            while not self._stop.is_set():
+                try:
+                    if edgeTime is None:
+                        # Wake up now and then to see if it is time to stop
+                        edgeTime = self.line.wait(0.5)
+                        if edgeTime is None:
+                            continue
+                    event = self._handleEdge(edgeTime)
+                except OSError as error:
+                    self._recordError(error)
+                    self._stop.wait(retryInterval)
+                    continue
+                edgeTime = None
+                try:
+                    callback(event)
+                except Exception as error:
+                    self._recordError(error)
+
+        self._thread = threading.Thread(target = run, daemon = True,
+                                        name = "mcp9808-alert")
+        self._thread.start()
+
+
+    """
+    A function to stop the thread started by start().
+    """
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,190 @@
+"""
+Benchmarks of the driver's read paths, for checking performance from one
+release to the next.  Runs against simulated sensors by default, or real
+ones on a Linux i2c bus:
+
+    python3 -m mcp9808.benchmark
+    python3 -m mcp9808.benchmark --bus 1 --json results.json
+
+For every case it measures operations per second, p50 and p99 latency and
+CPU time per operation.  The cases are:
+
+    readTemp       one sensor, one temperature read
+    readSample     one sensor, temperature and alert flags
+    configure      one config write through the shadow copy
+    alertMode      one config setter
+    sweep-N        BusManager.readTemps() over N sensors
+    decode-N       decoding N raw words with mcp9808.decode
+    decode-scalar  decoding one raw word with MCP9808._tempFromBytes
+
+Real sensors are only written with the config they already hold, so running
+it against hardware leaves their settings as they were.
+"""
+
+import argparse, array, json, os, platform, sys, time
+
+from . import decode
+from .bus import BusManager
+from .fake import FakeTransport
+from .simulator import SimulatedMCP9808, sineWave
+
+# Fewest timed calls for any case, so that p99 is more than just the slowest
+# of a handful
+MIN_ITERATIONS = 200
+
+
+"""
+A function to time operation, called iterations times.  Returns a dict of
+the results.  perItem scales the rates for operations that handle several
+items (e.g. a sweep of several sensors).
+"""
+def measure(name, operation, iterations, perItem = 1):
+    # One call first so one-off costs (imports, caches) aren't counted
+    operation()
+    latencies = array.array("d", bytes(8 * iterations))
+    clock = time.perf_counter
+    cpuStart = time.process_time()
+    wallStart = clock()
+    for i in range(iterations):
+        start = clock()
+        operation()
+        latencies[i] = clock() - start
+    wall = clock() - wallStart
+    cpu = time.process_time() - cpuStart
+
+    ordered = sorted(latencies)
+    items = iterations * perItem
+    return {
+        "name": name,
+        "iterations": iterations,
+        "items": items,
+        "itemsPerSecond": items / wall if wall else None,
+        "p50": ordered[iterations // 2],
+        "p99": ordered[min(iterations - 1, (iterations * 99) // 100)],
+        "cpuPerItem": cpu / items,
+    }
+
+
+"""
+A function to build the bus to test.  Returns (BusManager, description).
+With busNumber None, count simulated sensors are made, each adding latency
+seconds per transaction.
+"""
+def makeBus(busNumber = None, count = 8, latency = 0):
+    if busNumber is None:
+        devices = {}
+        for address in range(0x18, 0x18 + count):
+            devices[address] = SimulatedMCP9808(sineWave(25, 5, 60), latency)
+        transport = FakeTransport(devices)
+        description = "simulated x" + str(count) + ", latency " \
+            + str(latency) + " s"
+    else:
+        from .linux import LinuxI2C
+        transport = LinuxI2C(busNumber)
+        description = "/dev/i2c-" + str(busNumber) + (
+            " (I2C_RDWR)" if transport.combined else " (read/write)")
+    bus = BusManager(transport)
+    bus.discover()
+    return bus, description
+
+
+"""
+A function to run every benchmark case.  Returns a dict of the results and
+the conditions they were measured under.
+"""
+def run(busNumber = None, count = 8, latency = 0, iterations = 1000):
+    bus, description = makeBus(busNumber, count, latency)
+    if not bus.sensors:
+        raise RuntimeError("No MCP9808s found on " + description)
+    sensor = bus.sensors[0]
+    config = sensor.getConfig()
+
+    results = []
+    results.append(measure("readTemp", sensor.readTemp, iterations))
+    results.append(measure("readSample", sensor.readSample, iterations))
+    results.append(measure(
+        "configure",
+        lambda: sensor.configure(alertMode = config["alertMode"],
+                                 alertPolarity = config["alertPolarity"]),
+        iterations))
+    results.append(measure(
+        "alertMode", lambda: sensor.alertMode(config["alertMode"]),
+        iterations))
+
+    sensors = list(bus.sensors)
+    for n in range(1, len(sensors) + 1):
+        bus.sensors = sensors[:n]
+        results.append(measure("sweep-" + str(n), bus.readTemps,
+                               max(MIN_ITERATIONS, iterations // n), n))
+    bus.sensors = sensors
+
+    for n in (1000, 100000):
+        words = array.array("H", [(i * 37) & 0xFFFF for i in range(n)])
+        if decode.numpy is not None:
+            words = decode.numpy.asarray(words)
+        results.append(measure("decode-" + str(n),
+                               lambda: decode.decodeTemps(words),
+                               max(MIN_ITERATIONS, iterations // 100), n))
+    raw = [0x01, 0x94]
+    results.append(measure("decode-scalar",
+                           lambda: sensor._tempFromBytes(raw),
+                           iterations * 10))
+
+    bus.close()
+    return {
+        "bus": description,
+        "sensors": [hex(s.address) for s in sensors],
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": decode.numpy is not None,
+        "time": time.time(),
+        "results": results,
+    }
+
+
+"""
+A function to print results as a table.
+"""
+def printTable(report, out = sys.stdout):
+    out.write("MCP9808 benchmark on " + report["bus"] + "\n")
+    out.write("%-16s %14s %12s %12s %14s\n" % (
+        "case", "items/s", "p50 us", "p99 us", "cpu/item us"))
+    for result in report["results"]:
+        out.write("%-16s %14.0f %12.1f %12.1f %14.2f\n" % (
+            result["name"], result["itemsPerSecond"], result["p50"] * 1e6,
+            result["p99"] * 1e6, result["cpuPerItem"] * 1e6))
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        description = "Benchmark the MCP9808 driver's read paths.")
+    parser.add_argument("--bus", type = int, default = None,
+                        help = "use real sensors on /dev/i2c-BUS instead of "
+                        "simulated ones")
+    parser.add_argument("--sensors", type = int, default = 8,
+                        help = "number of simulated sensors (1-8)")
+    parser.add_argument("--latency", type = float, default = 0,
+                        help = "simulated seconds per transaction")
+    parser.add_argument("--iterations", type = int, default = 1000)
+    parser.add_argument("--json", metavar = "FILE",
+                        help = "also write the results as JSON to FILE, "
+                        "or - for stdout")
+    args = parser.parse_args(argv)
+
+    if args.bus is not None and \
+       not os.path.exists("/dev/i2c-" + str(args.bus)):
+        parser.error("/dev/i2c-" + str(args.bus) + " does not exist")
+
+    report = run(args.bus, args.sensors, args.latency, args.iterations)
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent = 2)
+        sys.stdout.write("\n")
+        return
+    printTable(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent = 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Running several MCP9808s off one bus.  The sensor has eight possible
+addresses (0x18 - 0x1F), and rather than each sensor opening the bus for
+itself a BusManager owns one transport, hands it to all of its sensors, and
+reads them all in one sweep.
+
+    import mcp9808
+    from mcp9808.bus import BusManager
+    from mcp9808.linux import LinuxI2C
+
+    bus = BusManager(LinuxI2C(1))
+    for address in range(0x18, 0x20):
+        bus.addSensor(address)
+    print(bus.readTemps())
+
+Sensors can also be found by scanning instead of listing their addresses:
+
+    bus = BusManager(LinuxI2C(1))
+    bus.discover()
+"""
+
+import os, time
+
+from .core import MCP9808, Sample
+
+# Every address an MCP9808 can be strapped to
+ADDRESSES = range(0x18, 0x20)
+
+
+"""
+Internal function to check a manufacturer ID and device ID read back from a
+device.  Only the top byte of the device ID is checked, the bottom byte is
+the silicon revision.
+"""
+def _isMCP9808(manufacturer, device):
+    return (manufacturer[0] << 8 | manufacturer[1]) == 0x0054 and \
+        device[0] == 0x04
+
+
+"""
+A function to find the MCP9808s on a bus.  Reads the manufacturer and device
+ID registers of every address, all in one batch if every address answers,
+otherwise in one batch per address.  Returns a list of the addresses that
+hold an MCP9808.
+"""
+def scan(transport, addresses = ADDRESSES):
+    addresses = list(addresses)
+    requests = []
+    for address in addresses:
+        requests.append((address, 0x06, 2))
+        requests.append((address, 0x07, 2))
+
+    try:
+        data = transport.readMany(requests)
+        return [address for (i, address) in enumerate(addresses)
+                if _isMCP9808(data[2 * i], data[2 * i + 1])]
+    except OSError:
+        # Something didn't answer, so ask each address on its own
+        pass
+
+    found = []
+    for address in addresses:
+        try:
+            manufacturer, device = transport.readMany(
+                [(address, 0x06, 2), (address, 0x07, 2)])
+        except OSError:
+            continue
+        if _isMCP9808(manufacturer, device):
+            found.append(address)
+    return found
+
+
+class BusManager:
+
+
+    """
+    transport is the bus the sensors are on.  If it isn't given /dev/i2c-1
+    is opened, like MCP9808 does.  retry is a RetryPolicy given to every
+    sensor added, or None for no retries.  Batched sweeps aren't retried
+    themselves: a failed batch usually means a sensor has gone, so the
+    sensors are read one by one instead, each under the policy.  A sensor
+    that still can't be read is left out of later batches, so the rest keep
+    being read in one go, and is tried again on its own (once, without the
+    policy) every reprobe seconds until it answers.
+    """
+    def __init__(self, transport = None, retry = None, reprobe = 1.0):
+        if transport is None:
+            from .linux import LinuxI2C
+            transport = LinuxI2C(1)
+        self.transport = transport
+        self.retry = retry
+        self.reprobe = reprobe
+        self.sensors = []
+        # Sensors that couldn't be read, with when to try them again
+        self.missing = {}
+        # The sensors readRawInto last made requests for, and the requests
+        self._requestSensors = None
+        self._requests = None
+
+
+    """
+    A function to add the sensor at address to the bus.  Any keyword
+    arguments are passed on to MCP9808.  Returns the new sensor, which can
+    also be used on its own.
+    """
+    def addSensor(self, address, **kwargs):
+        kwargs.setdefault("retry", self.retry)
+        sensor = MCP9808(address, self.transport, **kwargs)
+        self.sensors.append(sensor)
+        return sensor
+
+
+    """
+    A function to scan the bus and add every MCP9808 found that isn't already
+    on it.  Any keyword arguments are passed on to MCP9808.  Returns a list
+    of the sensors added.
+    """
+    def discover(self, addresses = ADDRESSES, **kwargs):
+        known = [sensor.address for sensor in self.sensors]
+        added = []
+        for address in scan(self.transport, addresses):
+            if address not in known:
+                added.append(self.addSensor(address, checkID = False,
+                                            **kwargs))
+        return added
+
+
+    """
+    A function to remove a sensor from the bus.
+    """
+    def removeSensor(self, sensor):
+        self.sensors.remove(sensor)
+        self.missing.pop(sensor, None)
+
+
+    """
+    A function to read the temperature register of every sensor in one batch.
+    Returns a list of the raw 2 byte register contents, in the same order as
+    self.sensors, with None for any sensor that couldn't be read.
+    """
+    def readRaw(self):
+        return self._readBatch(self.sensors)
+
+
+    """
+    A function to read the temperature register of every sensor into buffer,
+    a bytearray with 2 bytes per sensor in the same order as self.sensors.
+    While no sensor is missing this is one readManyInto, which on LinuxI2C
+    reads straight into buffer and allocates nothing as long as the sensors
+    and buffer stay the same.  Returns the indexes of the sensors that
+    couldn't be read, empty if they all were.  Their bytes in buffer are
+    left as they were.
+    """
+    def readRawInto(self, buffer):
+        if self.missing:
+            return self._copyRaw(self.readRaw(), buffer)
+        if self._requestSensors != self.sensors:
+            self._requestSensors = list(self.sensors)
+            self._requests = [(sensor.address, sensor.temperature, 2)
+                              for sensor in self.sensors]
+        try:
+            self.transport.readManyInto(self._requests, buffer)
+            return ()
+        except OSError:
+            # The batch has already failed, so go straight to one by one
+            return self._copyRaw(self._readBatch(self.sensors, False), buffer)
+
+
+    """
+    Internal function to copy a list from readRaw into a readRawInto buffer.
+    Returns the indexes of the Nones.
+    """
+    def _copyRaw(self, data, buffer):
+        failed = []
+        for i, raw in enumerate(data):
+            if raw is None:
+                failed.append(i)
+            else:
+                buffer[2 * i:2 * i + 2] = raw
+        return failed
+
+
+    """
+    Internal function to read the temperature registers of sensors, in one
+    batch apart from any known to be missing.  If the batch fails (e.g. a
+    sensor has just gone) each sensor is read on its own instead, with its
+    retry policy if it has one, and any that fail are marked missing.
+    Missing sensors that are due another try are read once each after the
+    batch.  batched False skips the batch, for when it has just failed.
+    Returns a list like readRaw's.
+    """
+    def _readBatch(self, sensors, batched = True):
+        now = time.monotonic()
+        results = [None] * len(sensors)
+        present = [i for (i, sensor) in enumerate(sensors)
+                   if sensor not in self.missing]
+        requests = [(sensors[i].address, sensors[i].temperature, 2)
+                    for i in present]
+        data = None
+        if batched:
+            try:
+                data = self.transport.readMany(requests) if requests else []
+            except OSError:
+                pass
+
+        if data is not None:
+            for i, raw in zip(present, data):
+                results[i] = raw
+        else:
+            for i in present:
+                sensor = sensors[i]
+                try:
+                    results[i] = sensor._read(sensor.temperature, 2)
+                except OSError:
+                    self.missing[sensor] = now + self.reprobe
+
+        for i, sensor in enumerate(sensors):
+            due = self.missing.get(sensor)
+            if due is None or due > now:
+                continue
+            # A plain read, so a sensor that is still gone doesn't set the
+            # retry policy recovering the bus every sweep
+            try:
+                results[i] = sensor.transport.read(sensor.address,
+                                                   sensor.temperature, 2)
+                del self.missing[sensor]
+            except OSError:
+                self.missing[sensor] = now + self.reprobe
+        return results
+
+
+    """
+    A function to read the temperature of every sensor in one sweep.  Returns
+    a list of floats in °C in the same order as self.sensors, with None for
+    any sensor that couldn't be read.
+    """
+    def readTemps(self):
+        return [None if data is None else sensor._tempFromBytes(data)
+                for (sensor, data) in zip(self.sensors, self.readRaw())]
+
+
+    """
+    A function to read a Sample (temperature and alert flags from the same
+    register read) from every sensor in one sweep.  Returns a list in the
+    same order as self.sensors, with None for any sensor that couldn't be
+    read.  With fallback, a sensor that couldn't be read gives its last good
+    Sample instead, marked stale, if it has one.
+    """
+    def readSamples(self, fallback = False):
+        data = self.readRaw()
+        now = time.monotonic()
+        samples = []
+        for sensor, raw in zip(self.sensors, data):
+            if raw is not None:
+                sensor.lastSample = Sample(sensor._tempFromBytes(raw),
+                                           (raw[0] << 8) | raw[1], now)
+                samples.append(sensor.lastSample)
+            elif fallback and sensor.lastSample is not None:
+                samples.append(sensor.lastSample.asStale())
+            else:
+                samples.append(None)
+        return samples
+
+
+    """
+    A function to take one reading from every sensor, like MCP9808.readOnce
+    but with all of the sensors converting at the same time.  Sensors in
+    shutdown are woken, there is one wait for the slowest conversion, all of
+    them are read in one sweep, and the ones that were woken are shut down
+    again.  Returns a list like readTemps, with None for any sensor that
+    couldn't be read.
+    """
+    def readOnce(self, margin = 0.1):
+        asleep = []
+        try:
+            wait = 0
+            for sensor in self.sensors:
+                try:
+                    if not sensor.getConfig()["shutdown"]:
+                        continue
+                    # Listed before waking, so a failed wake-up is still
+                    # put back into shutdown
+                    asleep.append(sensor)
+                    sensor.shutdown(0)
+                    wait = max(wait, sensor.conversionTime())
+                except OSError:
+                    pass
+            if wait:
+                time.sleep(wait * (1 + margin))
+            return self.readTemps()
+        finally:
+            for sensor in asleep:
+                try:
+                    sensor.shutdown(1)
+                except OSError:
+                    pass
+
+
+    """
+    Close the transport.
+    """
+    def close(self):
+        self.transport.close()
+
+
+"""
+A function to look for MCP9808s on several Linux i2c buses.  busNumbers is a
+list of N for /dev/i2c-N, or None to try every /dev/i2c-N there is.  Returns
+a BusManager for each bus that has at least one sensor, with the sensors
+already added.  Buses with nothing on them are closed again.
+"""
+def discoverLinux(busNumbers = None, addresses = ADDRESSES, **kwargs):
+    from .linux import LinuxI2C
+
+    if busNumbers is None:
+        busNumbers = sorted(int(name[4:]) for name in os.listdir("/dev")
+                            if name.startswith("i2c-") and name[4:].isdigit())
+
+    managers = []
+    for busNumber in busNumbers:
+        try:
+            manager = BusManager(LinuxI2C(busNumber))
+        except OSError:
+            continue
+        if manager.discover(addresses, **kwargs):
+            managers.append(manager)
+        else:
+            manager.close()
+    return managers
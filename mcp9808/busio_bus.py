@@ -0,0 +1,80 @@
+"""
+Transport for CircuitPython boards, using a busio.I2C object.
+"""
+
+import errno, time
+
+from .buslock import busLock
+from .transport import Transport
+
+
+class BusioTransport(Transport):
+
+
+    """
+    i2c is a busio.I2C, e.g. busio.I2C(board.SCL, board.SDA).  Transports on
+    the same busio.I2C share one BusLock.  lockTimeout is how long to wait,
+    in seconds, for code outside this driver to let go of the busio lock.
+    """
+    def __init__(self, i2c, lockTimeout = 1.0):
+        self.i2c = i2c
+        self.lockTimeout = lockTimeout
+        self._lock = busLock("busio:" + str(id(i2c)))
+        # Reused for the register pointer by readInto
+        self._pointer = bytearray(1)
+
+
+    """
+    Internal function to take busio's own lock.  With the BusLock held
+    nothing in this driver can have it, so it is free straight away unless
+    other code is using the bus, in which case it is polled with a short
+    sleep rather than spun on, up to lockTimeout.
+    """
+    def _claim(self):
+        if self.i2c.try_lock():
+            return
+        deadline = time.monotonic() + self.lockTimeout
+        while not self.i2c.try_lock():
+            if time.monotonic() > deadline:
+                raise OSError(errno.ETIMEDOUT, "Timed out waiting for the "
+                              "busio.I2C lock")
+            time.sleep(0.001)
+
+
+    """
+    Read numBytes bytes from a register of the device at address.
+    """
+    def read(self, address, register, numBytes):
+        # Create a bytearray to read data into
+        data = bytearray(numBytes)
+        self.readInto(address, register, data)
+        return data
+
+
+    """
+    Read len(buffer) bytes from a register of the device at address straight
+    into buffer.
+    """
+    def readInto(self, address, register, buffer):
+        with self.lock:
+            self._pointer[0] = register
+            self._claim()
+            try:
+                # Point to the register and read it back with a repeated start
+                self.i2c.writeto_then_readfrom(address, self._pointer, buffer)
+            finally:
+                # Release the i2c bus
+                self.i2c.unlock()
+
+
+    """
+    Write the list of byte values to a register of the device at address.
+    """
+    def write(self, address, register, values):
+        with self.lock:
+            self._claim()
+            try:
+                self.i2c.writeto(address, bytes([register] + list(values)))
+            finally:
+                # Release the i2c bus
+                self.i2c.unlock()
@@ -0,0 +1,210 @@
+"""
+Arbitration between everything sharing a bus.  A register read is two steps
+on the wire (point at the register, then read it), and if another thread or
+process gets a transaction in between, the read comes back from the wrong
+register.  Every transport therefore takes its bus's BusLock around each
+transaction.
+
+There is one BusLock per bus in a process, however many transport objects
+are opened on it, so separate MCP9808s on their own LinuxI2C(1)s still take
+turns.  Threads waiting for it are served in the order they asked, and give
+up with TimeoutError after timeout seconds rather than hanging.  On Linux
+the lock can also hold flock() on the /dev/i2c-N node, so other processes
+using the same convention take turns too.  flock() is only taken when the
+lock is first acquired, not again by a thread that already holds it.
+
+The lock is reentrant, so a sequence that must not be split (selecting a
+mux channel and then reading from it) can hold it across several
+transactions:
+
+    with transport.lock:
+        mux.select(2)
+        data = transport.read(0x18, 0x05, 2)
+
+On CircuitPython, which has no threads, a BusLock only keeps count.
+"""
+
+import errno, os, time
+
+try:
+    import threading
+except ImportError:
+    threading = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# The lock for each bus, by key (see busLock)
+_locks = {}
+_locksLock = threading.Lock() if threading is not None else None
+
+
+class BusLock:
+
+
+    """
+    path, if given, is a file to hold flock() on while the lock is held, to
+    keep other processes off the bus.  timeout is the most seconds acquire()
+    waits by default, or None to wait for ever.
+    """
+    def __init__(self, path = None, timeout = 1.0):
+        self.path = path
+        self.timeout = timeout
+        self._fd = None
+        # How many times flock() has been taken.  Another process may have
+        # used the bus in between, so anything remembered about the state of
+        # the bus (which mux channel is selected...) is only good while this
+        # stays the same.
+        self.fileLocks = 0
+        # The thread holding the lock and how many times it has taken it
+        self._owner = None
+        self._count = 0
+        # Threads waiting, first come first served, as (thread, wakeup lock)
+        self._waiters = []
+        if threading is not None:
+            self._mutex = threading.Lock()
+
+
+    """
+    A function to take the lock, waiting at most timeout seconds (the lock's
+    own timeout if not given).  Raises TimeoutError if it can't be had in
+    time.  A thread already holding the lock gets it again straight away.
+    """
+    def acquire(self, timeout = -1):
+        if timeout == -1:
+            timeout = self.timeout
+        if threading is None:
+            self._count = self._count + 1
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        me = threading.get_ident()
+
+        waiter = None
+        with self._mutex:
+            if self._owner == me:
+                self._count = self._count + 1
+                return True
+            if self._owner is None and not self._waiters:
+                self._owner = me
+                self._count = 1
+            else:
+                waiter = threading.Lock()
+                waiter.acquire()
+                self._waiters.append((me, waiter))
+
+        if waiter is not None:
+            got = waiter.acquire(timeout = -1 if timeout is None
+                                 else max(0, timeout))
+            if not got:
+                with self._mutex:
+                    # Handed over just as the wait ran out, so keep it
+                    got = self._owner == me
+                    if not got:
+                        self._waiters.remove((me, waiter))
+                if not got:
+                    raise OSError(errno.ETIMEDOUT,
+                                  "Timed out waiting for the bus")
+
+        if self.path is not None and fcntl is not None:
+            try:
+                self._lockFile(deadline)
+            except BaseException:
+                self._handOver()
+                raise
+            self.fileLocks = self.fileLocks + 1
+        return True
+
+
+    """
+    Internal function to take flock() on path, polling until deadline.
+    flock() itself can't time out, but only one thread per process ever gets
+    here at a time.
+    """
+    def _lockFile(self, deadline):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        delay = 0.0005
+        while True:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                pass
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise OSError(errno.ETIMEDOUT, "Timed out waiting for "
+                              + self.path + " held by another process")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.005)
+
+
+    """
+    A function to let go of the lock.  It goes to the thread that has been
+    waiting longest.
+    """
+    def release(self):
+        if threading is None:
+            self._count = self._count - 1
+            return
+        if self._owner != threading.get_ident():
+            raise RuntimeError("Releasing a BusLock that isn't held")
+        if self._count > 1:
+            self._count = self._count - 1
+            return
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._handOver()
+
+
+    """
+    Internal function to pass the lock to the next waiting thread, or leave
+    it free if there isn't one.
+    """
+    def _handOver(self):
+        with self._mutex:
+            if self._waiters:
+                self._owner, waiter = self._waiters.pop(0)
+                self._count = 1
+                waiter.release()
+            else:
+                self._owner = None
+                self._count = 0
+
+
+    """
+    Close the file held for flock().
+    """
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+"""
+A function to get the process-wide BusLock for a bus, making it the first
+time.  key names the bus (e.g. "/dev/i2c-1") and path is the file to flock()
+for it, if any.
+"""
+def busLock(key, path = None):
+    if _locksLock is not None:
+        _locksLock.acquire()
+    try:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = BusLock(path)
+        elif lock.path is None:
+            lock.path = path
+        return lock
+    finally:
+        if _locksLock is not None:
+            _locksLock.release()
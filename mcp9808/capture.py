@@ -0,0 +1,141 @@
+"""
+High rate capture of raw readings.  A CaptureBuffer is a fixed size ring of
+raw temperature register words, each with the time.monotonic() it was read
+at and the address of the sensor it came from.  All of the storage is
+allocated up front in flat arrays, so adding a reading creates no Python
+objects to be tidied up later, and nothing is decoded until asked for.
+Once full, the oldest readings are overwritten.
+
+    from mcp9808.capture import CaptureBuffer
+
+    buffer = CaptureBuffer(10000)
+    while running:
+        buffer.captureBus(bus)
+    temperatures = buffer.temperatures()
+"""
+
+import array, time
+
+from . import decode
+
+
+class CaptureBuffer:
+
+
+    """
+    capacity is how many readings the buffer holds before it wraps.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.words = array.array("H", bytes(2 * capacity))
+        self.timestamps = array.array("d", bytes(8 * capacity))
+        self.addresses = array.array("B", bytes(capacity))
+        # Where the next reading goes, and how many are held
+        self.head = 0
+        self.count = 0
+        # How many readings have been overwritten since the last clear()
+        self.dropped = 0
+        # Raw register bytes of a whole bus, reused by captureBus
+        self._busBuffer = bytearray()
+
+
+    def __len__(self):
+        return self.count
+
+
+    """
+    A function to add one raw reading to the buffer.
+    """
+    def append(self, word, timestamp, address = 0):
+        head = self.head
+        self.words[head] = word
+        self.timestamps[head] = timestamp
+        self.addresses[head] = address
+        head = head + 1
+        if head == self.capacity:
+            head = 0
+        self.head = head
+        if self.count < self.capacity:
+            self.count = self.count + 1
+        else:
+            self.dropped = self.dropped + 1
+
+
+    """
+    A function to read one sensor's temperature register into the buffer.
+    """
+    def capture(self, sensor):
+        self.append(sensor.readRaw(), time.monotonic(), sensor.address)
+
+
+    """
+    A function to read every sensor on a BusManager in one sweep and add the
+    readings to the buffer, all with the same timestamp.  Sensors that
+    couldn't be read are skipped.  The sweep reads into a buffer kept for
+    the purpose with BusManager.readRawInto, so on LinuxI2C nothing is
+    allocated for it while the sensors on the bus stay the same.
+    """
+    def captureBus(self, bus):
+        data = self._busBuffer
+        if len(data) != 2 * len(bus.sensors):
+            data = self._busBuffer = bytearray(2 * len(bus.sensors))
+        failed = bus.readRawInto(data)
+        now = time.monotonic()
+        i = 0
+        for sensor in bus.sensors:
+            if not (failed and i in failed):
+                self.append((data[2 * i] << 8) | data[2 * i + 1], now,
+                            sensor.address)
+            i = i + 1
+
+
+    """
+    A function to empty the buffer.
+    """
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+
+
+    """
+    A function to get the readings held, oldest first, without copying them.
+    Returns a list of up to two (words, timestamps, addresses) tuples of
+    memoryviews, as the readings may wrap round the end of the buffer.  The
+    views are only good until more readings are added.
+    """
+    def segments(self):
+        start = (self.head - self.count) % self.capacity
+        end = start + self.count
+        words = memoryview(self.words)
+        timestamps = memoryview(self.timestamps)
+        addresses = memoryview(self.addresses)
+        if end <= self.capacity:
+            spans = [(start, end)]
+        else:
+            spans = [(start, self.capacity), (0, end - self.capacity)]
+        return [(words[a:b], timestamps[a:b], addresses[a:b])
+                for (a, b) in spans if b > a]
+
+
+    """
+    A function to copy the readings held into new arrays, oldest first.
+    Returns (words, timestamps, addresses).
+    """
+    def snapshot(self):
+        words = array.array("H")
+        timestamps = array.array("d")
+        addresses = array.array("B")
+        for w, t, a in self.segments():
+            words.frombytes(w.cast("B"))
+            timestamps.frombytes(t.cast("B"))
+            addresses.frombytes(a)
+        return words, timestamps, addresses
+
+
+    """
+    A function to decode the readings held to °C, oldest first.  Uses
+    mcp9808.decode, so gives a NumPy array if NumPy is installed.
+    """
+    def temperatures(self):
+        return decode.decodeTemps(self.snapshot()[0])
@@ -0,0 +1,258 @@
+"""
+Reading sensors on several buses at once.  Transactions on one bus have to
+take turns, but separate adapters (/dev/i2c-0, /dev/i2c-1, buses made by a
+mux driver...) can all be busy at the same time.  A MultiBusCollector runs
+one worker thread per bus, each sweeping its own BusManager, and merges
+what they read into a single stream of timestamped samples:
+
+    from mcp9808.collector import MultiBusCollector
+
+    collector = MultiBusCollector()
+    collector.addLinuxBus(0)
+    collector.addLinuxBus(1)
+    with collector:
+        for reading in collector:
+            print(reading.bus, hex(reading.address), reading.sample.temperature)
+
+The ioctls release the GIL while the kernel talks to the hardware, so the
+workers really do overlap and the total rate grows with the number of
+buses.  The stream is a bounded queue: if the reader falls behind, the
+workers wait for room rather than piling up readings without limit.
+"""
+
+import queue, threading, time
+
+from .bus import ADDRESSES, BusManager
+from .core import CONVERSION_TIMES
+
+
+"""
+One reading in the merged stream.  bus is the name the bus was added under
+(its number for Linux buses), address the sensor's address on it and sample
+the Sample read, whose timestamp is from time.monotonic() and so can be
+compared between buses.
+"""
+class BusSample:
+
+
+    def __init__(self, bus, address, sample):
+        self.bus = bus
+        self.address = address
+        self.sample = sample
+
+
+    def __repr__(self):
+        return "BusSample(" + repr(self.bus) + ", " + hex(self.address) \
+            + ", " + repr(self.sample) + ")"
+
+
+class MultiBusCollector:
+
+
+    """
+    buses is a list of BusManagers to start with, e.g. from
+    bus.discoverLinux().  interval is how often each bus is swept, in
+    seconds; if it isn't given each bus is swept once every conversion time
+    of its slowest sensor.  maxQueue is how many readings can be waiting to
+    be read.  When the queue is full the workers block until there is room
+    if block is True, otherwise the new readings are dropped and counted in
+    self.dropped.
+    """
+    def __init__(self, buses = None, interval = None, maxQueue = 1024,
+                 block = True):
+        self.interval = interval
+        self.block = block
+        # BusManagers by name
+        self.buses = {}
+        self.queue = queue.Queue(maxQueue)
+        self.dropped = 0
+        # Every worker can drop readings, so the count is kept under a lock
+        self._droppedLock = threading.Lock()
+        # The last error each bus's worker hit, and how many there have been
+        self.errors = {}
+        self.errorCounts = {}
+        self._stop = threading.Event()
+        self._threads = []
+        for bus in buses or []:
+            self.addBus(bus)
+
+
+    """
+    A function to add a BusManager.  name identifies the bus in the
+    readings; it defaults to the transport's bus number if it has one (as
+    LinuxI2C does), otherwise the order the bus was added in.  Buses can only
+    be added while the collector is stopped.  Returns the name.
+    """
+    def addBus(self, bus, name = None):
+        if self._threads:
+            raise RuntimeError("Can't add a bus while the collector is running")
+        if name is None:
+            name = getattr(bus.transport, "busNumber", len(self.buses))
+        if name in self.buses:
+            raise ValueError("There is already a bus called " + repr(name))
+        self.buses[name] = bus
+        return name
+
+
+    """
+    A function to open /dev/i2c-busNumber, scan it for MCP9808s and add it.
+    Any keyword arguments are passed on to MCP9808.  Returns the BusManager,
+    which may have no sensors if none were found.
+    """
+    def addLinuxBus(self, busNumber, addresses = ADDRESSES, **kwargs):
+        from .linux import LinuxI2C
+        bus = BusManager(LinuxI2C(busNumber))
+        bus.discover(addresses, **kwargs)
+        self.addBus(bus, busNumber)
+        return bus
+
+
+    """
+    A function to add the sensor at address on /dev/i2c-busNumber, opening
+    the bus the first time one of its sensors is added.  Any keyword
+    arguments are passed on to MCP9808.  Returns the new sensor.
+    """
+    def addSensor(self, busNumber, address, **kwargs):
+        bus = self.buses.get(busNumber)
+        if bus is None:
+            from .linux import LinuxI2C
+            bus = BusManager(LinuxI2C(busNumber))
+            self.addBus(bus, busNumber)
+        return bus.addSensor(address, **kwargs)
+
+
+    """
+    A function to start a worker thread for every bus with sensors on it.
+    """
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for name, bus in self.buses.items():
+            if not bus.sensors:
+                continue
+            thread = threading.Thread(target = self._run, args = (name, bus),
+                                      daemon = True,
+                                      name = "mcp9808-bus-" + str(name))
+            self._threads.append(thread)
+            thread.start()
+
+
+    """
+    A function to stop the workers and wait for them to finish.  Readings
+    already in the queue can still be read afterwards.
+    """
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+    """
+    Internal function run by each worker thread.
+    """
+    def _run(self, name, bus):
+        interval = self.interval
+        if interval is None:
+            try:
+                interval = max(sensor.conversionTime()
+                               for sensor in bus.sensors)
+            except OSError as error:
+                # Carry on at the slowest conversion time rather than
+                # losing the bus
+                self._recordError(name, error)
+                interval = CONVERSION_TIMES[-1]
+
+        nextRead = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                samples = bus.readSamples()
+            except OSError as error:
+                self._recordError(name, error)
+                samples = []
+            for sensor, sample in zip(bus.sensors, samples):
+                if sample is not None:
+                    self._put(BusSample(name, sensor.address, sample))
+            nextRead = nextRead + interval
+            self._stop.wait(max(0, nextRead - time.monotonic()))
+
+
+    """
+    Internal function to note an error hit by a bus's worker.
+    """
+    def _recordError(self, name, error):
+        self.errors[name] = error
+        self.errorCounts[name] = self.errorCounts.get(name, 0) + 1
+
+
+    """
+    Internal function to queue a reading, waiting for room if set to block.
+    Waits in short steps so that stop() isn't held up by a full queue.
+    """
+    def _put(self, reading):
+        if not self.block:
+            try:
+                self.queue.put_nowait(reading)
+            except queue.Full:
+                with self._droppedLock:
+                    self.dropped = self.dropped + 1
+            return
+        while not self._stop.is_set():
+            try:
+                self.queue.put(reading, timeout = 0.1)
+                return
+            except queue.Full:
+                pass
+
+
+    """
+    A function to get the next reading from any bus.  Returns a BusSample,
+    or None if timeout (in seconds) runs out first.
+    """
+    def get(self, timeout = None):
+        try:
+            return self.queue.get(timeout = timeout)
+        except queue.Empty:
+            return None
+
+
+    """
+    Yields readings as they arrive, until the collector is stopped (or was
+    never started) and the queue has been emptied.
+    """
+    def __iter__(self):
+        while True:
+            reading = self.get(0.1)
+            if reading is not None:
+                yield reading
+            elif self._stop.is_set() or not self.running():
+                return
+
+
+    """
+    A function to check whether any of the worker threads are running.
+    """
+    def running(self):
+        for thread in self._threads:
+            if thread.is_alive():
+                return True
+        return False
+
+
+    """
+    Stop the workers and close every bus.
+    """
+    def close(self):
+        self.stop()
+        for bus in self.buses.values():
+            bus.close()
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *exc):
+        self.stop()
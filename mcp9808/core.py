@@ -0,0 +1,820 @@
+"""
+The core MCP9808 class.  All of the register decoding lives here, and the
+actual bus traffic goes through a transport object (see transport.py), so
+the same class runs off a Raspberry Pi, an I2CDriver, a CircuitPython board
+or the in-memory fake.
+"""
+
+import time
+
+from . import limits
+
+# Typical conversion time in seconds for each resolution setting
+CONVERSION_TIMES = (0.030, 0.065, 0.130, 0.250)
+
+
+"""
+One temperature reading.  raw is the 16 bit temperature register it was
+decoded from, timestamp is the time.monotonic() it was read at, and fresh
+says whether it came from a new conversion rather than repeating the last
+one (only known when read through a ConversionScheduler).  The alert flags
+come from the same register read as the temperature, so always match it.
+stale is True for a Sample handed back in place of one that couldn't be
+read, in which case its timestamp says how old it is.
+"""
+class Sample:
+
+
+    def __init__(self, temperature, raw, timestamp, fresh = True,
+                 stale = False):
+        self.temperature = temperature
+        self.raw = raw
+        self.timestamp = timestamp
+        self.fresh = fresh
+        self.stale = stale
+
+
+    """
+    A function to get a stale copy of this Sample, to stand in for a reading
+    that failed.
+    """
+    def asStale(self):
+        return Sample(self.temperature, self.raw, self.timestamp, False, True)
+
+
+    """
+    1 if the temperature is at or above tCrit, else 0.
+    """
+    @property
+    def critAlert(self):
+        return (self.raw >> 15) & 1
+
+
+    """
+    1 if the temperature is above tUpper, else 0.
+    """
+    @property
+    def upperAlert(self):
+        return (self.raw >> 14) & 1
+
+
+    """
+    1 if the temperature is below tLower, else 0.
+    """
+    @property
+    def lowerAlert(self):
+        return (self.raw >> 13) & 1
+
+
+    """
+    The alert flags as a list, in the same form as MCP9808.readAlertBits.
+    """
+    @property
+    def alertBits(self):
+        return [self.critAlert, self.upperAlert, self.lowerAlert]
+
+
+    def __repr__(self):
+        return "Sample(" + str(self.temperature) + ", raw=" + hex(self.raw) \
+            + ", alertBits=" + str(self.alertBits) + ", timestamp=" \
+            + str(self.timestamp) + ", fresh=" + str(self.fresh) \
+            + (", stale=True" if self.stale else "") + ")"
+
+
+class MCP9808:
+
+
+    """
+    transport is the bus backend the sensor is attached to.  If it isn't
+    given, the sensor is opened on /dev/i2c-1 like the original Raspberry Pi
+    driver did.  cacheConfig keeps a shadow copy of the config register so
+    the setters don't have to read it back before every write.  Turn it off
+    if something else on the bus also writes to this sensor's config.
+    checkID reads the device ID to make sure there really is an MCP9808
+    there; scanning already does this, so discovered sensors skip it.
+    retry is a RetryPolicy (see retry.py) applied to every register read
+    and write, or None to let bus errors straight through.
+    """
+    def __init__(self, deviceAddress = 0x18, transport = None,
+                 cacheConfig = True, checkID = True, retry = None):
+
+        # Initialise the i2c bus
+        self.address = deviceAddress
+
+        if transport is None:
+            # Imported here so that boards without fcntl can still use
+            # the other transports
+            from .linux import LinuxI2C
+            transport = LinuxI2C(1)
+        self.transport = transport
+        self.retry = retry
+        # The last Sample read successfully, for readSample(fallback=True)
+        self.lastSample = None
+        # Reused by every read of the temperature register
+        self._buffer = bytearray(2)
+
+        # Shadow copy of the config register, None until it has been read
+        self.cacheConfig = cacheConfig
+        self._configShadow = None
+        # Resolution setting, None until it has been read or set
+        self._resolutionShadow = None
+
+        self.configReg = 0x01
+        self.tUpper = 0x02
+        self.tLower = 0x03
+        self.tCrit = 0x04
+        self.temperature = 0x05
+        self.manufacturerID = 0x06
+        self.deviceID = 0x07
+        self.resolution = 0x08
+
+        if checkID and (self.getDeviceID() != 0x0400):
+            print("WARNING!  Could not detect an MCP9808 at address "\
++ str(hex(self.address)) + ", check the wiring.\n")
+
+
+    """
+    Internal function to read bytes from the MCP9808.
+    """
+    def _read(self, register, numBytes):
+        if self.retry is None:
+            return self.transport.read(self.address, register, numBytes)
+        return self.retry.call(self.transport, [(self.address, register)],
+                               self.transport.read, self.address, register,
+                               numBytes)
+
+
+    """
+    Internal function to read a register into buffer, which is filled to its
+    length.
+    """
+    def _readInto(self, register, buffer):
+        if self.retry is None:
+            self.transport.readInto(self.address, register, buffer)
+        else:
+            self.retry.call(self.transport, [(self.address, register)],
+                            self.transport.readInto, self.address, register,
+                            buffer)
+
+
+    """
+    Internal function to write bytes to the MCP9808.
+    """
+    def _write(self, register, values):
+        if self.retry is None:
+            self.transport.write(self.address, register, values)
+        else:
+            self.retry.call(self.transport, [(self.address, register)],
+                            self.transport.write, self.address, register,
+                            values)
+
+    #############################
+    # Config register functions #
+    #############################
+
+    """
+    Inernal function to get the config register bytes.  These come from the
+    shadow copy if there is one, unless fresh is True.  The alert status and
+    interrupt clear bits are never kept in the shadow, so read with fresh=True
+    to see them.
+    """
+    def _getConfigReg(self, fresh = False):
+        if self._configShadow is not None and not fresh:
+            return list(self._configShadow)
+        # Read both bytes of the config register.  MSB comes first.
+        data = list(self._read(self.configReg, 2))
+        if self.cacheConfig:
+            # Drop the alert status and interrupt clear bits
+            self._configShadow = [data[0], data[1] & 0b11001111]
+
+        return data
+
+
+    """
+    Internal function to write the config register bytes and update the
+    shadow copy to match what the sensor will actually hold afterwards.
+    """
+    def _writeConfigReg(self, data):
+        try:
+            self._write(self.configReg, data)
+        except:
+            # No telling what the sensor holds now, so read it next time
+            self._configShadow = None
+            raise
+        if self._configShadow is None:
+            return
+
+        old = (self._configShadow[0] << 8) | self._configShadow[1]
+        new = (data[0] << 8) | data[1]
+        if old & 0x00C0:
+            # With either lock set the hysteresis and the alert output,
+            # polarity and mode bits are frozen
+            new = (new & ~0x060B) | (old & 0x060B)
+            # and shutdown can be cleared but not set
+            if not (old & 0x0100):
+                new = new & ~0x0100
+        if old & 0x0040:
+            # Alert select is only frozen by winLock
+            new = (new & ~0x0004) | (old & 0x0004)
+        # The lock bits stay set until a power cycle
+        new = new | (old & 0x00C0)
+        # Interrupt clear reverts to 0 and alert status isn't cached
+        new = new & ~0x0030
+        self._configShadow = [new >> 8, new & 0xFF]
+
+
+    """
+    A function to throw away the shadow copy of the config register, so the
+    next config access reads it from the sensor.  Use this after a power
+    cycle, or if something else may have written the config register.
+    """
+    def invalidateConfig(self):
+        self._configShadow = None
+
+
+    """
+    A function to get the current config settings as a dictionary.  Comes from
+    the shadow copy where there is one, so it normally costs no bus traffic.
+    Alert status is not included as it can change at any time, use
+    alertStatus() for that.
+    """
+    def getConfig(self):
+        data = self._getConfigReg()
+        return {
+            "hysteresis": (data[0] & 0b00000110) >> 1,
+            "shutdown": data[0] & 0b00000001,
+            "critLock": (data[1] & 0b10000000) >> 7,
+            "winLock": (data[1] & 0b01000000) >> 6,
+            "alertControl": (data[1] & 0b00001000) >> 3,
+            "alertSelect": (data[1] & 0b00000100) >> 2,
+            "alertPolarity": (data[1] & 0b00000010) >> 1,
+            "alertMode": data[1] & 0b00000001,
+        }
+
+
+    """
+    A function to set the hysteresis.  0 = 0°C (default), 1 = +1.5°C, 2 = +3°C,
+    3 = +6°C.  Cannot be set when Crit Lock or Win Lock are 1, can be
+    programmed in shutdown mode.  Applies to tUpper, tLower and tCrit, only as
+    temperature drops.  In effect this setting tells the sensor to assume that
+    the real ambient temperature is the sensor temperature minus the hysteresis
+    value, to compensate for temperature dropping faster than the sensor detects.
+    """
+    def hysteresis(self, tHyst):
+        if isinstance(tHyst, int) and (tHyst >= 0) and (tHyst <= 3):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the tHyst bits of the MSB.
+            data[0] = data[0] & 0b00000001
+            # Merge the MSB with the new tHyst bits
+            data[0] = data[0] | (tHyst << 1)
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: tHyst must be an int of 0-3 inclusive.  Value\
+ given was " + str(tHyst) + ".")
+
+
+    """
+    A function to set the shutdown bit.  When set to 1 this disables
+    temperature readings.  This state persists until the bit is set to 0 or
+    the power is cycled.  This bit cannot be set to 1 while the winLock or
+    critLock bits are set to 1, but can be returned to 0 while the lock bits
+    are active.
+    """
+    def shutdown(self, shutdown):
+        if isinstance(shutdown, int) and ((shutdown == 1) or (shutdown == 0)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the shutdown bit of the MSB.
+            data[0] = data[0] & 0b00000110
+            # Merge the MSB with the new shutdown bit
+            data[0] = data[0] | shutdown
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: shutdown must be given an int of 0-1 inclusive.\
+ Value given was " + str(shutdown) + ".")
+
+
+    """
+    A function to set the Crit Lock bit.  When set to 1 tCrit (and some other
+    registers/bits) cannot be modified.  This bit can only be reset to 0 by
+    a full power cycle reset.
+    """
+    def critLock(self, critLock):
+        if isinstance(critLock, int) and ((critLock == 0) or (critLock == 1)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the critlock bit of the LSB.
+            data[1] = data[1] & 0b01111111
+            # Merge the LSB with the new critLock bits
+            data[1] = data[1] | (critLock << 7)
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: critLock must be given an int of 0-1 inclusive.  \
+ Value given was " + str(critLock) + ".")
+
+
+    """
+    A function to set the Win Lock bit.  When set to 1 tUpper and tLower (and
+    some other registers/bits) cannot be modified.  This bit can only be reset
+    to 0 by a full power cycle reset.
+    """
+    def winLock(self, winLock):
+        if isinstance(winLock, int) and ((winLock == 0) or (winLock == 1)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the winLock bit of the LSB.
+            data[1] = data[1] & 0b10111111
+            # Merge the LSB with the new winLock bits
+            data[1] = data[1] | (winLock << 6)
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: winLock must be given an int of 0-1 inclusive.\
+ Value given was " + str(winLock) + ".")
+
+
+    """
+    A function to set the interrupt clear bit.  When set to 1 this clears the
+    interrupt bit, and reverts to 0.  Cannot be set when the shutdown bit is 1,
+    but will clear when in shutdown mode.
+    """
+    def intClear(self, intClear):
+        if isinstance(intClear, int) and ((intClear == 0) or (intClear == 1)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the intClear bit of the LSB.
+            data[1] = data[1] & 0b11011111
+            # Merge the LSB with the new intClear bits
+            data[1] = data[1] | (intClear << 5)
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: intClear must be given an int of 0-1 inclusive.\
+ Value given was " + str(intClear) + ".")
+
+
+    """
+    A function to check whether or not an alert is currently being asserted.
+    Returns a 1 (asserted) or a 0.
+    """
+    def alertStatus(self):
+        # Get the config register bytes, bypassing the shadow copy
+        data = self._getConfigReg(fresh = True)
+        alertStatus = (data[1] & 0b00010000) >> 4
+        return alertStatus
+
+
+    """
+    A function to set the Alert Output Control bit.  Setting this to 1 enables
+    the alert output, 0 disables it.  This cannot be modified when either the
+    WinLock or CritLock bits are set.
+    """
+    def alertControl(self, alertControl):
+        if isinstance(alertControl, int) and \
+           ((alertControl == 0) or (alertControl == 1)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the alertControl bit of the LSB.
+            data[1] = data[1] & 0b11110111
+            # Merge the LSB with the new alertControl bits
+            data[1] = data[1] | (alertControl << 3)
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: alertControl must be given an int of 0-1 inclusive.\
+ Value given was " + str(alertControl) + ".")
+    
+
+    """
+    A function to control the Alert Select bit.  This controls when an alert
+    will be asserted.  A value of 0 means that an alert is asserted whenever
+    the temperature passes the upper, lower or critical temperatures.  If set
+    to 1 an alert is only asserted when the temperature is greater than the
+    critical temperature.
+    Cannot be set when Winlock is set.
+    """
+    def alertSelect(self, alertSelect):
+        if isinstance(alertSelect, int) and \
+           ((alertSelect == 0) or (alertSelect == 1)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the alertSelect bit of the LSB.
+            data[1] = data[1] & 0b11111011
+            # Merge the LSB with the new alertSelect bits
+            data[1] = data[1] | (alertSelect << 2)
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: alertSelect must be an int of 0-1 inclusive.  Value\
+ given was " + str(alertSelect) + ".")
+
+
+    """
+    A function to control the Alert Polarity.  If set to 0 the alert pin is
+    active low (requires a pull-up resistor), if set to 1 the pin is active
+    high.
+    Cannot be altered when winLock or critLock are high.
+    """
+    def alertPolarity(self, alertPolarity):
+        if isinstance(alertPolarity, int) and\
+           ((alertPolarity == 0) or (alertPolarity == 1)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the alertPolarity bit of the LSB.
+            data[1] = data[1] & 0b11111101
+            # Merge the LSB with the new alertPolarity bits
+            data[1] = data[1] | (alertPolarity << 1)
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: alertPolarity must be an int of 0-1 inclusive.  Value\
+ given was " + str(alertPolarity) + ".")
+
+
+    """
+    A function to control the Alert Mode.  If set to 0 the alert is in
+    comparator mode, if set to 1 the alert is in interrupt mode.  When in
+    comparator mode the alert pin will be asserted (high or low, according to
+    the alertPolarity setting) any time that the ambient temperature exceeds
+    tUpper, tLower or tCrit, depending on the alertSelect bit.  In interrupt
+    mode the alert pin will also be asserted under those conditions, but can
+    be reset to the non-asserted state using the intClear bit.
+    Cannot be altered when winLock or critLock are high.
+    """
+    def alertMode(self, alertMode):
+        if isinstance(alertMode, int) and \
+           ((alertMode == 0) or (alertMode == 1)):
+            # Get the config register bytes
+            data = self._getConfigReg()
+            # Clear the alertMode bit of the LSB.
+            data[1] = data[1] & 0b11111110
+            # Merge the LSB with the new critLock bits
+            data[1] = data[1] | alertMode
+            # Write the new values back to the register
+            self._writeConfigReg(data)
+        else:
+            print("ERROR: alertMode must be a value of 0-1 inclusive.  Value\
+ given was " + str(alertMode) + ".")
+
+
+    """
+    A function to set several config fields with a single write of the config
+    register, rather than a read and write per field.  Takes any of the
+    keyword arguments hysteresis, shutdown, critLock, winLock, intClear,
+    alertControl, alertSelect, alertPolarity and alertMode, with the same
+    values as the individual functions above.  Fields not given are left as
+    they are.  If any value is invalid nothing is written.  For example:
+
+        sensor.configure(alertMode=1, alertPolarity=1, alertControl=1,
+                         hysteresis=2)
+    """
+    def configure(self, **fields):
+        # Check every value before touching the sensor
+        for name in fields:
+            if name not in self._configFields:
+                print("ERROR: configure does not know the field " + str(name)\
++ ".")
+                return
+            maximum = self._configFields[name][2]
+            value = fields[name]
+            if not (isinstance(value, int) and (value >= 0) and \
+                    (value <= maximum)):
+                print("ERROR: " + name + " must be an int of 0-" + str(maximum)\
++ " inclusive.  Value given was " + str(value) + ".")
+                return
+
+        # Get the config register bytes
+        data = self._getConfigReg()
+        for name in fields:
+            byte, shift, maximum = self._configFields[name]
+            # Clear the field's bits, then merge in the new value
+            data[byte] = data[byte] & ~(maximum << shift) & 0xFF
+            data[byte] = data[byte] | (fields[name] << shift)
+        # Write everything back in one go
+        self._writeConfigReg(data)
+
+
+    # Where each config field lives: (byte, bit shift, largest value)
+    _configFields = {
+        "hysteresis": (0, 1, 3),
+        "shutdown": (0, 0, 1),
+        "critLock": (1, 7, 1),
+        "winLock": (1, 6, 1),
+        "intClear": (1, 5, 1),
+        "alertControl": (1, 3, 1),
+        "alertSelect": (1, 2, 1),
+        "alertPolarity": (1, 1, 1),
+        "alertMode": (1, 0, 1),
+    }
+
+
+    ########################
+    # Config functions end #
+    ########################
+
+    """
+    Internal function to check that a value can go in the tUpper, tLower or
+    tCrit registers.
+    """
+    def _validLimit(self, value):
+        return limits.validLimit(value)
+
+
+    """
+    Internal function to turn a temperature into the two bytes to write to
+    the tUpper, tLower or tCrit registers, from the precomputed table in
+    limits.py.
+    """
+    def _limitBytes(self, temperature):
+        return limits.limitBytes(temperature)
+
+
+    """
+    Internal function to turn the two bytes of the tUpper, tLower or tCrit
+    registers into degrees Celsius.
+    """
+    def _limitFromBytes(self, data):
+        return limits.decodeLimitBytes(data)
+
+
+    """
+    Function to set the upper temperature limit of the alert window.  The sensor
+    has a minimum reading of -20°C and an upper of +100°C.  This value has a
+    resolution of 0.25°C.
+    """
+    def setTUpper(self, tUpper):
+        if self._validLimit(tUpper):
+            # Write to the bus
+            self._write(self.tUpper, self._limitBytes(tUpper))
+        else:
+            print("ERROR: setTUpper must be given an int or float from -20 to\
+ 100 inclusive.  Value given was " + str(tUpper) + ".")
+
+
+    """
+    Debug function to read the tUpper register and make sure it is being
+    written to properly.
+    """
+    def _readTUpper(self):
+        # Get the bytes holding tUpper
+        return self._limitFromBytes(self._read(self.tUpper, 2))
+
+
+    """
+    Function to set the lower temperature limit of the alert window.  The sensor
+    has a minimum reading of -20°C and an upper of +100°C.  This value has a
+    minimum resolution of 0.25°C.
+    """
+    def setTLower(self, tLower):
+        if self._validLimit(tLower):
+            # Write to the bus
+            self._write(self.tLower, self._limitBytes(tLower))
+        else:
+            print("ERROR: setTLower must be given an int or float from -20 to\
+ 100 inclusive.  Value given was " + str(tLower) + ".")
+
+
+
+    """
+    Debug function to read the tLower register and make sure it is being
+    written to properly.
+    """
+    def readTLower(self):
+        # Get the bytes holding tLower
+        return self._limitFromBytes(self._read(self.tLower, 2))
+
+
+    """
+    Function to set the critical temperature limit of the alert window.
+    The sensor has a minimum reading of -20°C and an upper of +100°C.  This
+    value has a minimum resolution of 0.25°C.
+    """
+    def setTCrit(self, tCrit):
+        if self._validLimit(tCrit):
+            # Write to the bus
+            self._write(self.tCrit, self._limitBytes(tCrit))
+        else:
+            print("ERROR: setTCrit must be given an int or float from -20 to\
+ 100 inclusive.  Value given was " + str(tCrit) + ".")
+
+
+
+    """
+    Debug function to read the tCrit register and make sure it is being
+    written to properly.
+    """
+    def readTCrit(self):
+        # Get the bytes holding tCrit
+        return self._limitFromBytes(self._read(self.tCrit, 2))
+
+
+    """
+    Function to set any of tUpper, tLower and tCrit together.  All of the
+    values are checked before anything is written, so a bad value leaves all
+    three limits alone.  If holdAlert is True and the alert output is enabled
+    it is switched off while the limits change, so the pin can't glitch on a
+    half-updated window, and then switched back on, even if a write fails.
+    If the alert is asserted at the time it is left on instead, because
+    switching it off would release the pin; the pin can then follow the
+    window as each limit is written.
+    """
+    def setLimits(self, tUpper = None, tLower = None, tCrit = None,
+                  holdAlert = True):
+        writes = [(self.tUpper, tUpper), (self.tLower, tLower),
+                  (self.tCrit, tCrit)]
+        writes = [(register, value) for (register, value) in writes
+                  if value is not None]
+        for register, value in writes:
+            if not self._validLimit(value):
+                print("ERROR: setLimits must be given ints or floats from -20\
+ to 100 inclusive.  Value given was " + str(value) + ".")
+                return
+
+        # Only hold the alert if it is on and the locks allow turning it off
+        if holdAlert:
+            config = self.getConfig()
+            holdAlert = config["alertControl"] and not config["critLock"] \
+                        and not config["winLock"]
+        # Turning the output off while it is asserted would release the pin,
+        # which is the very glitch the hold is there to stop
+        if holdAlert and self.alertStatus():
+            holdAlert = False
+        if holdAlert:
+            self.configure(alertControl = 0)
+        try:
+            for register, value in writes:
+                self._write(register, self._limitBytes(value))
+        finally:
+            # Never leave the alarms switched off, even if a write failed
+            if holdAlert:
+                self.configure(alertControl = 1)
+
+
+    """
+    Function to read the temperature.  Returns a float of temperature in
+    degrees Celsius.
+    """
+    def readTemp(self):
+        # Get the bytes holding the temperature
+        self._readInto(self.temperature, self._buffer)
+        return self._tempFromBytes(self._buffer)
+
+
+    """
+    Function to take a single reading while otherwise leaving the sensor in
+    shutdown, to save power and stop it warming itself up.  Wakes the sensor,
+    waits for one conversion (plus margin, as a fraction of the conversion
+    time), reads the temperature and shuts it down again.  With the config
+    register cached that is two writes and a read.  If the sensor isn't in
+    shutdown it is just read as normal and left running.
+    """
+    def readOnce(self, margin = 0.1):
+        if not self.getConfig()["shutdown"]:
+            return self.readTemp()
+        self.shutdown(0)
+        try:
+            time.sleep(self.conversionTime() * (1 + margin))
+            return self.readTemp()
+        finally:
+            self.shutdown(1)
+
+
+    """
+    Function to read the temperature and the alert bits together, from one
+    read of the temperature register.  Returns a Sample.  If the read fails
+    and fallback is True, the last good Sample is returned instead, marked
+    stale, so a glitch costs freshness rather than the reading.  The error
+    is still raised if there has never been a good Sample.
+    """
+    def readSample(self, fallback = False):
+        data = self._buffer
+        try:
+            self._readInto(self.temperature, data)
+        except OSError:
+            if fallback and self.lastSample is not None:
+                return self.lastSample.asStale()
+            raise
+        now = time.monotonic()
+        self.lastSample = Sample(self._tempFromBytes(data),
+                                 int.from_bytes(data, "big"), now)
+        return self.lastSample
+
+
+    """
+    Function to read the raw 16 bit temperature register, alert bits and all.
+    """
+    def readRaw(self):
+        self._readInto(self.temperature, self._buffer)
+        return int.from_bytes(self._buffer, "big")
+
+
+    """
+    Internal function to turn the two bytes of the temperature register into
+    degrees Celsius.
+    """
+    def _tempFromBytes(self, data):
+        # Combine the two bytes, mask bits 14-16
+        value = ((data[0] << 8) | data[1]) & 0x1fff
+        # Bit 13 is the sign, so the 13 bits are a two's complement number
+        if value & 0x1000:
+            value = value - 0x2000
+        return value * 0.0625
+
+
+    """
+    A function to read the manufacturer ID.  For the MCP9808, this should read
+    0x54 (84 decimal).
+    """
+    def getManufacturerID(self):
+        values = list(self._read(self.manufacturerID, 2))
+        manufID = (values[0] << 8) + values[1]
+        return(manufID)
+
+
+    """
+    A function to read the device ID and revision ID numbers from the MCP9808.
+    Should return 0x0400.  This function is used in the initialisation of the
+    Class to make sure the device is found when the instance is created.
+    """
+    def getDeviceID(self):
+        value = list(self._read(self.deviceID, 2))
+        deviceID = (value[0] << 8) + value[1]
+        return(deviceID)
+
+
+
+    """
+    A function to set the resolution of the sensor.  Must be given an integer
+    of 0-3 inclusive.  0 = 0.5°C/ 30 ms measurement time, 1 = 0.25°C/ 65 ms,
+    2 = 0.125°C / 130 ms, 3 = 0.0625°C / 250 ms (default).
+    """
+    def setResolution(self, resolution):
+        # Check that the requested resolution is an integer
+        if isinstance(resolution, int):
+            #Check that the requested resolution is between 0 and 3 inclusive
+            if ((resolution >= 0) and (resolution <= 3)):
+                self._write(self.resolution, [resolution])
+                self._resolutionShadow = resolution
+            else:
+                print("ERROR: resolution must be an integer between 0 and 3.  \
+Value given was " + str(resolution) + ".")
+        else:
+            print("ERROR: resolution must be an integer between 0 and 3.  Value\
+ given was " + str(resolution) + ".")
+
+
+
+    """
+    A function to get the resolution setting, 0-3 as for setResolution.  The
+    register is only read the first time, after that the value is
+    remembered.
+    """
+    def getResolution(self):
+        if self._resolutionShadow is None:
+            self._resolutionShadow = self._read(self.resolution, 1)[0] & 0x03
+        return self._resolutionShadow
+
+
+    """
+    A function to get how long in seconds the sensor takes to do one
+    conversion at the current resolution.  A new temperature can't be read
+    any faster than this.
+    """
+    def conversionTime(self):
+        return CONVERSION_TIMES[self.getResolution()]
+
+
+    """
+    A function to get the interrupt alert bits.
+    If tA > tCrit then alertBits = [1,0,0]
+    If tA > tUpper then alertBits = [0,1,0]
+    If tA < tLower then alertBits = [0,0,1]
+    """
+    def readAlertBits(self):
+        # Get the bytes holding the temperature
+        self._readInto(self.temperature, self._buffer)
+        return self._alertBitsFromBytes(self._buffer)
+
+
+    """
+    Internal function to get the alert bits out of the two bytes of the
+    temperature register.
+    """
+    def _alertBitsFromBytes(self, data):
+        # Shift out everything below bits 14-16
+        value = data[0] >> 5
+        alertBits = [0,0,0]
+        if  ((value & 0b1) == 0b1):
+            alertBits[2] = 1
+        if  ((value & 0b10) == 0b10):
+            alertBits[1] = 1
+        if  ((value & 0b100) == 0b100):
+            alertBits[0] = 1
+
+        return alertBits
+
+    
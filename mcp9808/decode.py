@@ -0,0 +1,82 @@
+"""
+Decoding lots of raw register words at once, e.g. from a BusManager sweep or
+a log of raw readings.  With NumPy installed each function does the whole
+batch in a few vectorised operations and returns NumPy arrays.  Without it
+the same results come back as array.array objects, decoded one by one.
+
+Temperature register words hold a 13 bit two's complement temperature in
+1/16 °C and the three alert flags in bits 13-15.  Limit register words
+(tUpper, tLower, tCrit) hold an 11 bit two's complement value in 1/4 °C in
+bits 2-12.
+
+    from mcp9808 import decode
+    temperatures = decode.decodeTemps(words)
+    flags = decode.decodeAlertFlags(words)
+"""
+
+import array
+
+from . import limits
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Bits of the alert flag masks returned by decodeAlertFlags
+CRIT_FLAG = 0b100
+UPPER_FLAG = 0b010
+LOWER_FLAG = 0b001
+
+
+"""
+A function to turn a buffer of big-endian bytes, as read off the bus, into
+16 bit register words.
+"""
+def wordsFromBytes(data):
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype = ">u2").astype(numpy.uint16)
+    words = array.array("H", bytes(data))
+    # array uses the machine's byte order, the bus is big-endian
+    if array.array("H", b"\x00\x01")[0] != 1:
+        words.byteswap()
+    return words
+
+
+"""
+A function to decode temperature register words to °C.  Returns float32
+values, as a NumPy array or an array.array('f').
+"""
+def decodeTemps(words):
+    if numpy is not None:
+        words = numpy.asarray(words, dtype = numpy.uint16).astype(numpy.int32)
+        # Sign extend the 13 bit value
+        value = ((words & 0x1FFF) ^ 0x1000) - 0x1000
+        return value.astype(numpy.float32) * numpy.float32(0.0625)
+    return array.array("f", [(((word & 0x1FFF) ^ 0x1000) - 0x1000) * 0.0625
+                             for word in words])
+
+
+"""
+A function to get the alert flags out of temperature register words.
+Returns one byte per word, with CRIT_FLAG, UPPER_FLAG and LOWER_FLAG set as
+the register's bits 15, 14 and 13 were.
+"""
+def decodeAlertFlags(words):
+    if numpy is not None:
+        words = numpy.asarray(words, dtype = numpy.uint16)
+        return (words >> 13).astype(numpy.uint8)
+    return array.array("B", [word >> 13 for word in words])
+
+
+"""
+A function to decode tUpper, tLower or tCrit register words to °C.  Returns
+float32 values, as a NumPy array or an array.array('f').
+"""
+def decodeLimits(words):
+    if numpy is not None:
+        words = numpy.asarray(words, dtype = numpy.uint16).astype(numpy.int32)
+        # Sign extend the 11 bit value
+        value = (((words >> 2) & 0x7FF) ^ 0x400) - 0x400
+        return value.astype(numpy.float32) * numpy.float32(0.25)
+    return limits.decodeLimitWords(words)
@@ -0,0 +1,99 @@
+"""
+An in-memory transport for running the driver without any hardware.  Each
+address on the fake bus holds a FakeDevice, which is just a set of register
+values that can be read and written.
+"""
+
+import errno
+
+from .buslock import BusLock
+from .transport import Transport
+
+
+class FakeDevice:
+
+
+    """
+    A bare MCP9808 register file.  Starts with the power-on values from the
+    datasheet and a temperature of 20°C, and does nothing clever when
+    registers are written.
+    """
+    def __init__(self):
+        self.registers = {
+            0x01: 0x0000,   # Config
+            0x02: 0x0000,   # tUpper
+            0x03: 0x0000,   # tLower
+            0x04: 0x0000,   # tCrit
+            0x05: 0x0140,   # Temperature, 20°C
+            0x06: 0x0054,   # Manufacturer ID
+            0x07: 0x0400,   # Device ID / revision
+            0x08: 0x03,     # Resolution, 0.0625°C
+        }
+
+
+    """
+    Read numBytes bytes from a register.  The resolution register is the only
+    8 bit register, the rest are 16 bit.
+    """
+    def read(self, register, numBytes):
+        value = self.registers.get(register, 0)
+        if register != 0x08:
+            data = bytes([value >> 8, value & 0xFF])
+        else:
+            data = bytes([value & 0xFF])
+        # Pad with 0xFF like an open bus if more bytes are asked for
+        return (data + b"\xff" * numBytes)[:numBytes]
+
+
+    """
+    Write a list of byte values to a register.
+    """
+    def write(self, register, values):
+        value = 0
+        for byte in values:
+            value = (value << 8) | byte
+        self.registers[register] = value
+
+
+class FakeTransport(Transport):
+
+
+    """
+    devices maps i2c addresses to FakeDevice (or compatible) objects.  If it
+    isn't given, a single FakeDevice is put at 0x18.  transactions counts
+    every read and write done through the transport.
+    """
+    def __init__(self, devices = None):
+        if devices is None:
+            devices = {0x18: FakeDevice()}
+        self.devices = devices
+        self.transactions = 0
+        self._lock = BusLock()
+
+
+    """
+    Internal function to find the device at address, raising the same error
+    a real bus gives when nothing ACKs.
+    """
+    def _device(self, address):
+        self.transactions += 1
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(errno.EREMOTEIO, "No device at address " + hex(address))
+        return device
+
+
+    """
+    Read numBytes bytes from a register of the device at address.
+    """
+    def read(self, address, register, numBytes):
+        with self.lock:
+            return self._device(address).read(register, numBytes)
+
+
+    """
+    Write the list of byte values to a register of the device at address.
+    """
+    def write(self, address, register, values):
+        with self.lock:
+            self._device(address).write(register, list(values))
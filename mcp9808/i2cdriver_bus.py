@@ -0,0 +1,68 @@
+"""
+Transport for the I2CDriver USB adapter (https://i2cdriver.com/).
+"""
+
+import i2cdriver
+
+from .buslock import busLock
+from .transport import Transport
+
+
+class I2CDriverTransport(Transport):
+
+
+    """
+    port is either the serial port the I2CDriver is on (e.g. "COM41" or
+    "/dev/ttyUSB0") or an already opened i2cdriver.I2CDriver.  Transports
+    on the same I2CDriver share one BusLock.
+    """
+    def __init__(self, port = "COM41"):
+        if isinstance(port, str):
+            self._lock = busLock("i2cdriver:" + port)
+            port = i2cdriver.I2CDriver(port)
+        else:
+            self._lock = busLock("i2cdriver:" + str(id(port)))
+        self.i2c = port
+
+
+    """
+    Read numBytes bytes from a register of the device at address.
+    """
+    def read(self, address, register, numBytes):
+        with self.lock:
+            # Open a channel to the device at address in write mode
+            self.i2c.start(address, 0)
+            # Point to the register to be read
+            self.i2c.write([register])
+            # Halt the bus
+            self.i2c.stop()
+            # Open a channel to the device at address in read mode
+            self.i2c.start(address, 1)
+            # Read numBytes bytes of data
+            data = self.i2c.read(numBytes)
+            # Stop the bus
+            self.i2c.stop()
+
+        return data
+
+
+    """
+    Write the list of byte values to a register of the device at address.
+    """
+    def write(self, address, register, values):
+        with self.lock:
+            # Open a channel to the device at address in write mode
+            self.i2c.start(address, 0)
+            # Write the register address followed by the values
+            self.i2c.write([register] + list(values))
+            # Halt the bus
+            self.i2c.stop()
+
+
+    """
+    Reset the I2C bus with the I2CDriver's bus reset, which clocks SCL until
+    any device holding SDA low lets go.
+    """
+    def recover(self):
+        with self.lock:
+            self.i2c.reset()
@@ -0,0 +1,170 @@
+"""
+Table driven conversion between temperatures and the tUpper, tLower and
+tCrit registers.  The limit registers hold an 11 bit two's complement value
+in 1/4 °C in bits 2-12, and the driver only accepts limits from -20°C to
+100°C, so both directions fit in small tables:
+
+    encodeTable()  the two register bytes for every 0.25°C step from -20°C
+                   to 100°C, back to back in one bytes object (962 bytes)
+    decodeTable()  °C for every 11 bit register value, as an array('f')
+
+Encoding a limit is then a slice of the encode table and decoding one an
+index into the decode table, with no float division or two's complement
+arithmetic per call.  The tables are only built the first time they are
+needed, so importing the driver costs nothing.  On CircuitPython and
+MicroPython, where RAM matters more than a few arithmetic operations, no
+tables are built at all and the same results are worked out on every call.
+
+encodeLimits and decodeLimitWords do whole lists at once, e.g. for moving
+the windows of many sensors.
+
+    from mcp9808 import limits
+    limits.limitBytes(25.5)               # b'\\x01\\x98'
+    limits.decodeLimit(0x0198)            # 25.5
+"""
+
+import array, sys
+
+# The range of limits the driver accepts, in °C
+LIMIT_MIN = -20
+LIMIT_MAX = 100
+# Limits are in 0.25°C steps, so there are 4 steps per °C
+STEPS_PER_DEGREE = 4
+# Microcontroller builds work the conversions out rather than keep tables
+USE_TABLES = sys.implementation.name not in ("circuitpython", "micropython")
+
+_STEP_MIN = LIMIT_MIN * STEPS_PER_DEGREE
+_STEP_MAX = LIMIT_MAX * STEPS_PER_DEGREE
+# The tables, once built
+_encode = None
+_decode = None
+
+
+"""
+Internal function to work out the register word for a signed number of
+0.25°C steps.
+"""
+def _word(steps):
+    return (steps & 0x7FF) << 2
+
+
+"""
+Internal function to work out °C from an 11 bit register value.
+"""
+def _celsius(code):
+    return ((code ^ 0x400) - 0x400) / STEPS_PER_DEGREE
+
+
+"""
+A function to get the encode table, building it the first time: a bytes
+object holding the two register bytes for each step from LIMIT_MIN up.
+"""
+def encodeTable():
+    global _encode
+    if _encode is None:
+        words = bytearray()
+        for steps in range(_STEP_MIN, _STEP_MAX + 1):
+            word = _word(steps)
+            words.append(word >> 8)
+            words.append(word & 0xFF)
+        _encode = bytes(words)
+    return _encode
+
+
+"""
+A function to get the decode table, building it the first time: °C for
+every 11 bit register value.  Every limit is a multiple of 0.25 and so is
+held exactly in single precision.
+"""
+def decodeTable():
+    global _decode
+    if _decode is None:
+        _decode = array.array("f", [_celsius(code) for code in range(0x800)])
+    return _decode
+
+
+"""
+A function to check that a value can go in a limit register: an int or
+float from LIMIT_MIN to LIMIT_MAX inclusive.
+"""
+def validLimit(value):
+    return (isinstance(value, int) or isinstance(value, float)) and\
+        ((value >= LIMIT_MIN) and (value <= LIMIT_MAX))
+
+
+"""
+Internal function to turn a temperature into a number of 0.25°C steps.
+Temperatures between steps are rounded towards zero, as the sensor itself
+has always been given them.
+"""
+def _steps(temperature):
+    steps = int(temperature * STEPS_PER_DEGREE)
+    if steps < _STEP_MIN or steps > _STEP_MAX:
+        raise IndexError("Limit outside " + str(LIMIT_MIN) + " to "
+                         + str(LIMIT_MAX) + ": " + str(temperature))
+    return steps
+
+
+"""
+A function to get the register word for a limit.  The temperature must pass
+validLimit, anything else raises IndexError.
+"""
+def encodeLimit(temperature):
+    steps = _steps(temperature)
+    if not USE_TABLES:
+        return _word(steps)
+    table = encodeTable()
+    i = 2 * (steps - _STEP_MIN)
+    return (table[i] << 8) | table[i + 1]
+
+
+"""
+A function to get the two bytes to write to a limit register for a
+temperature.  The temperature must pass validLimit, anything else raises
+IndexError.
+"""
+def limitBytes(temperature):
+    steps = _steps(temperature)
+    if not USE_TABLES:
+        word = _word(steps)
+        return bytes((word >> 8, word & 0xFF))
+    i = 2 * (steps - _STEP_MIN)
+    return encodeTable()[i:i + 2]
+
+
+"""
+A function to turn a limit register word into °C.
+"""
+def decodeLimit(word):
+    if not USE_TABLES:
+        return _celsius((word >> 2) & 0x7FF)
+    return decodeTable()[(word >> 2) & 0x7FF]
+
+
+"""
+A function to turn the two bytes read from a limit register into °C.
+"""
+def decodeLimitBytes(data):
+    return decodeLimit((data[0] << 8) | data[1])
+
+
+"""
+A function to encode a whole list of limits.  Returns an array.array('H')
+of register words.
+"""
+def encodeLimits(temperatures):
+    return array.array("H", [encodeLimit(temperature)
+                             for temperature in temperatures])
+
+
+"""
+A function to decode a whole list of limit register words.  Returns an
+array.array('f') of °C.  decode.decodeLimits does the same with NumPy when
+it is installed.
+"""
+def decodeLimitWords(words):
+    if not USE_TABLES:
+        return array.array("f", [_celsius((word >> 2) & 0x7FF)
+                                 for word in words])
+    table = decodeTable()
+    return array.array("f", [table[(word >> 2) & 0x7FF] for word in words])
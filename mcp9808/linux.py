@@ -0,0 +1,319 @@
+"""
+Transport for Linux i2c-dev buses (/dev/i2c-N), e.g. the Raspberry Pi GPIO
+header.
+"""
+
+import os, fcntl, ctypes, errno
+
+from .buslock import busLock
+from .transport import Transport
+
+# ioctl request numbers and flags from linux/i2c-dev.h and linux/i2c.h
+I2C_SLAVE = 0x0703
+I2C_FUNCS = 0x0705
+I2C_RDWR = 0x0707
+I2C_M_RD = 0x0001
+I2C_FUNC_I2C = 0x00000001
+# Most messages the kernel accepts in one I2C_RDWR ioctl
+I2C_RDWR_IOCTL_MAX_MSGS = 42
+# Size of the preallocated buffers.  The MCP9808's registers are at most 2
+# bytes, anything longer gets buffers of its own.
+BUFFER_SIZE = 32
+
+
+"""
+ctypes mirror of the kernel's struct i2c_msg.  One of these describes a single
+segment (write or read) of a combined I2C_RDWR transaction.
+"""
+class i2c_msg(ctypes.Structure):
+    _fields_ = [("addr", ctypes.c_uint16),
+                ("flags", ctypes.c_uint16),
+                ("len", ctypes.c_uint16),
+                ("buf", ctypes.POINTER(ctypes.c_uint8))]
+
+
+"""
+ctypes mirror of the kernel's struct i2c_rdwr_ioctl_data, which points at an
+array of i2c_msg structs to be run back-to-back with repeated starts.
+"""
+class i2c_rdwr_ioctl_data(ctypes.Structure):
+    _fields_ = [("msgs", ctypes.POINTER(i2c_msg)),
+                ("nmsgs", ctypes.c_uint32)]
+
+
+class LinuxI2C(Transport):
+
+
+    """
+    busNumber picks /dev/i2c-N.  combined chooses how register reads are
+    done.  True uses a single I2C_RDWR ioctl (pointer write, repeated start,
+    data read), False uses a separate write() and read() with a STOP in
+    between, and None (default) uses I2C_RDWR if the adapter reports plain
+    I2C support.  Every LinuxI2C on the same bus in a process shares one
+    BusLock.  If processLock is True the lock also holds flock() on the
+    device node, so other processes doing the same take turns.  That is two
+    more syscalls every time the lock is taken, so it is off by default;
+    hold the lock across a sequence of transactions to pay for it once.
+    """
+    def __init__(self, busNumber = 1, combined = None, processLock = False):
+        self.busNumber = busNumber
+        path = "/dev/i2c-" + str(busNumber)
+        self.bus = os.open(path, os.O_RDWR)
+        self._lock = busLock(path, path if processLock else None)
+        # The address the fd is currently pointed at with I2C_SLAVE
+        self.slaveAddress = None
+
+        # Buffers and I2C_RDWR messages made once and reused for every
+        # transaction, so reading a register doesn't build any new ctypes
+        # objects, lists or bytearrays
+        self._pointer = (ctypes.c_uint8 * 1)()
+        self._data = (ctypes.c_uint8 * BUFFER_SIZE)()
+        self._dataView = memoryview(self._data).cast("B")
+        self._msgs = (i2c_msg * 2)(
+            i2c_msg(0, 0, 1, self._pointer),
+            i2c_msg(0, I2C_M_RD, 0, self._data))
+        # Views onto the two messages, for filling them in place
+        self._pointerMsg = self._msgs[0]
+        self._dataMsg = self._msgs[1]
+        self._request = i2c_rdwr_ioctl_data(self._msgs, 2)
+        self._writeBuffer = bytearray(BUFFER_SIZE + 1)
+        self._writeView = memoryview(self._writeBuffer)
+        # The requests and buffer readManyInto last set up ioctls for, the
+        # ioctls, and the ctypes objects they point at
+        self._manyRequests = None
+        self._manyBuffer = None
+        self._manyIoctls = []
+        self._manyKeep = []
+
+        # Work out whether the adapter can do combined transactions
+        if combined is None:
+            funcs = ctypes.c_uint32(0)
+            fcntl.ioctl(self.bus, I2C_FUNCS, funcs)
+            combined = bool(funcs.value & I2C_FUNC_I2C)
+        self.combined = combined
+
+
+    """
+    Internal function to point the fd at a device.  Skips the ioctl if it is
+    already pointed there, since several sensors can share one transport.
+    """
+    def _setSlave(self, address):
+        if address != self.slaveAddress:
+            fcntl.ioctl(self.bus, I2C_SLAVE, address)
+            self.slaveAddress = address
+
+
+    """
+    Read numBytes bytes from a register of the device at address.
+    """
+    def read(self, address, register, numBytes):
+        with self.lock:
+            return self._read(address, register, numBytes)
+
+
+    """
+    Internal function doing the work of read() with the lock held.
+    """
+    def _read(self, address, register, numBytes):
+        if numBytes > BUFFER_SIZE:
+            data = bytearray(numBytes)
+            self._readInto(address, register, data)
+            return bytes(data)
+        if self.combined:
+            self._readCombined(address, register, numBytes)
+            return bytes(self._dataView[:numBytes])
+        self._setSlave(address)
+        # Point to the register to be read
+        self._pointer[0] = register
+        os.write(self.bus, self._pointer)
+        # Read numBytes bytes of data
+        data = os.read(self.bus, numBytes)
+        if len(data) != numBytes:
+            raise OSError(errno.EIO, "Short read from " + hex(address))
+        return data
+
+
+    """
+    Read len(buffer) bytes from a register of the device at address into
+    buffer.  Nothing is allocated for reads of up to BUFFER_SIZE bytes apart
+    from a slice of a memoryview.
+    """
+    def readInto(self, address, register, buffer):
+        with self.lock:
+            self._readInto(address, register, buffer)
+
+
+    """
+    Internal function doing the work of readInto() with the lock held.
+    """
+    def _readInto(self, address, register, buffer):
+        numBytes = len(buffer)
+        if numBytes > BUFFER_SIZE:
+            self._readLong(address, register, buffer)
+        elif self.combined:
+            self._readCombined(address, register, numBytes)
+            buffer[:] = self._dataView[:numBytes]
+        else:
+            self._setSlave(address)
+            self._pointer[0] = register
+            os.write(self.bus, self._pointer)
+            if os.readv(self.bus, (buffer,)) != numBytes:
+                raise OSError(errno.EIO, "Short read from " + hex(address))
+
+
+    """
+    Internal function to read a register in one I2C_RDWR ioctl into the
+    preallocated data buffer.  The register pointer write and the data read
+    go out as one transaction with a repeated start, so nothing else on the
+    bus can move the pointer in between.
+    """
+    def _readCombined(self, address, register, numBytes):
+        self._pointer[0] = register
+        self._pointerMsg.addr = address
+        self._dataMsg.addr = address
+        self._dataMsg.len = numBytes
+        fcntl.ioctl(self.bus, I2C_RDWR, self._request)
+
+
+    """
+    Internal function for reads too long for the preallocated buffers.
+    """
+    def _readLong(self, address, register, buffer):
+        numBytes = len(buffer)
+        if not self.combined:
+            self._setSlave(address)
+            os.write(self.bus, bytes([register]))
+            if os.readv(self.bus, (buffer,)) != numBytes:
+                raise OSError(errno.EIO, "Short read from " + hex(address))
+            return
+        pointer = (ctypes.c_uint8 * 1)(register)
+        data = (ctypes.c_uint8 * numBytes).from_buffer(buffer)
+        msgs = (i2c_msg * 2)(
+            i2c_msg(address, 0, 1, pointer),
+            i2c_msg(address, I2C_M_RD, numBytes, data))
+        fcntl.ioctl(self.bus, I2C_RDWR, i2c_rdwr_ioctl_data(msgs, 2))
+
+
+    """
+    Read several registers, possibly from different devices, using as few
+    I2C_RDWR ioctls as the kernel allows.  Each read is a pointer write and
+    a data read, so up to 21 registers go in each ioctl.  If any device in a
+    batch NACKs the whole ioctl fails with OSError.
+    """
+    def readMany(self, requests):
+        if not self.combined:
+            with self.lock:
+                return Transport.readMany(self, requests)
+
+        results = []
+        perBatch = I2C_RDWR_IOCTL_MAX_MSGS // 2
+        for start in range(0, len(requests), perBatch):
+            batch = requests[start:start + perBatch]
+            msgs = (i2c_msg * (2 * len(batch)))()
+            buffers = []
+            for i, (address, register, numBytes) in enumerate(batch):
+                pointer = (ctypes.c_uint8 * 1)(register)
+                data = (ctypes.c_uint8 * numBytes)()
+                # Keep the buffers alive until the ioctl is done
+                buffers.append((pointer, data))
+                msgs[2 * i] = i2c_msg(address, 0, 1, pointer)
+                msgs[2 * i + 1] = i2c_msg(address, I2C_M_RD, numBytes, data)
+            request = i2c_rdwr_ioctl_data(msgs, len(msgs))
+            # Each ioctl is atomic on the bus, so other users can get in
+            # between batches
+            with self.lock:
+                fcntl.ioctl(self.bus, I2C_RDWR, request)
+            results.extend(bytes(data) for (pointer, data) in buffers)
+
+        return results
+
+
+    """
+    Read several registers straight into buffer, back to back, batched as
+    for readMany.  The I2C_RDWR messages point into buffer itself and are
+    only built when the requests or buffer differ from last time, so
+    reading a fixed set of sensors this way allocates nothing per sweep.
+    buffer must be a bytearray (or other writable buffer ctypes accepts),
+    and can't be resized while the transport is set up for it.
+    """
+    def readManyInto(self, requests, buffer):
+        if not self.combined:
+            with self.lock:
+                Transport.readManyInto(self, requests, buffer)
+            return
+        if buffer is not self._manyBuffer or requests != self._manyRequests:
+            self._prepareMany(requests, buffer)
+        for request in self._manyIoctls:
+            with self.lock:
+                fcntl.ioctl(self.bus, I2C_RDWR, request)
+
+
+    """
+    Internal function to build the ioctls for readManyInto.
+    """
+    def _prepareMany(self, requests, buffer):
+        perBatch = I2C_RDWR_IOCTL_MAX_MSGS // 2
+        ioctls = []
+        keep = []
+        offset = 0
+        for start in range(0, len(requests), perBatch):
+            batch = requests[start:start + perBatch]
+            msgs = (i2c_msg * (2 * len(batch)))()
+            for i, (address, register, numBytes) in enumerate(batch):
+                pointer = (ctypes.c_uint8 * 1)(register)
+                data = (ctypes.c_uint8 * numBytes).from_buffer(buffer, offset)
+                offset = offset + numBytes
+                keep.append((pointer, data))
+                msgs[2 * i] = i2c_msg(address, 0, 1, pointer)
+                msgs[2 * i + 1] = i2c_msg(address, I2C_M_RD, numBytes, data)
+            keep.append(msgs)
+            ioctls.append(i2c_rdwr_ioctl_data(msgs, len(msgs)))
+        # Let go of the old buffer before taking the new one
+        self._manyKeep = keep
+        self._manyIoctls = ioctls
+        self._manyRequests = list(requests)
+        self._manyBuffer = buffer
+
+
+    """
+    Write the list of byte values to a register of the device at address.
+    """
+    def write(self, address, register, values):
+        with self.lock:
+            self._write(address, register, values)
+
+
+    """
+    Internal function doing the work of write() with the lock held.
+    """
+    def _write(self, address, register, values):
+        self._setSlave(address)
+        numBytes = len(values)
+        if numBytes > BUFFER_SIZE:
+            os.write(self.bus, bytes([register]) + bytes(values))
+            return
+        self._writeBuffer[0] = register
+        self._writeBuffer[1:numBytes + 1] = values
+        os.write(self.bus, self._writeView[:numBytes + 1])
+
+
+    """
+    Reopen /dev/i2c-N.  i2c-dev has no way to clock out a stuck bus from
+    user space, but reopening drops any state left on the old file
+    descriptor, and the adapter driver does its own recovery on the next
+    transfer where the hardware supports it.
+    """
+    def recover(self):
+        with self.lock:
+            self.close()
+            self.bus = os.open("/dev/i2c-" + str(self.busNumber), os.O_RDWR)
+            self.slaveAddress = None
+
+
+    """
+    Close the /dev/i2c-N file descriptor.
+    """
+    def close(self):
+        if self.bus is not None:
+            os.close(self.bus)
+            self.bus = None
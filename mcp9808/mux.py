@@ -0,0 +1,406 @@
+"""
+Sensors behind PCA9548/TCA9548 I2C multiplexers.  An MCP9808 only has eight
+addresses, so bigger installations put groups of sensors on the downstream
+channels of a mux (itself at 0x70 - 0x77) and switch between them.
+
+    from mcp9808.mux import MuxBus
+    from mcp9808.linux import LinuxI2C
+
+    bus = MuxBus(LinuxI2C(1))
+    mux = bus.addMux(0x70)
+    bus.addSensor(0x18, mux, 0)          # 0x18 on channel 0
+    bus.discover()                       # or scan every channel
+    temperatures = bus.readTemps()
+
+Each sensor added is an ordinary MCP9808 whose transport is a MuxChannel, so
+it selects its channel by itself when used on its own.  Sweeps of the whole
+bus go through a planner instead, which reads every sensor on a channel in
+one batch and orders the channels so that each one is selected at most once
+per sweep.  Channels whose sensors have different addresses are opened
+together and read as one.  Selecting a channel is a bus transaction of its
+own, and a mux remembers what it has selected, so a channel that is already
+open isn't selected again.
+"""
+
+from .bus import ADDRESSES, BusManager, scan
+from .core import MCP9808
+from .transport import Transport
+
+# Every address a PCA9548/TCA9548 can be strapped to
+MUX_ADDRESSES = range(0x70, 0x78)
+CHANNELS = 8
+
+
+class TCA9548:
+
+
+    """
+    transport is the bus the mux is on and address its address.  The mux has
+    a single control register, written as one byte with a bit per channel to
+    connect.  bus is the MuxBus it belongs to, if any, which makes sure only
+    one mux on the bus has channels open at a time.
+    """
+    def __init__(self, transport, address = 0x70, bus = None):
+        self.transport = transport
+        self.address = address
+        self.bus = bus
+        # The channel mask last written, or None if it isn't known
+        self.selected = None
+        # The bus lock's flock() count when selected was last known good
+        self._fileLocks = 0
+        # How many times the control register has been written
+        self.switches = 0
+
+
+    """
+    A function to connect the channels set in mask (bit n for channel n) and
+    disconnect the rest.  Does nothing if they are already the ones
+    connected.  If the bus lock is shared with other processes (see
+    LinuxI2C's processLock) one of them may have switched the mux since the
+    lock was last held, so then the register is written again each time the
+    lock is newly taken.
+    """
+    def setChannels(self, mask):
+        lock = self.transport.lock
+        with lock:
+            fileLocks = getattr(lock, "fileLocks", 0)
+            if fileLocks != self._fileLocks:
+                self.selected = None
+                self._fileLocks = fileLocks
+            if mask and self.bus is not None:
+                self.bus._activate(self)
+            if mask != self.selected:
+                # The control byte goes where a register pointer would
+                self.transport.write(self.address, mask, [])
+                self.selected = mask
+                self.switches = self.switches + 1
+
+
+    """
+    A function to connect just one channel, 0-7.
+    """
+    def select(self, channel):
+        self.setChannels(1 << channel)
+
+
+    """
+    A function to disconnect every channel.
+    """
+    def disable(self):
+        self.setChannels(0)
+
+
+    """
+    A function to forget which channels are connected, e.g. after something
+    else has used the mux, so that the next select() writes the register.
+    """
+    def invalidate(self):
+        self.selected = None
+
+
+    """
+    A function to get a transport for one channel, to give to an MCP9808.
+    """
+    def channel(self, channel):
+        return MuxChannel(self, channel)
+
+
+class MuxChannel(Transport):
+
+
+    """
+    A transport reaching the devices on one channel of a mux.  The channel is
+    selected before every transaction, which costs nothing extra while it
+    stays selected.  The bus lock is held across the select and the
+    transaction, so no one else can switch the mux in between.
+    """
+    def __init__(self, mux, channel):
+        if not 0 <= channel < CHANNELS:
+            raise ValueError("Mux channels are 0-7, not " + str(channel))
+        self.mux = mux
+        self.channel = channel
+        self.transport = mux.transport
+
+
+    def read(self, address, register, numBytes):
+        with self.lock:
+            self.mux.select(self.channel)
+            return self.transport.read(address, register, numBytes)
+
+
+    def readInto(self, address, register, buffer):
+        with self.lock:
+            self.mux.select(self.channel)
+            self.transport.readInto(address, register, buffer)
+
+
+    def readMany(self, requests):
+        with self.lock:
+            self.mux.select(self.channel)
+            return self.transport.readMany(requests)
+
+
+    def readManyInto(self, requests, buffer):
+        with self.lock:
+            self.mux.select(self.channel)
+            self.transport.readManyInto(requests, buffer)
+
+
+    def write(self, address, register, values):
+        with self.lock:
+            self.mux.select(self.channel)
+            self.transport.write(address, register, values)
+
+
+    """
+    The lock of the bus the mux is on.
+    """
+    @property
+    def lock(self):
+        return self.transport.lock
+
+
+    def noteRetry(self, address, register):
+        self.transport.noteRetry(address, register)
+
+
+    """
+    Recover the bus, and forget the mux's channel in case it was reset too.
+    """
+    def recover(self):
+        self.transport.recover()
+        self.mux.invalidate()
+
+
+    """
+    Does nothing, the bus belongs to whoever made the mux.
+    """
+    def close(self):
+        pass
+
+
+class MuxBus(BusManager):
+
+
+    """
+    transport is the bus the muxes are on (the upstream side).  retry and
+    reprobe are as for BusManager.  combine lets the planner open several
+    channels of a mux at once when the sensors on them have different
+    addresses.
+    """
+    def __init__(self, transport = None, retry = None, combine = True,
+                 reprobe = 1.0):
+        BusManager.__init__(self, transport, retry, reprobe)
+        self.combine = combine
+        self.muxes = []
+
+
+    """
+    A function to add the mux at address.  Returns it.
+    """
+    def addMux(self, address = 0x70):
+        mux = TCA9548(self.transport, address, self)
+        self.muxes.append(mux)
+        return mux
+
+
+    """
+    A function to find the muxes on the bus by writing 0 (every channel off)
+    to each address and keeping the ones that ACK.  Returns the muxes added.
+    """
+    def discoverMuxes(self, addresses = MUX_ADDRESSES):
+        known = [mux.address for mux in self.muxes]
+        added = []
+        for address in addresses:
+            if address in known:
+                continue
+            try:
+                self.transport.write(address, 0, [])
+            except OSError:
+                continue
+            mux = self.addMux(address)
+            mux.selected = 0
+            added.append(mux)
+        return added
+
+
+    """
+    Internal function called by a mux before it connects any channels.  Two
+    muxes with channels open at once would put both channels' devices on the
+    bus together, so every other mux is switched off first.
+    """
+    def _activate(self, active):
+        for mux in self.muxes:
+            if mux is not active and mux.selected != 0:
+                mux.disable()
+
+
+    """
+    A function to add the sensor at address on channel of mux, or straight
+    on the bus if mux is None.  A mux that wasn't made by addMux is taken
+    over by the bus.  Any keyword arguments are passed on to MCP9808.
+    Returns the new sensor.
+    """
+    def addSensor(self, address, mux = None, channel = None, **kwargs):
+        if mux is None:
+            return BusManager.addSensor(self, address, **kwargs)
+        if mux not in self.muxes:
+            mux.bus = self
+            self.muxes.append(mux)
+        kwargs.setdefault("retry", self.retry)
+        sensor = MCP9808(address, mux.channel(channel), **kwargs)
+        self.sensors.append(sensor)
+        return sensor
+
+
+    """
+    A function to scan the bus and every channel of every mux, adding each
+    MCP9808 found that isn't already on it.  Devices straight on the bus
+    show up on every channel, so they are only added once, as direct
+    sensors.  Any keyword arguments are passed on to MCP9808.  Returns a
+    list of the sensors added.
+    """
+    def discover(self, addresses = ADDRESSES, **kwargs):
+        known = set(self._location(sensor) for sensor in self.sensors)
+        added = []
+        with self.transport.lock:
+            for mux in self.muxes:
+                mux.disable()
+            direct = scan(self.transport, addresses)
+        for address in direct:
+            if (None, None, address) not in known:
+                added.append(self.addSensor(address, checkID = False,
+                                            **kwargs))
+        for mux in self.muxes:
+            for channel in range(CHANNELS):
+                # Held so that the channel can't be switched under the scan
+                with self.transport.lock:
+                    mux.select(channel)
+                    found = scan(self.transport, addresses)
+                for address in found:
+                    if address not in direct and \
+                       (mux, channel, address) not in known:
+                        added.append(self.addSensor(address, mux, channel,
+                                                    checkID = False,
+                                                    **kwargs))
+            mux.disable()
+        return added
+
+
+    """
+    Internal function to get where a sensor is, as (mux, channel, address).
+    mux and channel are None for sensors straight on the bus.
+    """
+    def _location(self, sensor):
+        if isinstance(sensor.transport, MuxChannel):
+            return (sensor.transport.mux, sensor.transport.channel,
+                    sensor.address)
+        return (None, None, sensor.address)
+
+
+    """
+    A function to plan a sweep of every sensor.  Returns a list of (mux,
+    mask, indexes): connect the channels in mask on mux (mux None meaning
+    every mux off) and read the sensors at those indexes of self.sensors in
+    one batch.
+
+    Sensors are grouped by channel, and if combine is set, channels of the
+    same mux whose sensors all have different addresses share a group.
+    Sensors straight on the bus join any group they don't clash with.  The
+    groups are ordered by mux, starting from whatever is connected now, so
+    a sweep selects each channel at most once and leaves off where the next
+    one starts.
+    """
+    def plan(self):
+        # Channel groups in the order their muxes were added, as
+        # [mux, mask, indexes, addresses]
+        groups = []
+        direct = []
+        byChannel = {}
+        for i, sensor in enumerate(self.sensors):
+            mux, channel, address = self._location(sensor)
+            if mux is None:
+                direct.append(i)
+                continue
+            key = (id(mux), channel)
+            if key not in byChannel:
+                byChannel[key] = [mux, 1 << channel, [], set()]
+            byChannel[key][2].append(i)
+            byChannel[key][3].add(address)
+
+        for mux in self.muxes:
+            channels = [group for group in byChannel.values()
+                        if group[0] is mux]
+            merged = []
+            for group in sorted(channels, key = lambda group: group[1]):
+                for other in merged:
+                    if self.combine and other[0] is group[0] and \
+                       not (other[3] & group[3]):
+                        other[1] = other[1] | group[1]
+                        other[2].extend(group[2])
+                        other[3] = other[3] | group[3]
+                        break
+                else:
+                    merged.append(group)
+            groups.extend(merged)
+
+        # Sensors straight on the bus are seen whatever is connected, as long
+        # as nothing on the open channels has the same address
+        for i in direct:
+            address = self.sensors[i].address
+            for group in groups:
+                if address not in group[3]:
+                    group[2].append(i)
+                    group[3].add(address)
+                    break
+            else:
+                if not groups or groups[-1][0] is not None:
+                    groups.append([None, 0, [], set()])
+                groups[-1][2].append(i)
+                groups[-1][3].add(address)
+
+        # Start with what is connected already, so it isn't selected twice
+        for n, group in enumerate(groups):
+            if group[0] is not None and group[0].selected == group[1]:
+                groups = groups[n:] + groups[:n]
+                break
+        return [(mux, mask, indexes) for (mux, mask, indexes, addresses)
+                in groups]
+
+
+    """
+    A function to read the temperature register of every sensor, following
+    plan().  Returns a list of the raw 2 byte register contents in the same
+    order as self.sensors, with None for any sensor that couldn't be read.
+    Missing sensors are handled as for BusManager.readRaw.
+    """
+    def readRaw(self):
+        results = [None] * len(self.sensors)
+        for mux, mask, indexes in self.plan():
+            # Hold the bus from switching the mux until the group is read
+            with self.transport.lock:
+                self._readGroup(mux, mask, indexes, results)
+        return results
+
+
+    """
+    A function like BusManager.readRawInto, following plan().  The groups
+    each need their own channels selected, so this copies from readRaw()
+    rather than reading straight into buffer.
+    """
+    def readRawInto(self, buffer):
+        return self._copyRaw(self.readRaw(), buffer)
+
+
+    """
+    Internal function to read one group of plan() into results.
+    """
+    def _readGroup(self, mux, mask, indexes, results):
+        if mux is None:
+            for other in self.muxes:
+                other.disable()
+        else:
+            mux.setChannels(mask)
+        data = self._readBatch([self.sensors[i] for i in indexes])
+        for i, raw in zip(indexes, data):
+            results[i] = raw
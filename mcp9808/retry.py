@@ -0,0 +1,74 @@
+"""
+Riding out bus glitches.  A RetryPolicy says how many times to try a
+transaction, how long to back off between tries, and how long to keep going
+in total.  Give one to an MCP9808 (or a BusManager) and every register read
+and write it does is retried under that policy:
+
+    from mcp9808.retry import RetryPolicy
+
+    policy = RetryPolicy(attempts = 4, backoff = 0.002, deadline = 0.05)
+    sensor = mcp9808.MCP9808(0x18, LinuxI2C(1), retry = policy)
+
+After recoverAfter failures in a row the transport's recover() is called
+before trying again, which reopens the bus (Linux) or resets it (I2CDriver).
+"""
+
+import time
+
+
+class RetryPolicy:
+
+
+    """
+    attempts is the most tries a transaction gets, including the first.
+    backoff is the wait in seconds before the first retry, multiplied by
+    multiplier for each retry after that up to maxBackoff.  deadline, if
+    given, is the most time in seconds to spend on one transaction: no retry
+    is started that would wait past it.  recoverAfter is how many failures
+    in a row it takes before the transport is asked to recover the bus, or 0
+    to never ask.
+    """
+    def __init__(self, attempts = 3, backoff = 0.001, multiplier = 2,
+                 maxBackoff = 0.05, deadline = None, recoverAfter = 2,
+                 clock = time.monotonic, sleep = time.sleep):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.maxBackoff = maxBackoff
+        self.deadline = deadline
+        self.recoverAfter = recoverAfter
+        self.clock = clock
+        self.sleep = sleep
+
+
+    """
+    A function to call function(*args) under the policy.  transport is the
+    transport the call goes through, and registers a list of the (address,
+    register) pairs it touches, so that retries can be counted against them
+    and the bus recovered.  The last error is raised if every try fails.
+    """
+    def call(self, transport, registers, function, *args):
+        start = self.clock()
+        delay = self.backoff
+        failures = 0
+        while True:
+            try:
+                return function(*args)
+            except OSError:
+                failures = failures + 1
+                if failures >= self.attempts:
+                    raise
+                if self.deadline is not None and \
+                   (self.clock() - start) + delay > self.deadline:
+                    raise
+
+            for address, register in registers:
+                transport.noteRetry(address, register)
+            if self.recoverAfter and failures >= self.recoverAfter:
+                try:
+                    transport.recover()
+                except OSError:
+                    # Carry on, the next try will fail if it didn't work
+                    pass
+            self.sleep(delay)
+            delay = min(delay * self.multiplier, self.maxBackoff)
@@ -0,0 +1,310 @@
+"""
+An append-only binary log of raw readings.  Every record is the same 12
+bytes: a float64 timestamp in seconds since the epoch, the raw 16 bit
+temperature register word and the sensor's address, all little-endian.
+Records are always in time order, so they can be searched by time: the
+timestamps come from time.monotonic() lined up with time.time() when the
+log is opened, so a step in the system clock can't make them go backwards.  The file is written
+through mmap, so appending a record is a struct.pack_into with no text
+formatting, and the reader maps the file straight into a NumPy array.
+
+The file starts with a 32 byte header:
+
+    8 bytes   b"MCP9808L"
+    uint16    format version (1)
+    uint16    record size (12)
+    uint64    number of records
+    12 bytes  reserved
+
+Writing:
+
+    from mcp9808.samplelog import SampleLog
+    log = SampleLog("temperatures.log")
+    log.appendBus(bus)
+    log.close()
+
+Reading (needs NumPy):
+
+    from mcp9808.samplelog import SampleLogReader
+    reader = SampleLogReader("temperatures.log")
+    records = reader.timeRange(start, end)
+    temperatures = decode.decodeTemps(records["raw"])
+"""
+
+import bisect, mmap, os, struct, time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = b"MCP9808L"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQ12x")
+RECORD = struct.Struct("<dHBx")
+# Where the record count lives in the header
+COUNT_OFFSET = 12
+# How many records the file grows by when it fills up
+GROW_RECORDS = 4096
+
+if numpy is not None:
+    # The record layout as a NumPy structured type
+    RECORD_DTYPE = numpy.dtype([("timestamp", "<f8"), ("raw", "<u2"),
+                                ("address", "u1"), ("pad", "u1")])
+
+
+"""
+Internal function to check a log header and return the number of records.
+"""
+def _readHeader(data):
+    magic, version, recordSize, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or recordSize != RECORD.size:
+        raise ValueError("Not an MCP9808 sample log (or an unknown version)")
+    return count
+
+
+class SampleLog:
+
+
+    """
+    path is the log file.  If it already exists new records are added to the
+    end of it, otherwise it is created.  Raises ValueError if the file
+    exists but isn't a sample log.
+    """
+    def __init__(self, path):
+        self.path = path
+        # Raw register bytes of a whole bus, reused by appendBus
+        self._busBuffer = bytearray()
+        self.map = None
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(self.fd).st_size
+            if size == 0:
+                os.ftruncate(self.fd, HEADER.size + GROW_RECORDS * RECORD.size)
+                os.write(self.fd, HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+            self._map()
+            self.count = _readHeader(self.map)
+        except:
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            os.close(self.fd)
+            raise
+        # Wall clock time is time.monotonic() plus this
+        self._offset = time.time() - time.monotonic()
+        # The newest timestamp in the log, which no new one may be before
+        self.last = None
+        if self.count:
+            self.last = RECORD.unpack_from(
+                self.map, HEADER.size + (self.count - 1) * RECORD.size)[0]
+
+
+    """
+    Internal function to (re)map the whole file, after it has been created
+    or grown.
+    """
+    def _map(self):
+        size = os.fstat(self.fd).st_size
+        self.map = mmap.mmap(self.fd, size)
+        self.capacity = (size - HEADER.size) // RECORD.size
+
+
+    """
+    Internal function to make room for at least one more record.
+    """
+    def _grow(self):
+        self.map.close()
+        os.ftruncate(self.fd, HEADER.size
+                     + (self.capacity + GROW_RECORDS) * RECORD.size)
+        self._map()
+
+
+    def __len__(self):
+        return self.count
+
+
+    """
+    A function to add a record.  timestamp defaults to now.  A timestamp
+    given must not be before the newest one in the log, or ValueError is
+    raised.
+    """
+    def append(self, raw, address, timestamp = None):
+        if timestamp is None:
+            timestamp = self.now()
+        elif self.last is not None and timestamp < self.last:
+            raise ValueError("Records must be added in time order")
+        if self.count == self.capacity:
+            self._grow()
+        RECORD.pack_into(self.map, HEADER.size + self.count * RECORD.size,
+                         timestamp, raw, address)
+        self.count = self.count + 1
+        self.last = timestamp
+        # Only count the record once it is all there
+        struct.pack_into("<Q", self.map, COUNT_OFFSET, self.count)
+
+
+    """
+    A function to get the time to stamp a record with: seconds since the
+    epoch, never going backwards, and never before the newest record
+    already in the log (which may be from before a clock step).
+    """
+    def now(self):
+        now = time.monotonic() + self._offset
+        if self.last is not None and now < self.last:
+            return self.last
+        return now
+
+
+    """
+    A function to read one sensor's temperature register and log it.
+    """
+    def appendSensor(self, sensor):
+        self.append(sensor.readRaw(), sensor.address)
+
+
+    """
+    A function to read every sensor on a BusManager in one sweep and log the
+    readings, all with the same timestamp.  Sensors that couldn't be read are
+    skipped.  Reads into a buffer kept for the purpose, as
+    CaptureBuffer.captureBus does.
+    """
+    def appendBus(self, bus):
+        data = self._busBuffer
+        if len(data) != 2 * len(bus.sensors):
+            data = self._busBuffer = bytearray(2 * len(bus.sensors))
+        failed = bus.readRawInto(data)
+        now = self.now()
+        i = 0
+        for sensor in bus.sensors:
+            if not (failed and i in failed):
+                self.append((data[2 * i] << 8) | data[2 * i + 1],
+                            sensor.address, now)
+            i = i + 1
+
+
+    """
+    A function to push everything written so far out to disk.
+    """
+    def flush(self):
+        self.map.flush()
+
+
+    """
+    Close the log, trimming off the unused space at the end of the file.
+    """
+    def close(self):
+        if self.map is None:
+            return
+        self.map.flush()
+        self.map.close()
+        self.map = None
+        os.ftruncate(self.fd, HEADER.size + self.count * RECORD.size)
+        os.close(self.fd)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SampleLogReader:
+
+
+    """
+    path is the log file to read.  The records present when it is opened are
+    the ones that can be read.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        try:
+            self.count = _readHeader(self.map)
+        except:
+            self.map.close()
+            raise
+
+
+    def __len__(self):
+        return self.count
+
+
+    """
+    A function to get every record as a NumPy structured array with the
+    fields timestamp, raw and address.  The array is a view straight onto
+    the mapped file, nothing is copied.
+    """
+    def records(self):
+        if numpy is None:
+            raise ImportError("SampleLogReader.records needs NumPy, use "
+                              "iterRecords instead")
+        return numpy.frombuffer(self.map, dtype = RECORD_DTYPE,
+                                count = self.count, offset = HEADER.size)
+
+
+    """
+    A function to get the records with start <= timestamp < end, as a slice
+    of records() (so still no copying).  Either end can be None to leave it
+    open.  SampleLog keeps the records in time order, so this is a binary
+    search.
+    """
+    def timeRange(self, start = None, end = None):
+        records = self.records()
+        timestamps = records["timestamp"]
+        first = 0 if start is None else \
+            int(numpy.searchsorted(timestamps, start, side = "left"))
+        last = len(records) if end is None else \
+            int(numpy.searchsorted(timestamps, end, side = "left"))
+        return records[first:last]
+
+
+    """
+    A function to go through the records without NumPy.  Yields
+    (timestamp, raw, address) tuples, optionally only those with
+    start <= timestamp < end.
+    """
+    def iterRecords(self, start = None, end = None):
+        view = memoryview(self.map)[HEADER.size:
+                                    HEADER.size + self.count * RECORD.size]
+        first = 0
+        if start is not None:
+            first = bisect.bisect_left(_Timestamps(view, self.count), start)
+        for i in range(first, self.count):
+            record = RECORD.unpack_from(view, i * RECORD.size)
+            if end is not None and record[0] >= end:
+                break
+            yield record
+
+
+    """
+    Close the reader.  If arrays from records() or timeRange() are still
+    around the file stays mapped until they are gone.
+    """
+    def close(self):
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+        self.map = None
+
+
+"""
+Internal helper letting bisect search the timestamps of mapped records
+without unpacking all of them.
+"""
+class _Timestamps:
+
+
+    def __init__(self, view, count):
+        self.view = view
+        self.count = count
+
+
+    def __len__(self):
+        return self.count
+
+
+    def __getitem__(self, i):
+        return struct.unpack_from("<d", self.view, i * RECORD.size)[0]
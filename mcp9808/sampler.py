@@ -0,0 +1,188 @@
+"""
+Sharing one sensor between many readers.  A BackgroundSampler owns the bus
+and reads the sensor on its own thread, once per conversion, and publishes
+the newest Sample.  Any number of readers (a dashboard, an alarm loop, a
+logger...) can then look at it without doing any I/O and without taking a
+lock:
+
+    from mcp9808.sampler import BackgroundSampler
+
+    sampler = BackgroundSampler(sensor)
+    sampler.start()
+    sequence, sample = sampler.latest
+
+It works with a BusManager too, in which case the published value is the
+list of Samples from BusManager.readSamples().
+"""
+
+import threading, time
+
+from .bus import BusManager
+from .core import CONVERSION_TIMES
+from .scheduler import ConversionScheduler
+
+
+class BackgroundSampler:
+
+
+    """
+    source is an MCP9808 or a BusManager.  interval is how often to read it,
+    in seconds.  If it isn't given a single sensor is read once per
+    conversion using a ConversionScheduler, and a bus is read once every
+    conversion time of its slowest sensor.  After a failed read the thread
+    waits before trying again, starting at one conversion time (or interval)
+    and doubling for every failure in a row up to maxBackoff seconds, so a
+    missing sensor doesn't flood the bus.  clock and wait are the time
+    functions the thread uses, and can be swapped out for testing.  wait
+    defaults to waiting on stop(), so that stopping cuts a wait short.
+    """
+    def __init__(self, source, interval = None, maxBackoff = 1.0,
+                 clock = time.monotonic, wait = None):
+        self.source = source
+        self.interval = interval
+        self.maxBackoff = maxBackoff
+        self.clock = clock
+        # (sequence number, newest value).  Replaced in one assignment, so a
+        # reader always gets a matching pair without any locking.
+        self.latest = (0, None)
+        # The last error the thread hit, and how many there have been
+        self.error = None
+        self.errors = 0
+        self._stop = threading.Event()
+        self.wait = wait or self._stop.wait
+        self._new = threading.Condition()
+        self._thread = None
+
+
+    """
+    A function to start the sampling thread.
+    """
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target = self._run, daemon = True,
+                                        name = "mcp9808-sampler")
+        self._thread.start()
+
+
+    """
+    A function to stop the sampling thread and wait for it to finish.
+    """
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    """
+    Internal function run by the sampling thread.
+    """
+    def _run(self):
+        if isinstance(self.source, BusManager):
+            sensors = self.source.sensors
+        else:
+            sensors = [self.source]
+        conversionTime = max([_conversionTime(sensor) for sensor in sensors]
+                             or [CONVERSION_TIMES[-1]])
+
+        if isinstance(self.source, BusManager):
+            interval = self.interval
+            if interval is None:
+                interval = conversionTime
+            read = self.source.readSamples
+        elif self.interval is None:
+            interval = 0
+            read = self._readFresh()
+        else:
+            interval = self.interval
+            read = self.source.readSample
+
+        backoff = 0
+        nextRead = self.clock()
+        while not self._stop.is_set():
+            try:
+                value = read()
+            except OSError as error:
+                self.error = error
+                self.errors = self.errors + 1
+                # Wait longer after every failure in a row
+                backoff = min(max(backoff * 2, interval or conversionTime),
+                              self.maxBackoff)
+                self.wait(backoff)
+                nextRead = self.clock()
+                continue
+            backoff = 0
+            if value is not None:
+                self._publish(value)
+            if interval:
+                nextRead = nextRead + interval
+                self.wait(max(0, nextRead - self.clock()))
+
+
+    """
+    Internal function to make a read function that only returns fresh
+    Samples from a ConversionScheduler, and None for repeats.  The scheduler
+    reads the resolution when it is made, so it isn't made until the first
+    read, where a missing sensor is backed off like any other failure.
+    """
+    def _readFresh(self):
+        scheduler = []
+        def read():
+            if not scheduler:
+                scheduler.append(ConversionScheduler(self.source,
+                                                     clock = self.clock,
+                                                     sleep = self.wait))
+            sample = scheduler[0].read()
+            return sample if sample.fresh else None
+        return read
+
+
+    """
+    Internal function to publish a new value and wake anyone waiting for it.
+    """
+    def _publish(self, value):
+        self.latest = (self.latest[0] + 1, value)
+        with self._new:
+            self._new.notify_all()
+
+
+    """
+    A function to get the newest value without its sequence number.  None
+    until the first read has finished.
+    """
+    def value(self):
+        return self.latest[1]
+
+
+    """
+    A function to wait until there is a value newer than sequence, for
+    readers that want every update rather than just the newest.  Returns the
+    (sequence, value) pair, which is still the old one if timeout (in
+    seconds) runs out first.
+    """
+    def waitForNew(self, sequence, timeout = None):
+        with self._new:
+            self._new.wait_for(lambda: self.latest[0] > sequence, timeout)
+        return self.latest
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+"""
+Internal function to get a sensor's conversion time, falling back to the
+longest one if the resolution can't be read.
+"""
+def _conversionTime(sensor):
+    try:
+        return sensor.conversionTime()
+    except OSError:
+        return CONVERSION_TIMES[-1]
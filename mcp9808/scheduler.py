@@ -0,0 +1,145 @@
+"""
+Reading the MCP9808 at the rate it actually makes new temperatures.  The
+sensor converts continuously, taking 30 - 250 ms per conversion depending on
+the resolution, and the temperature register just holds the last result.
+Reading it faster than that returns the same conversion again, and reading
+it on a fixed slower timer misses conversions.
+
+A ConversionScheduler keeps track of when the sensor's conversions finish and
+reads just after each one, marking every Sample as fresh or a repeat:
+
+    from mcp9808.scheduler import ConversionScheduler
+
+    scheduler = ConversionScheduler(sensor)
+    for sample in scheduler:
+        print(sample.temperature)
+"""
+
+import time
+
+from .core import Sample
+
+
+class ConversionScheduler:
+
+
+    """
+    sensor is the MCP9808 to read.  margin is how far (as a fraction of the
+    conversion time) the sensor's clock is allowed to be off from the
+    datasheet's typical conversion time.  Reads are made that long after the
+    expected end of each conversion.  clock and sleep are the time functions
+    to use, and can be swapped out for testing.
+    """
+    def __init__(self, sensor, margin = 0.05, clock = time.monotonic,
+                 sleep = time.sleep):
+        self.sensor = sensor
+        self.margin = margin
+        self.clock = clock
+        self.sleep = sleep
+        self.resync()
+
+
+    """
+    A function to forget everything known about the conversion timing, and
+    read the resolution from the sensor again.  Call this after changing the
+    resolution or waking the sensor from shutdown.
+    """
+    def resync(self):
+        self.conversionTime = self.sensor.conversionTime()
+        # When the last fresh sample was read, and its register value
+        self.lastFresh = None
+        self.lastRaw = None
+        # When the last read was made, fresh or not
+        self.lastRead = None
+        # Best guess at when the conversion in lastRaw finished.  Later
+        # conversions should finish a whole number of conversion times on.
+        self.completion = None
+        # When the next conversion should have finished
+        self.nextDue = self.clock()
+        # Count of reads that turned out to be repeats
+        self.repeats = 0
+
+
+    """
+    A function to get how many seconds until the next conversion should be
+    ready.  0 if it should be ready now.
+    """
+    def timeUntilDue(self):
+        return max(0, self.nextDue - self.clock())
+
+
+    """
+    A function to read the sensor without waiting, whether or not a new
+    conversion is due.  Returns a Sample, with fresh set if it holds a new
+    conversion.
+
+    The schedule follows the sensor's own conversions rather than the times
+    of the reads, which would slip by the guard time every conversion and
+    skip one every so often.  When the value changes the conversion must
+    have finished since the last read, so that is where the estimate of the
+    conversion grid is moved to if it has drifted out.
+    """
+    def readNow(self):
+        raw = self.sensor.readRaw()
+        now = self.clock()
+        period = self.conversionTime
+        guard = period * self.margin
+
+        if self.completion is None:
+            # Nothing known yet, so take it as having just finished
+            fresh = True
+            completion = now
+        else:
+            # The newest conversion that should have finished by now
+            completion = self.completion \
+                + period * int((now - self.completion) / period)
+            if raw != self.lastRaw:
+                # A different value must be a new conversion, finished
+                # since the last read
+                fresh = True
+                if not self.lastRead < completion <= now:
+                    completion = now
+            else:
+                # The same value is new only if the next conversion would
+                # have finished even on a sensor running margin slow.
+                # Reading on time isn't enough, that is just when a slow
+                # sensor's conversion is still in progress.
+                fresh = now >= self.completion + period + 2 * guard
+
+        self.lastRead = now
+        if fresh:
+            self.lastFresh = now
+            self.lastRaw = raw
+            self.completion = completion
+            self.nextDue = completion + period + guard
+        else:
+            # Too early, try again a little later.  If the value then changes
+            # the grid is moved to line up with the sensor again.
+            self.repeats = self.repeats + 1
+            self.nextDue = now + guard
+
+        return Sample(self.sensor._tempFromBytes([raw >> 8, raw & 0xFF]),
+                      raw, now, fresh)
+
+
+    """
+    A function to wait until the next conversion should be ready, then read
+    it.  Returns a Sample, which can still be a repeat if the sensor was
+    slower than expected.
+    """
+    def read(self):
+        wait = self.timeUntilDue()
+        if wait > 0:
+            self.sleep(wait)
+        return self.readNow()
+
+
+    """
+    Iterating over a scheduler gives a never ending series of fresh Samples,
+    one per conversion.
+    """
+    def __iter__(self):
+        while True:
+            sample = self.read()
+            if sample.fresh:
+                yield sample
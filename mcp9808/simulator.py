@@ -0,0 +1,274 @@
+"""
+A simulated MCP9808 for running the driver (and benchmarks of it) without any
+hardware.  SimulatedMCP9808 drops into a FakeTransport in place of a
+FakeDevice, but behaves like the real part: conversions take as long as the
+resolution says, the lock bits lock, and the alert output follows the
+comparator/interrupt rules from the datasheet.
+
+    import mcp9808
+    from mcp9808.simulator import SimulatedMCP9808, sineWave
+
+    device = SimulatedMCP9808(sineWave(25, 5, 60))
+    sensor = mcp9808.MCP9808(0x18, mcp9808.FakeTransport({0x18: device}))
+"""
+
+import math, time
+
+from .core import CONVERSION_TIMES
+from .fake import FakeDevice
+
+# Temperature step in °C for each resolution setting
+RESOLUTION_STEPS = (0.5, 0.25, 0.125, 0.0625)
+
+# Config register bits
+HYST_MASK = 0x0600
+SHDN = 0x0100
+CRIT_LOCK = 0x0080
+WIN_LOCK = 0x0040
+INT_CLEAR = 0x0020
+ALERT_STAT = 0x0010
+ALERT_CNT = 0x0008
+ALERT_SEL = 0x0004
+ALERT_POL = 0x0002
+ALERT_MOD = 0x0001
+
+# Hysteresis in °C for each value of the hysteresis bits
+HYSTERESIS = (0, 1.5, 3, 6)
+
+
+"""
+A waveform that holds the temperature at value.
+"""
+def constant(value):
+    return lambda t: value
+
+
+"""
+A waveform that swings amplitude either side of mean, once every period
+seconds.
+"""
+def sineWave(mean, amplitude, period):
+    return lambda t: mean + amplitude * math.sin(2 * math.pi * t / period)
+
+
+"""
+A waveform that starts at start and changes by rate °C per second.
+"""
+def ramp(start, rate):
+    return lambda t: start + rate * t
+
+
+"""
+Internal function to turn a 0.25°C limit register value into °C.
+"""
+def _limitToCelsius(value):
+    value = (value >> 2) & 0x7FF
+    if value & 0x400:
+        value = value - 0x800
+    return value / 4
+
+
+class SimulatedMCP9808(FakeDevice):
+
+
+    """
+    waveform is either a fixed temperature or a function taking the number of
+    seconds since power on and returning °C.  latency is a delay in seconds
+    added to every transaction, to stand in for bus time.  clock is the time
+    source, time.monotonic unless a test wants to drive time itself.
+    """
+    def __init__(self, waveform = 20.0, latency = 0, clock = time.monotonic):
+        FakeDevice.__init__(self)
+        if not callable(waveform):
+            waveform = constant(waveform)
+        self.waveform = waveform
+        self.latency = latency
+        self.clock = clock
+        self.reset()
+
+
+    """
+    Put the device back to its power-on state, as if the power was cycled.
+    This is the only way to clear the lock bits.
+    """
+    def reset(self):
+        FakeDevice.__init__(self)
+        self.powerOn = self.clock()
+        # When the conversion in progress started
+        self.epoch = self.powerOn
+        # Conversions completed since power on
+        self.conversions = 0
+        # Which limits were crossed at the last conversion
+        self.windowState = 0
+        # Interrupt mode latch, cleared by the interrupt clear bit
+        self.interrupt = False
+        # Alert conditions as seen by the alert output, with hysteresis
+        self.critAlert = False
+        self.upperAlert = False
+        self.lowerAlert = False
+        self.registers[0x05] = 0x0000
+
+
+    """
+    Internal function to bring the temperature register and alert state up to
+    date with the clock.  Only the newest finished conversion is used.
+    """
+    def _update(self):
+        now = self.clock()
+        config = self.registers[0x01]
+        period = CONVERSION_TIMES[self.registers[0x08] & 0x03]
+        if config & SHDN:
+            # No conversions in shutdown, and a fresh one starts on wake up
+            self.epoch = now
+            return
+        done = int((now - self.epoch) / period)
+        if done < 1:
+            return
+        self.epoch = self.epoch + done * period
+        self.conversions = self.conversions + done
+        self._convert(self.waveform(self.epoch - self.powerOn))
+
+
+    """
+    Internal function to finish a conversion of temperature t.
+    """
+    def _convert(self, t):
+        config = self.registers[0x01]
+        step = RESOLUTION_STEPS[self.registers[0x08] & 0x03]
+        # Truncate to the resolution, then to the 13 bit register range
+        t = math.floor(t / step) * step
+        t = min(max(t, -256), 255.9375)
+        value = int(t * 16) & 0x1FFF
+
+        tUpper = _limitToCelsius(self.registers[0x02])
+        tLower = _limitToCelsius(self.registers[0x03])
+        tCrit = _limitToCelsius(self.registers[0x04])
+        hyst = HYSTERESIS[(config & HYST_MASK) >> 9]
+
+        # Flags in the temperature register ignore hysteresis
+        flags = 0
+        if t >= tCrit:
+            flags = flags | 0x8000
+        if t > tUpper:
+            flags = flags | 0x4000
+        if t < tLower:
+            flags = flags | 0x2000
+        self.registers[0x05] = flags | value
+
+        # The alert output only lets go once past the limit by hyst
+        if t >= tCrit:
+            self.critAlert = True
+        elif t < tCrit - hyst:
+            self.critAlert = False
+        if t > tUpper:
+            self.upperAlert = True
+        elif t <= tUpper - hyst:
+            self.upperAlert = False
+        if t < tLower - hyst:
+            self.lowerAlert = True
+        elif t >= tLower:
+            self.lowerAlert = False
+
+        # In interrupt mode any move in or out of the window latches
+        windowState = (self.upperAlert << 1) | self.lowerAlert
+        if windowState != self.windowState and not (config & ALERT_SEL):
+            self.interrupt = True
+        self.windowState = windowState
+
+
+    """
+    True if the alert output is asserted, ignoring polarity.
+    """
+    def alertAsserted(self):
+        self._update()
+        config = self.registers[0x01]
+        if not (config & ALERT_CNT):
+            return False
+        if config & ALERT_SEL:
+            # Only tCrit can raise the alert
+            return self.critAlert
+        if config & ALERT_MOD:
+            # Interrupt mode, but crossing tCrit always acts as a comparator
+            return self.interrupt or self.critAlert
+        return self.critAlert or self.upperAlert or self.lowerAlert
+
+
+    """
+    The logic level on the ALERT pin, 0 or 1, taking the polarity bit into
+    account.  Active low outputs idle high through the pull-up.
+    """
+    def alertPin(self):
+        asserted = self.alertAsserted()
+        if self.registers[0x01] & ALERT_POL:
+            return int(asserted)
+        return int(not asserted)
+
+
+    """
+    Read numBytes bytes from a register.
+    """
+    def read(self, register, numBytes):
+        if self.latency:
+            time.sleep(self.latency)
+        self._update()
+        if register == 0x01:
+            # Alert status is live, interrupt clear always reads 0
+            config = self.registers[0x01] & ~(ALERT_STAT | INT_CLEAR)
+            if self.alertAsserted():
+                config = config | ALERT_STAT
+            self.registers[0x01] = config
+        return FakeDevice.read(self, register, numBytes)
+
+
+    """
+    Write a list of byte values to a register.  Read-only registers and bits,
+    and anything protected by a lock bit, are left alone.
+    """
+    def write(self, register, values):
+        if self.latency:
+            time.sleep(self.latency)
+        self._update()
+        value = 0
+        for byte in values:
+            value = (value << 8) | byte
+        config = self.registers[0x01]
+        locked = config & (CRIT_LOCK | WIN_LOCK)
+
+        if register == 0x01:
+            self._writeConfig(value, config, locked)
+        elif register == 0x02 or register == 0x03:
+            if not (config & WIN_LOCK):
+                self.registers[register] = value & 0x1FFC
+        elif register == 0x04:
+            if not (config & CRIT_LOCK):
+                self.registers[register] = value & 0x1FFC
+        elif register == 0x08:
+            if (value & 0x03) != (self.registers[0x08] & 0x03):
+                # Changing resolution restarts the conversion in progress
+                self.epoch = self.clock()
+            self.registers[0x08] = value & 0x03
+
+
+    """
+    Internal function to apply a write to the config register.
+    """
+    def _writeConfig(self, value, config, locked):
+        new = config & ~ALERT_STAT
+        if not locked:
+            # These bits are frozen by either lock
+            lockable = HYST_MASK | ALERT_CNT | ALERT_POL | ALERT_MOD
+            new = (new & ~lockable) | (value & lockable)
+        if not (config & WIN_LOCK):
+            # Alert select is only frozen by winLock
+            new = (new & ~ALERT_SEL) | (value & ALERT_SEL)
+        # Shutdown can always be cleared, but only set while unlocked
+        if not (value & SHDN):
+            new = new & ~SHDN
+        elif not locked:
+            new = new | SHDN
+        # The lock bits can only be set, a power cycle clears them
+        new = new | (value & (CRIT_LOCK | WIN_LOCK))
+        # Interrupt clear acts once and always reads back as 0
+        if value & INT_CLEAR:
+            self.interrupt = False
+        self.registers[0x01] = new & ~INT_CLEAR
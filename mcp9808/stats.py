@@ -0,0 +1,264 @@
+"""
+Timing and counting bus transactions.  Wrapping a transport in an
+InstrumentedTransport records, for every device and register, how many reads
+and writes there were, how many bytes they moved, how long they took and how
+many failed or were retried.  A transport that isn't wrapped pays nothing.
+
+    from mcp9808.stats import InstrumentedTransport
+
+    transport = InstrumentedTransport(LinuxI2C(1))
+    sensor = mcp9808.MCP9808(0x18, transport)
+    ...
+    print(transport.snapshot())
+
+Callbacks added with addHook() are called after every transaction, e.g. to
+feed a metrics system.
+"""
+
+import time
+
+from .transport import Transport
+
+# Latency histogram buckets are powers of two of microseconds, up to ~16 s
+HISTOGRAM_BUCKETS = 25
+
+
+"""
+The running totals for one register of one device.
+"""
+class RegisterStats:
+
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.bytes = 0
+        self.errors = 0
+        self.retries = 0
+        self.totalTime = 0.0
+        self.minTime = None
+        self.maxTime = 0.0
+        # histogram[i] counts transactions taking under 2**i microseconds
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+
+    """
+    Add one transaction that took seconds.
+    """
+    def add(self, seconds):
+        self.totalTime = self.totalTime + seconds
+        if self.minTime is None or seconds < self.minTime:
+            self.minTime = seconds
+        if seconds > self.maxTime:
+            self.maxTime = seconds
+        bucket = min(int(seconds * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.histogram[bucket] = self.histogram[bucket] + 1
+
+
+    """
+    The totals as a dictionary.  The histogram maps each bucket's upper
+    bound in microseconds to its count, leaving out empty buckets.
+    """
+    def asDict(self):
+        count = self.reads + self.writes
+        return {
+            "reads": self.reads,
+            "writes": self.writes,
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "retries": self.retries,
+            "totalTime": self.totalTime,
+            "meanTime": self.totalTime / count if count else None,
+            "minTime": self.minTime,
+            "maxTime": self.maxTime,
+            "histogram": dict((1 << i, n) for (i, n)
+                              in enumerate(self.histogram) if n),
+        }
+
+
+class InstrumentedTransport(Transport):
+
+
+    """
+    transport is the transport to measure.  clock is the timer used,
+    time.perf_counter by default.  Anything else asked of an
+    InstrumentedTransport is passed through to the transport it wraps.
+    """
+    def __init__(self, transport, clock = time.perf_counter):
+        self.transport = transport
+        self.clock = clock
+        self.hooks = []
+        self.reset()
+
+
+    """
+    A function to zero all of the statistics.
+    """
+    def reset(self):
+        self.registers = {}
+        self.batches = 0
+
+
+    """
+    A function to add a callback, called after every transaction as
+    callback(kind, address, register, numBytes, seconds, error) where kind is
+    "read" or "write" and error is the exception raised, or None.
+    """
+    def addHook(self, callback):
+        self.hooks.append(callback)
+
+
+    """
+    Internal function to get the totals for a register, creating them the
+    first time.
+    """
+    def _stats(self, address, register):
+        key = (address, register)
+        stats = self.registers.get(key)
+        if stats is None:
+            stats = self.registers[key] = RegisterStats()
+        return stats
+
+
+    """
+    Internal function to record one transaction.
+    """
+    def _record(self, kind, address, register, numBytes, seconds, error):
+        stats = self._stats(address, register)
+        if kind == "read":
+            stats.reads = stats.reads + 1
+        else:
+            stats.writes = stats.writes + 1
+        if error is None:
+            stats.bytes = stats.bytes + numBytes
+        else:
+            stats.errors = stats.errors + 1
+        stats.add(seconds)
+        for hook in self.hooks:
+            hook(kind, address, register, numBytes, seconds, error)
+
+
+    def read(self, address, register, numBytes):
+        start = self.clock()
+        try:
+            data = self.transport.read(address, register, numBytes)
+        except OSError as error:
+            self._record("read", address, register, numBytes,
+                         self.clock() - start, error)
+            raise
+        self._record("read", address, register, numBytes,
+                     self.clock() - start, None)
+        return data
+
+
+    def readInto(self, address, register, buffer):
+        start = self.clock()
+        try:
+            self.transport.readInto(address, register, buffer)
+        except OSError as error:
+            self._record("read", address, register, len(buffer),
+                         self.clock() - start, error)
+            raise
+        self._record("read", address, register, len(buffer),
+                     self.clock() - start, None)
+
+
+    """
+    Batched reads are timed as a whole, and the time shared equally between
+    the registers in the batch.  There is no telling which device made a
+    batch fail, so a failed batch counts as an error for every register in
+    it.
+    """
+    def readMany(self, requests):
+        return self._batch(self.transport.readMany, requests)
+
+
+    def readManyInto(self, requests, buffer):
+        self._batch(self.transport.readManyInto, requests, buffer)
+
+
+    """
+    Internal function to time and record a batched read.
+    """
+    def _batch(self, function, requests, *args):
+        self.batches = self.batches + 1
+        start = self.clock()
+        error = None
+        try:
+            return function(requests, *args)
+        except OSError as e:
+            error = e
+            raise
+        finally:
+            share = (self.clock() - start) / max(len(requests), 1)
+            for address, register, numBytes in requests:
+                self._record("read", address, register, numBytes, share,
+                             error)
+
+
+    def write(self, address, register, values):
+        values = list(values)
+        start = self.clock()
+        try:
+            self.transport.write(address, register, values)
+        except OSError as error:
+            self._record("write", address, register, len(values),
+                         self.clock() - start, error)
+            raise
+        self._record("write", address, register, len(values),
+                     self.clock() - start, None)
+
+
+    """
+    The wrapped transport's lock, so that wrapping it doesn't give it a
+    second one.
+    """
+    @property
+    def lock(self):
+        return self.transport.lock
+
+
+    def noteRetry(self, address, register):
+        stats = self._stats(address, register)
+        stats.retries = stats.retries + 1
+        self.transport.noteRetry(address, register)
+
+
+    def recover(self):
+        self.transport.recover()
+
+
+    def close(self):
+        self.transport.close()
+
+
+    def __getattr__(self, name):
+        return getattr(self.transport, name)
+
+
+    """
+    A function to get all of the statistics as a dictionary.  "registers"
+    maps "address:register" (e.g. "0x18:0x05") to that register's totals,
+    "totals" adds up every register and "batches" counts readMany and
+    readManyInto calls.
+    """
+    def snapshot(self):
+        totals = RegisterStats()
+        registers = {}
+        for (address, register), stats in sorted(self.registers.items()):
+            registers[hex(address) + ":" + hex(register)] = stats.asDict()
+            for name in ("reads", "writes", "bytes", "errors", "retries",
+                         "totalTime"):
+                setattr(totals, name, getattr(totals, name)
+                        + getattr(stats, name))
+            if stats.minTime is not None and \
+               (totals.minTime is None or stats.minTime < totals.minTime):
+                totals.minTime = stats.minTime
+            totals.maxTime = max(totals.maxTime, stats.maxTime)
+            totals.histogram = [a + b for (a, b)
+                                in zip(totals.histogram, stats.histogram)]
+        return {
+            "registers": registers,
+            "totals": totals.asDict(),
+            "batches": self.batches,
+        }
@@ -0,0 +1,150 @@
+"""
+Turning the sensor into a change detector.  A WindowTracker sets each
+sensor's alert window to delta either side of the last temperature it
+reported, and when the temperature leaves that window reports the new
+temperature and moves the window to follow it.  In between, nothing needs
+reading at all.
+
+With the ALERT pins wired to a GPIO (the outputs are open drain, so many
+sensors can share one line) the host just waits for the line:
+
+    from mcp9808.tracking import WindowTracker
+    from mcp9808.alert import GPIOLine
+
+    tracker = WindowTracker(bus, delta = 0.5)
+    tracker.start()
+    tracker.run(GPIOLine("/dev/gpiochip0", 17), callback)
+
+Without a GPIO, calling check() now and then does the same job for the cost
+of one sweep of the temperature registers.
+"""
+
+import math
+
+from .bus import BusManager
+from .limits import LIMIT_MIN, LIMIT_MAX, STEPS_PER_DEGREE
+
+
+class WindowTracker:
+
+
+    """
+    source is an MCP9808 or a BusManager.  delta is how far in °C the
+    temperature has to move to be reported.  The limits only have 0.25°C
+    steps, so delta should be at least that.
+    """
+    def __init__(self, source, delta = 0.5):
+        self.source = source
+        self.delta = delta
+        # The temperature each sensor last reported, by address
+        self.reported = {}
+        self._running = False
+
+
+    """
+    Internal function to get the list of sensors being tracked.
+    """
+    def _sensors(self):
+        if isinstance(self.source, BusManager):
+            return self.source.sensors
+        return [self.source]
+
+
+    """
+    Internal function to read a Sample from every sensor, in one sweep if
+    there is a bus.
+    """
+    def _readSamples(self):
+        if isinstance(self.source, BusManager):
+            return self.source.readSamples()
+        return [self.source.readSample()]
+
+
+    """
+    Internal function to move a sensor's window to be centred on
+    temperature.  The limits only have 0.25°C steps, so tUpper is rounded up
+    and tLower down.  Rounding them inwards would let the alert fire while
+    the temperature is still within delta of the reported one, and check()
+    would then leave the window where it is with the alert stuck on.  The
+    limits are kept inside what the sensor accepts.
+    """
+    def _recentre(self, sensor, temperature):
+        # The small allowance stops float error pushing a limit that is
+        # already on a step out to the next one
+        tLower = math.floor((temperature - self.delta) * STEPS_PER_DEGREE
+                            + 1e-9) / STEPS_PER_DEGREE
+        tUpper = math.ceil((temperature + self.delta) * STEPS_PER_DEGREE
+                           - 1e-9) / STEPS_PER_DEGREE
+        tLower = min(max(tLower, LIMIT_MIN), LIMIT_MAX)
+        tUpper = min(max(tUpper, LIMIT_MIN), LIMIT_MAX)
+        sensor.setLimits(tUpper = tUpper, tLower = tLower, holdAlert = False)
+        self.reported[sensor.address] = temperature
+
+
+    """
+    A function to set the sensors up for tracking: comparator mode, alerting
+    on the window, no hysteresis and the alert output on.  tCrit also drives
+    the alert output, so it is set to tCrit (out of the way at 100°C unless
+    given).  Each sensor is read once and its window centred on that
+    temperature.  Returns a list of (sensor, Sample) for the starting
+    temperatures.
+    """
+    def start(self, tCrit = 100):
+        for sensor in self._sensors():
+            sensor.configure(alertMode = 0, alertSelect = 0, hysteresis = 0,
+                             alertControl = 1)
+            sensor.setTCrit(tCrit)
+        changes = []
+        for sensor, sample in zip(self._sensors(), self._readSamples()):
+            if sample is not None:
+                self._recentre(sensor, sample.temperature)
+                changes.append((sensor, sample))
+        return changes
+
+
+    """
+    A function to find the sensors whose temperature has left their window.
+    Reads every sensor's temperature register once, moves the window of any
+    that have changed by more than delta, and returns a list of (sensor,
+    Sample) for them.
+
+    The change is judged against the last reported temperature rather than
+    the register's alert flags, because until the sensor's next conversion
+    the flags are still the ones worked out against the old window.
+    """
+    def check(self):
+        changes = []
+        for sensor, sample in zip(self._sensors(), self._readSamples()):
+            if sample is None:
+                continue
+            reported = self.reported.get(sensor.address)
+            if reported is None or \
+               abs(sample.temperature - reported) > self.delta:
+                self._recentre(sensor, sample.temperature)
+                changes.append((sensor, sample))
+        return changes
+
+
+    """
+    A function to wait on an alert line (a GPIOLine or anything like it) and
+    call callback(sensor, sample) for every change, until stop() is called
+    from another thread.  The line only signals edges, so if several sensors
+    share it one can leave its window while another is still holding the
+    line asserted.  Giving a timeout (in seconds) makes run() sweep the
+    sensors anyway after that long without an edge, to catch these.
+    """
+    def run(self, line, callback, timeout = None):
+        self._running = True
+        while self._running:
+            line.wait(timeout)
+            if not self._running:
+                return
+            for sensor, sample in self.check():
+                callback(sensor, sample)
+
+
+    """
+    A function to make run() return after the current wait.
+    """
+    def stop(self):
+        self._running = False
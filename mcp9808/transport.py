@@ -0,0 +1,101 @@
+"""
+The transport interface.  A transport knows how to move bytes to and from a
+register of a device on a bus, and nothing about what those bytes mean.  The
+MCP9808 class only ever talks to the hardware through these methods.
+"""
+
+from .buslock import BusLock
+
+
+class Transport:
+
+
+    """
+    The BusLock every transaction takes, so that nothing else gets onto the
+    bus half way through one.  Backends share one lock per physical bus (see
+    buslock.busLock); a transport that hasn't set one gets its own.
+    """
+    @property
+    def lock(self):
+        try:
+            return self._lock
+        except AttributeError:
+            self._lock = BusLock()
+            return self._lock
+
+
+    """
+    Read numBytes bytes from a register of the device at address.  Returns a
+    bytes-like object, MSB first.
+    """
+    def read(self, address, register, numBytes):
+        raise NotImplementedError
+
+
+    """
+    Read len(buffer) bytes from a register of the device at address into
+    buffer, a writable bytes-like object such as a bytearray.  Used by the
+    MCP9808 for its hot read paths so that they can reuse one buffer rather
+    than getting a new object back for every read.  Backends that can read
+    straight into a buffer override this, the default copies from read().
+    """
+    def readInto(self, address, register, buffer):
+        buffer[:] = self.read(address, register, len(buffer))
+
+
+    """
+    Read several registers, possibly from different devices, in one go.
+    requests is a list of (address, register, numBytes) and a list of the
+    data read is returned in the same order.  Backends that can batch
+    transactions override this, the default just reads them one by one.
+    """
+    def readMany(self, requests):
+        return [self.read(address, register, numBytes)
+                for (address, register, numBytes) in requests]
+
+
+    """
+    Like readMany, but the data goes back to back into buffer, a writable
+    bytes-like object as long as all of the requests put together.  Meant
+    for reading the same set of registers over and over: backends that can
+    (LinuxI2C) set the transactions up the first time and reuse them for as
+    long as the same requests and buffer are passed in, so a sweep
+    allocates nothing.  The default reads them one by one with readInto.
+    """
+    def readManyInto(self, requests, buffer):
+        view = memoryview(buffer)
+        offset = 0
+        for address, register, numBytes in requests:
+            self.readInto(address, register, view[offset:offset + numBytes])
+            offset = offset + numBytes
+
+
+    """
+    Write the list of byte values to a register of the device at address.
+    """
+    def write(self, address, register, values):
+        raise NotImplementedError
+
+
+    """
+    Called when a transaction to a register is being retried, so that
+    transports which keep statistics can count it.  Does nothing by default.
+    """
+    def noteRetry(self, address, register):
+        pass
+
+
+    """
+    Try to get a misbehaving bus working again, e.g. after a device has been
+    left holding SDA low.  Called by RetryPolicy between retries.  Does
+    nothing by default.
+    """
+    def recover(self):
+        pass
+
+
+    """
+    Release the bus.  Does nothing unless the backend holds something open.
+    """
+    def close(self):
+        pass
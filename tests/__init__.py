@@ -0,0 +1,7 @@
+"""
+Tests for the driver.  They run against simulator.SimulatedMCP9808, so no
+hardware is needed:
+
+    python -m pytest tests
+    python -m unittest discover -s tests -t .
+"""
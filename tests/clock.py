@@ -0,0 +1,37 @@
+"""
+A clock for the simulator that only moves when a test moves it, so that
+conversions finish exactly when the test says.
+"""
+
+from mcp9808 import FakeTransport, MCP9808
+from mcp9808.core import CONVERSION_TIMES
+from mcp9808.simulator import SimulatedMCP9808
+
+
+class FakeClock:
+
+
+    def __init__(self):
+        self.now = 0.0
+
+
+    def __call__(self):
+        return self.now
+
+
+    """
+    Move time on by seconds, or by one conversion at full resolution.
+    """
+    def advance(self, seconds = CONVERSION_TIMES[-1]):
+        self.now = self.now + seconds
+
+
+"""
+A function to make an MCP9808 on a simulated device at 0x18.  Returns
+(sensor, device, clock).  waveform is as for SimulatedMCP9808.
+"""
+def simulatedSensor(waveform = 20.0, **kwargs):
+    clock = FakeClock()
+    device = SimulatedMCP9808(waveform, clock = clock)
+    sensor = MCP9808(0x18, FakeTransport({0x18: device}), **kwargs)
+    return sensor, device, clock
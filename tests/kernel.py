@@ -0,0 +1,141 @@
+"""
+A stand-in for the i2c-dev driver, so that LinuxI2C can be tested without
+/dev/i2c-N.  It takes the place of the os and fcntl modules in
+mcp9808.linux and answers the calls LinuxI2C makes from a dict of
+FakeDevices, unpacking the I2C_RDWR messages just as the kernel would.
+
+    with FakeKernel({0x18: FakeDevice()}) as kernel:
+        transport = LinuxI2C(1)
+"""
+
+import errno, os
+from unittest import mock
+
+from mcp9808 import linux
+
+
+class FakeKernel:
+
+
+    """
+    devices maps addresses to FakeDevices.  functionality is what I2C_FUNCS
+    reports.  Every ioctl is recorded in ioctls as (request, nmsgs), nmsgs
+    being None for anything but I2C_RDWR, and the messages of every I2C_RDWR
+    in messages as a list of (addr, flags, len).
+    """
+    def __init__(self, devices, functionality = linux.I2C_FUNC_I2C):
+        self.devices = devices
+        self.functionality = functionality
+        self.ioctls = []
+        self.messages = []
+        # The address set with I2C_SLAVE and each device's register pointer
+        self.slave = None
+        self.pointers = {}
+        # If set, plain read()s return this many bytes at most
+        self.shortRead = None
+        self._patches = [mock.patch.object(linux, "os", self),
+                         mock.patch.object(linux, "fcntl", self)]
+
+
+    def __enter__(self):
+        for patch in self._patches:
+            patch.start()
+        return self
+
+
+    def __exit__(self, *exc):
+        for patch in self._patches:
+            patch.stop()
+
+
+    """
+    The I2C_RDWR ioctls made, as the number of messages in each.
+    """
+    def batches(self):
+        return [nmsgs for (request, nmsgs) in self.ioctls
+                if request == linux.I2C_RDWR]
+
+
+    def _device(self, address):
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(errno.EREMOTEIO, "Remote I/O error")
+        return device
+
+
+    # fcntl
+
+    def ioctl(self, fd, request, arg):
+        if request == linux.I2C_FUNCS:
+            self.ioctls.append((request, None))
+            arg.value = self.functionality
+        elif request == linux.I2C_SLAVE:
+            self.ioctls.append((request, None))
+            self.slave = arg
+        elif request == linux.I2C_RDWR:
+            self.ioctls.append((request, arg.nmsgs))
+            if arg.nmsgs > linux.I2C_RDWR_IOCTL_MAX_MSGS:
+                raise OSError(errno.EINVAL, "Invalid argument")
+            self.messages.append([(arg.msgs[i].addr, arg.msgs[i].flags,
+                                   arg.msgs[i].len)
+                                  for i in range(arg.nmsgs)])
+            for i in range(arg.nmsgs):
+                msg = arg.msgs[i]
+                device = self._device(msg.addr)
+                if msg.flags & linux.I2C_M_RD:
+                    data = device.read(self.pointers[msg.addr], msg.len)
+                    for n in range(msg.len):
+                        msg.buf[n] = data[n]
+                else:
+                    values = [msg.buf[n] for n in range(msg.len)]
+                    self._written(msg.addr, values)
+        else:
+            raise OSError(errno.ENOTTY, "Inappropriate ioctl for device")
+
+
+    def flock(self, fd, operation):
+        pass
+
+
+    # os
+
+    O_RDWR = os.O_RDWR
+
+
+    def open(self, path, flags, mode = 0o777):
+        return 3
+
+
+    def close(self, fd):
+        pass
+
+
+    def write(self, fd, data):
+        data = bytes(data)
+        self._written(self.slave, list(data))
+        return len(data)
+
+
+    def read(self, fd, numBytes):
+        if self.shortRead is not None:
+            numBytes = min(numBytes, self.shortRead)
+        return self._device(self.slave).read(self.pointers[self.slave],
+                                             numBytes)
+
+
+    def readv(self, fd, buffers):
+        buffer = buffers[0]
+        data = self.read(fd, len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+    """
+    Internal function for a write: the first byte moves the register
+    pointer, anything after it is written to the register.
+    """
+    def _written(self, address, values):
+        device = self._device(address)
+        self.pointers[address] = values[0]
+        if len(values) > 1:
+            device.write(values[0], values[1:])
@@ -0,0 +1,103 @@
+"""
+AsyncMCP9808 on a simulated sensor, with asyncio.sleep moving the fake clock
+on instead of waiting.
+"""
+
+import asyncio, threading, unittest
+from unittest import mock
+
+from mcp9808 import aio
+from mcp9808.aio import AsyncMCP9808
+from mcp9808.core import CONVERSION_TIMES
+from mcp9808.scheduler import ConversionScheduler
+
+from .clock import simulatedSensor
+
+
+class AsyncTest(unittest.TestCase):
+
+
+    def setUp(self):
+        # A degree a second, so every conversion reads differently
+        self.sensor, self.device, self.clock = simulatedSensor(
+            lambda seconds: 20 + seconds, checkID = False)
+        self.sleeps = []
+        realSleep = asyncio.sleep
+        async def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.clock.advance(seconds)
+            await realSleep(0)
+        def scheduler(sensor, margin):
+            return ConversionScheduler(sensor, margin, clock = self.clock)
+        for patch in (mock.patch.object(asyncio, "sleep", sleep),
+                      mock.patch.object(aio, "ConversionScheduler",
+                                        scheduler)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.clock.advance()
+
+
+    """
+    Runs coroutine function(sensor) with an AsyncMCP9808 wrapping the sensor.
+    """
+    def runAsync(self, function):
+        async def main():
+            async with AsyncMCP9808(self.sensor) as sensor:
+                return await function(sensor)
+        return asyncio.run(main())
+
+
+    def testCalls(self):
+        async def calls(sensor):
+            await sensor.configure(alertMode = 1, alertControl = 1)
+            name = await sensor._run(lambda: threading.current_thread().name)
+            return await sensor.getConfig(), await sensor.readTemp(), name
+        config, temperature, thread = self.runAsync(calls)
+        self.assertEqual((config["alertMode"], config["alertControl"]), (1, 1))
+        self.assertEqual(temperature, 20.25)
+        # Off the event loop's thread
+        self.assertTrue(thread.startswith("mcp9808"))
+
+
+    def testAttributes(self):
+        sensor = AsyncMCP9808(self.sensor)
+        self.assertEqual(sensor.address, 0x18)
+        self.assertIs(sensor._read.__self__, self.sensor)
+        sensor.close()
+
+
+    def testReadOnce(self):
+        self.sensor.shutdown(1)
+        temperature = self.runAsync(
+            lambda sensor: sensor.readOnce(margin = 0.1))
+        self.assertAlmostEqual(self.sleeps[0], CONVERSION_TIMES[-1] * 1.1)
+        self.assertGreater(temperature, 20)
+        self.assertTrue(self.sensor.getConfig()["shutdown"])
+
+
+    def testSamples(self):
+        async def take(sensor):
+            samples = []
+            async for sample in sensor.samples():
+                samples.append(sample)
+                if len(samples) == 4:
+                    return samples
+        samples = self.runAsync(take)
+        self.assertTrue(all(sample.fresh for sample in samples))
+        # One conversion apart
+        for before, after in zip(samples, samples[1:]):
+            self.assertAlmostEqual(after.temperature - before.temperature,
+                                   0.25)
+
+
+    def testInterval(self):
+        async def take(sensor):
+            samples = []
+            async for sample in sensor.samples(interval = 0.1):
+                samples.append(sample)
+                if len(samples) == 5:
+                    return samples
+        samples = self.runAsync(take)
+        # Every read is given, fresh or not, on the event loop's own clock
+        self.assertEqual(len(samples), 5)
+        self.assertEqual(len(self.sleeps), 5)
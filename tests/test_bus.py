@@ -0,0 +1,116 @@
+"""
+BusManager sweeps on the fake bus.
+"""
+
+import unittest
+
+from mcp9808 import FakeDevice, FakeTransport
+from mcp9808.bus import BusManager, scan
+from mcp9808.retry import RetryPolicy
+
+
+"""
+A FakeTransport that counts batches and recoveries.
+"""
+class CountingTransport(FakeTransport):
+
+
+    def __init__(self, devices = None):
+        FakeTransport.__init__(self, devices)
+        self.batches = 0
+        self.recoveries = 0
+
+
+    def readMany(self, requests):
+        self.batches = self.batches + 1
+        return FakeTransport.readMany(self, requests)
+
+
+    def recover(self):
+        self.recoveries = self.recoveries + 1
+
+
+class MissingSensorTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.transport = CountingTransport(
+            {address: FakeDevice() for address in (0x18, 0x19, 0x1A)})
+        policy = RetryPolicy(sleep = lambda seconds: None)
+        self.bus = BusManager(self.transport, policy, reprobe = 60)
+        for address in (0x18, 0x19, 0x1A):
+            self.bus.addSensor(address)
+        self.gone = self.transport.devices.pop(0x19)
+
+
+    def testHealthySensorsStayBatched(self):
+        self.assertEqual(self.bus.readTemps(), [20, None, 20])
+        self.assertEqual(list(self.bus.missing), [self.bus.sensors[1]])
+        batches = self.transport.batches
+        transactions = self.transport.transactions
+        recoveries = self.transport.recoveries
+        for n in range(10):
+            self.assertEqual(self.bus.readTemps(), [20, None, 20])
+        # One batch of the two that are there per sweep, and no recoveries
+        self.assertEqual(self.transport.batches, batches + 10)
+        self.assertEqual(self.transport.transactions, transactions + 20)
+        self.assertEqual(self.transport.recoveries, recoveries)
+
+
+    def testReprobe(self):
+        self.bus.readTemps()
+        self.transport.devices[0x19] = self.gone
+        # Not due yet
+        self.assertEqual(self.bus.readTemps(), [20, None, 20])
+        self.bus.missing[self.bus.sensors[1]] = 0
+        self.assertEqual(self.bus.readTemps(), [20, 20, 20])
+        self.assertEqual(self.bus.missing, {})
+
+
+    def testReprobeStillMissing(self):
+        self.bus.readTemps()
+        self.bus.missing[self.bus.sensors[1]] = 0
+        recoveries = self.transport.recoveries
+        self.assertEqual(self.bus.readTemps(), [20, None, 20])
+        self.assertEqual(self.transport.recoveries, recoveries)
+        self.assertGreater(self.bus.missing[self.bus.sensors[1]], 0)
+
+
+    def testRemoveSensor(self):
+        self.bus.readTemps()
+        self.bus.removeSensor(self.bus.sensors[1])
+        self.assertEqual(self.bus.missing, {})
+        self.assertEqual(self.bus.readTemps(), [20, 20])
+
+
+class ScanTest(unittest.TestCase):
+
+
+    def setUp(self):
+        other = FakeDevice()
+        other.registers[0x06] = 0x1234
+        self.transport = CountingTransport({0x18: FakeDevice(),
+                                            0x1A: FakeDevice(), 0x1B: other})
+
+
+    def testOneBatch(self):
+        # Everything answers, so the IDs are read in one go
+        self.assertEqual(scan(self.transport, [0x18, 0x1A, 0x1B]),
+                         [0x18, 0x1A])
+        self.assertEqual(self.transport.batches, 1)
+
+
+    def testFallback(self):
+        # 0x19 doesn't answer, so every address is asked on its own
+        self.assertEqual(scan(self.transport), [0x18, 0x1A])
+        self.assertEqual(self.transport.batches, 9)
+
+
+    def testDiscover(self):
+        bus = BusManager(self.transport)
+        bus.addSensor(0x18, checkID = False)
+        added = bus.discover()
+        self.assertEqual([sensor.address for sensor in added], [0x1A])
+        self.assertEqual([sensor.address for sensor in bus.sensors],
+                         [0x18, 0x1A])
+        self.assertEqual(bus.discover(), [])
@@ -0,0 +1,128 @@
+"""
+BusLock ordering, timeouts, reentrancy and flock().
+"""
+
+import errno, fcntl, os, tempfile, threading, time, unittest
+
+from mcp9808.buslock import BusLock
+
+
+"""
+Waits until the lock has n threads queued for it.
+"""
+def waitForWaiters(lock, n):
+    deadline = time.monotonic() + 5
+    while len(lock._waiters) < n:
+        if time.monotonic() > deadline:
+            raise AssertionError("Threads never queued for the lock")
+        time.sleep(0.001)
+
+
+class ThreadTest(unittest.TestCase):
+
+
+    def testFirstComeFirstServed(self):
+        lock = BusLock()
+        order = []
+        def take(name):
+            with lock:
+                order.append(name)
+        lock.acquire()
+        threads = []
+        for name in "abcd":
+            thread = threading.Thread(target = take, args = (name,))
+            thread.start()
+            threads.append(thread)
+            waitForWaiters(lock, len(threads))
+        lock.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, list("abcd"))
+        self.assertIsNone(lock._owner)
+
+
+    def testTimeout(self):
+        lock = BusLock(timeout = 0.02)
+        held = threading.Event()
+        done = threading.Event()
+        def hold():
+            with lock:
+                held.set()
+                done.wait(5)
+        thread = threading.Thread(target = hold)
+        thread.start()
+        held.wait(5)
+        try:
+            with self.assertRaises(TimeoutError) as caught:
+                lock.acquire()
+            self.assertEqual(caught.exception.errno, errno.ETIMEDOUT)
+            self.assertEqual(lock._waiters, [])
+        finally:
+            done.set()
+            thread.join()
+        # Free again once the holder is done
+        self.assertTrue(lock.acquire(timeout = 0))
+        lock.release()
+
+
+    def testReentrant(self):
+        lock = BusLock()
+        with lock:
+            with lock:
+                self.assertEqual(lock._count, 2)
+            self.assertEqual(lock._owner, threading.get_ident())
+        self.assertIsNone(lock._owner)
+        with self.assertRaises(RuntimeError):
+            lock.release()
+
+
+class FlockTest(unittest.TestCase):
+
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.lock = BusLock(self.path, timeout = 0.02)
+        self.other = os.open(self.path, os.O_RDONLY)
+
+
+    def tearDown(self):
+        self.lock.close()
+        os.close(self.other)
+        os.unlink(self.path)
+
+
+    """
+    Whether another open file (as another process would have) can flock().
+    """
+    def otherCanLock(self):
+        try:
+            fcntl.flock(self.other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        fcntl.flock(self.other, fcntl.LOCK_UN)
+        return True
+
+
+    def testHeldWhileLocked(self):
+        with self.lock:
+            self.assertFalse(self.otherCanLock())
+            # Not taken again when reentered
+            with self.lock:
+                self.assertEqual(self.lock.fileLocks, 1)
+            self.assertFalse(self.otherCanLock())
+        self.assertTrue(self.otherCanLock())
+        with self.lock:
+            self.assertEqual(self.lock.fileLocks, 2)
+
+
+    def testOtherProcessHolding(self):
+        fcntl.flock(self.other, fcntl.LOCK_EX)
+        with self.assertRaises(TimeoutError):
+            self.lock.acquire()
+        # Nothing left half-held in this process
+        self.assertIsNone(self.lock._owner)
+        self.assertEqual(self.lock.fileLocks, 0)
+        fcntl.flock(self.other, fcntl.LOCK_UN)
+        with self.lock:
+            self.assertEqual(self.lock.fileLocks, 1)
@@ -0,0 +1,96 @@
+"""
+CaptureBuffer storage and bus capture.
+"""
+
+import unittest
+
+from mcp9808 import FakeDevice, FakeTransport
+from mcp9808.bus import BusManager
+from mcp9808.capture import CaptureBuffer
+from mcp9808.linux import LinuxI2C
+
+from .kernel import FakeKernel
+
+
+class RingTest(unittest.TestCase):
+
+
+    def testWraparound(self):
+        buffer = CaptureBuffer(4)
+        for i in range(6):
+            buffer.append(0x0140 + i, float(i), 0x18)
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.dropped, 2)
+        words, timestamps, addresses = buffer.snapshot()
+        self.assertEqual(list(words), [0x0142, 0x0143, 0x0144, 0x0145])
+        self.assertEqual(list(timestamps), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(list(addresses), [0x18] * 4)
+        # Oldest first, split where the ring wraps
+        segments = buffer.segments()
+        self.assertEqual([len(w) for (w, t, a) in segments], [2, 2])
+        self.assertEqual(list(segments[0][0]), [0x0142, 0x0143])
+
+
+    def testNotWrapped(self):
+        buffer = CaptureBuffer(4)
+        buffer.append(0x0140, 1.0)
+        buffer.append(0x1FFF, 2.0)
+        self.assertEqual(len(buffer.segments()), 1)
+        self.assertEqual(list(buffer.temperatures()), [20, -0.0625])
+
+
+    def testClear(self):
+        buffer = CaptureBuffer(2)
+        for i in range(3):
+            buffer.append(i, 0.0)
+        buffer.clear()
+        self.assertEqual((len(buffer), buffer.dropped), (0, 0))
+        self.assertEqual(buffer.segments(), [])
+
+
+class CaptureBusTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.devices = {0x18: FakeDevice(), 0x19: FakeDevice()}
+        self.devices[0x19].registers[0x05] = 0x0190
+
+
+    def testCaptureBus(self):
+        bus = BusManager(FakeTransport(self.devices))
+        bus.addSensor(0x18)
+        bus.addSensor(0x19)
+        buffer = CaptureBuffer(8)
+        buffer.captureBus(bus)
+        words, timestamps, addresses = buffer.snapshot()
+        self.assertEqual(list(words), [0x0140, 0x0190])
+        self.assertEqual(list(addresses), [0x18, 0x19])
+        self.assertEqual(timestamps[0], timestamps[1])
+
+
+    def testMissingSensorSkipped(self):
+        bus = BusManager(FakeTransport(self.devices))
+        bus.addSensor(0x18)
+        bus.addSensor(0x19)
+        del self.devices[0x18]
+        buffer = CaptureBuffer(8)
+        buffer.captureBus(bus)
+        buffer.captureBus(bus)
+        self.assertEqual(list(buffer.snapshot()[2]), [0x19, 0x19])
+
+
+    def testLinuxSweepSetUpOnce(self):
+        with FakeKernel(self.devices) as kernel:
+            transport = LinuxI2C(1)
+            bus = BusManager(transport)
+            bus.addSensor(0x18)
+            bus.addSensor(0x19)
+            del kernel.ioctls[:]
+            buffer = CaptureBuffer(8)
+            buffer.captureBus(bus)
+            ioctls = transport._manyIoctls
+            buffer.captureBus(bus)
+            buffer.captureBus(bus)
+            self.assertIs(transport._manyIoctls, ioctls)
+            self.assertEqual(kernel.batches(), [4, 4, 4])
+            self.assertEqual(list(buffer.snapshot()[0]), [0x0140, 0x0190] * 3)
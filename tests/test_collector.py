@@ -0,0 +1,87 @@
+"""
+MultiBusCollector over several fake buses.
+"""
+
+import threading, unittest
+
+from mcp9808 import FakeDevice, FakeTransport
+from mcp9808.bus import BusManager
+from mcp9808.collector import MultiBusCollector
+
+
+"""
+A BusManager on a fake bus of its own, with a sensor at each address.
+"""
+def fakeBus(addresses = (0x18, 0x19)):
+    bus = BusManager(FakeTransport({address: FakeDevice()
+                                    for address in addresses}))
+    for address in addresses:
+        bus.addSensor(address)
+    return bus
+
+
+class CollectorTest(unittest.TestCase):
+
+
+    def testMergesBuses(self):
+        collector = MultiBusCollector([fakeBus(), fakeBus((0x1A,))],
+                                      interval = 0.001)
+        seen = set()
+        with collector:
+            for reading in collector:
+                self.assertEqual(reading.sample.temperature, 20)
+                seen.add((reading.bus, reading.address))
+                if len(seen) == 3:
+                    break
+        self.assertEqual(seen, {(0, 0x18), (0, 0x19), (1, 0x1A)})
+
+
+    def testNotStarted(self):
+        # Iterating a collector that isn't running mustn't wait for ever
+        collector = MultiBusCollector([fakeBus()])
+        self.assertEqual(list(collector), [])
+
+
+    def testEndsAfterStop(self):
+        collector = MultiBusCollector([fakeBus()], interval = 0.001,
+                                      maxQueue = 4)
+        collector.start()
+        self.assertIsNotNone(collector.get(timeout = 1))
+        collector.stop()
+        # Whatever was queued is still there, then the iteration ends
+        self.assertLessEqual(len(list(collector)), 4)
+
+
+    def testDroppedCountedFromEveryBus(self):
+        buses = [fakeBus() for n in range(4)]
+        collector = MultiBusCollector(buses, interval = 0, maxQueue = 1,
+                                      block = False)
+        put = collector._put
+        calls = [0]
+        callsLock = threading.Lock()
+        def counted(reading):
+            with callsLock:
+                calls[0] = calls[0] + 1
+            put(reading)
+        collector._put = counted
+        collector.start()
+        threading.Event().wait(0.2)
+        collector.stop()
+        queued = collector.queue.qsize()
+        self.assertGreater(collector.dropped, 0)
+        self.assertEqual(collector.dropped + queued, calls[0])
+
+
+    def testErrorsRecorded(self):
+        bus = fakeBus()
+        bus.transport.devices = {}
+        # The conversion time can't be read, which is noted but doesn't
+        # stop the bus being swept
+        collector = MultiBusCollector([bus])
+        collector.start()
+        threading.Event().wait(0.05)
+        self.assertTrue(collector.running())
+        collector.stop()
+        self.assertEqual(collector.errorCounts, {0: 1})
+        self.assertIsInstance(collector.errors[0], OSError)
+        self.assertTrue(collector.queue.empty())
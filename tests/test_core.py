@@ -0,0 +1,269 @@
+"""
+MCP9808 against the simulator: decoding, limits and the config shadow.
+"""
+
+import unittest
+
+from .clock import simulatedSensor
+
+
+class TemperatureTest(unittest.TestCase):
+
+
+    def readAt(self, temperature):
+        sensor, device, clock = simulatedSensor(temperature)
+        clock.advance()
+        return sensor.readSample()
+
+
+    def testPositive(self):
+        sample = self.readAt(25.0625)
+        self.assertEqual(sample.temperature, 25.0625)
+        self.assertEqual(sample.raw & 0x1FFF, 0x0191)
+
+
+    def testNegative(self):
+        for temperature in (-0.0625, -0.5, -10.25, -40, -255.9375):
+            self.assertEqual(self.readAt(temperature).temperature,
+                             temperature)
+
+
+    def testSmallestNegative(self):
+        # -1/16°C is every bit of the 13 bit value set
+        sample = self.readAt(-0.0625)
+        self.assertEqual(sample.raw & 0x1FFF, 0x1FFF)
+
+
+    def testAlertBitsDoNotChangeSign(self):
+        sensor, device, clock = simulatedSensor(-5)
+        sensor.setLimits(tUpper = 10, tLower = 0, tCrit = 20)
+        clock.advance()
+        sample = sensor.readSample()
+        self.assertEqual(sample.temperature, -5)
+        self.assertEqual(sample.alertBits, [0, 0, 1])
+
+        sensor, device, clock = simulatedSensor(30)
+        sensor.setLimits(tUpper = 10, tLower = 0, tCrit = 20)
+        clock.advance()
+        sample = sensor.readSample()
+        self.assertEqual(sample.temperature, 30)
+        self.assertEqual(sample.alertBits, [1, 1, 0])
+
+
+    def testNoReadingBeforeFirstConversion(self):
+        sensor, device, clock = simulatedSensor(25)
+        self.assertEqual(sensor.readTemp(), 0)
+        clock.advance()
+        self.assertEqual(sensor.readTemp(), 25)
+
+
+class LimitTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.sensor, self.device, self.clock = simulatedSensor()
+
+
+    def testRoundTrip(self):
+        for limit in (-20, -19.75, -12.25, -0.25, 0, 0.25, 25.5, 99.75, 100):
+            self.sensor.setTUpper(limit)
+            self.sensor.setTLower(limit)
+            self.sensor.setTCrit(limit)
+            self.assertEqual(self.sensor._readTUpper(), limit)
+            self.assertEqual(self.sensor.readTLower(), limit)
+            self.assertEqual(self.sensor.readTCrit(), limit)
+
+
+    def testRoundsTowardsZero(self):
+        self.sensor.setTLower(-12.3)
+        self.assertEqual(self.sensor.readTLower(), -12.25)
+        self.sensor.setTLower(12.3)
+        self.assertEqual(self.sensor.readTLower(), 12.25)
+
+
+    def testOutOfRangeIsNotWritten(self):
+        self.sensor.setLimits(tUpper = 30, tLower = -10, tCrit = 50)
+        self.sensor.setLimits(tUpper = 35, tLower = -21)
+        self.assertEqual(self.sensor._readTUpper(), 30)
+        self.assertEqual(self.sensor.readTLower(), -10)
+
+
+    def testDeviceSeesNegativeLimit(self):
+        # -2 is above tLower = -2.5, so no lower alert
+        self.sensor.setLimits(tUpper = 10, tLower = -2.5, tCrit = 20)
+        self.device.waveform = lambda t: -2
+        self.clock.advance()
+        self.assertEqual(self.sensor.readSample().lowerAlert, 0)
+        self.device.waveform = lambda t: -3
+        self.clock.advance()
+        self.assertEqual(self.sensor.readSample().lowerAlert, 1)
+
+
+class ConfigShadowTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.sensor, self.device, self.clock = simulatedSensor()
+
+
+    """
+    Check the shadow copy holds what the sensor really has.
+    """
+    def assertShadowMatches(self):
+        cached = self.sensor.getConfig()
+        self.sensor.invalidateConfig()
+        self.assertEqual(cached, self.sensor.getConfig())
+        return cached
+
+
+    def testUnlocked(self):
+        self.sensor.configure(hysteresis = 2, alertControl = 1,
+                              alertPolarity = 1, alertMode = 1)
+        config = self.assertShadowMatches()
+        self.assertEqual(config["hysteresis"], 2)
+        self.assertEqual(config["alertPolarity"], 1)
+
+
+    def testNoBusTrafficWhenCached(self):
+        self.sensor.getConfig()
+        transactions = self.sensor.transport.transactions
+        self.sensor.getConfig()
+        self.assertEqual(self.sensor.transport.transactions, transactions)
+
+
+    def testWinLockFreezesAlertBits(self):
+        self.sensor.configure(alertControl = 1, hysteresis = 1)
+        self.sensor.winLock(1)
+        self.sensor.configure(alertControl = 0, alertPolarity = 1,
+                              alertSelect = 1, alertMode = 1, hysteresis = 3)
+        config = self.assertShadowMatches()
+        self.assertEqual(config["winLock"], 1)
+        self.assertEqual(config["alertControl"], 1)
+        self.assertEqual(config["alertPolarity"], 0)
+        self.assertEqual(config["alertSelect"], 0)
+        self.assertEqual(config["alertMode"], 0)
+        self.assertEqual(config["hysteresis"], 1)
+
+
+    def testCritLockFreezesAlertBits(self):
+        self.sensor.configure(alertControl = 1)
+        self.sensor.critLock(1)
+        self.sensor.alertControl(0)
+        self.sensor.hysteresis(2)
+        config = self.assertShadowMatches()
+        self.assertEqual(config["critLock"], 1)
+        self.assertEqual(config["alertControl"], 1)
+        self.assertEqual(config["hysteresis"], 0)
+
+
+    def testAlertSelectUnderCritLock(self):
+        # critLock alone doesn't freeze alert select, winLock does
+        self.sensor.critLock(1)
+        self.sensor.alertSelect(1)
+        config = self.assertShadowMatches()
+        self.assertEqual(config["alertSelect"], 1)
+        self.sensor.alertPolarity(1)
+        self.assertEqual(self.assertShadowMatches()["alertSelect"], 1)
+
+        self.sensor.winLock(1)
+        self.sensor.alertSelect(0)
+        self.assertEqual(self.assertShadowMatches()["alertSelect"], 1)
+
+
+    def testLocksOnlyClearOnPowerCycle(self):
+        self.sensor.configure(critLock = 1, winLock = 1)
+        self.sensor.critLock(0)
+        self.sensor.winLock(0)
+        config = self.assertShadowMatches()
+        self.assertEqual((config["critLock"], config["winLock"]), (1, 1))
+
+        self.device.reset()
+        self.sensor.invalidateConfig()
+        config = self.sensor.getConfig()
+        self.assertEqual((config["critLock"], config["winLock"]), (0, 0))
+
+
+    def testShutdownUnderLock(self):
+        # Shutdown can't be set while locked...
+        self.sensor.winLock(1)
+        self.sensor.shutdown(1)
+        self.assertEqual(self.assertShadowMatches()["shutdown"], 0)
+
+        # ...but can be cleared
+        self.device.reset()
+        self.sensor.invalidateConfig()
+        self.sensor.shutdown(1)
+        self.sensor.critLock(1)
+        self.sensor.shutdown(0)
+        self.assertEqual(self.assertShadowMatches()["shutdown"], 0)
+
+
+    def testLocksProtectLimits(self):
+        self.sensor.setLimits(tUpper = 30, tLower = 10, tCrit = 50)
+        self.sensor.winLock(1)
+        self.sensor.setLimits(tUpper = 35, tLower = 5, tCrit = 55)
+        self.assertEqual(self.sensor._readTUpper(), 30)
+        self.assertEqual(self.sensor.readTLower(), 10)
+        self.assertEqual(self.sensor.readTCrit(), 55)
+
+        self.sensor.critLock(1)
+        self.sensor.setTCrit(60)
+        self.assertEqual(self.sensor.readTCrit(), 55)
+
+
+    def testFailedWriteDropsShadow(self):
+        self.sensor.getConfig()
+        devices = self.sensor.transport.devices
+        self.sensor.transport.devices = {}
+        with self.assertRaises(OSError):
+            self.sensor.alertControl(1)
+        self.sensor.transport.devices = devices
+        self.assertIsNone(self.sensor._configShadow)
+
+
+class InterruptTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.sensor, self.device, self.clock = simulatedSensor(20)
+        self.sensor.setLimits(tUpper = 25, tLower = 0, tCrit = 100)
+        self.sensor.configure(alertMode = 1, alertControl = 1)
+        self.clock.advance()
+
+
+    def testIntClearSelfClears(self):
+        self.device.waveform = lambda t: 30
+        self.clock.advance()
+        self.assertEqual(self.sensor.alertStatus(), 1)
+
+        self.sensor.intClear(1)
+        data = self.sensor._getConfigReg(fresh = True)
+        self.assertEqual(data[1] & 0b00100000, 0)
+        self.assertEqual(self.sensor._configShadow[1] & 0b00100000, 0)
+        self.assertEqual(self.sensor.alertStatus(), 0)
+
+        # Still outside the window, so nothing new to latch
+        self.clock.advance()
+        self.assertEqual(self.sensor.alertStatus(), 0)
+
+
+    def testIntClearDoesNotStick(self):
+        # A set intClear bit left in the shadow would clear every interrupt
+        # on the next unrelated config write
+        self.device.waveform = lambda t: 30
+        self.clock.advance()
+        self.sensor.intClear(1)
+        self.device.waveform = lambda t: 20
+        self.clock.advance()
+        self.assertEqual(self.sensor.alertStatus(), 1)
+        self.sensor.hysteresis(1)
+        self.assertEqual(self.sensor.alertStatus(), 1)
+
+
+    def testIntClearWorksUnderLock(self):
+        self.sensor.winLock(1)
+        self.device.waveform = lambda t: 30
+        self.clock.advance()
+        self.assertEqual(self.sensor.alertStatus(), 1)
+        self.sensor.intClear(1)
+        self.assertEqual(self.sensor.alertStatus(), 0)
@@ -0,0 +1,90 @@
+"""
+Batch decoding, with and without NumPy.
+"""
+
+import array, unittest
+from unittest import mock
+
+from mcp9808 import FakeDevice, FakeTransport, MCP9808, decode, limits
+
+# Every possible register word
+WORDS = array.array("H", range(0x10000))
+
+
+"""
+A function to call a decode function with NumPy hidden, as if it weren't
+installed.
+"""
+def withoutNumpy(function, *args):
+    with mock.patch.object(decode, "numpy", None):
+        return function(*args)
+
+
+class ArrayTest(unittest.TestCase):
+
+
+    def testWordsFromBytes(self):
+        words = withoutNumpy(decode.wordsFromBytes, b"\x01\x40\xe0\x10")
+        self.assertEqual(list(words), [0x0140, 0xE010])
+
+
+    def testTemps(self):
+        temperatures = withoutNumpy(decode.decodeTemps,
+                                    [0x0140, 0x1FF0, 0xC190])
+        self.assertEqual(temperatures.typecode, "f")
+        self.assertEqual(list(temperatures), [20, -1, 25])
+
+
+    def testAgreesWithSensor(self):
+        # Batch decoding gives what reading the sensor would
+        device = FakeDevice()
+        sensor = MCP9808(0x18, FakeTransport({0x18: device}), checkID = False)
+        words = [0x0000, 0x0001, 0x0FFF, 0x1000, 0x1FFF, 0xFFFF]
+        temperatures = withoutNumpy(decode.decodeTemps, words)
+        for word, temperature in zip(words, temperatures):
+            device.registers[0x05] = word
+            self.assertEqual(sensor.readTemp(), temperature)
+
+
+    def testAlertFlags(self):
+        flags = withoutNumpy(decode.decodeAlertFlags, [0x0140, 0xA140])
+        self.assertEqual(list(flags),
+                         [0, decode.CRIT_FLAG | decode.LOWER_FLAG])
+
+
+    def testLimits(self):
+        words = limits.encodeLimits([-20, 0.25, 85])
+        self.assertEqual(list(withoutNumpy(decode.decodeLimits, words)),
+                         [-20, 0.25, 85])
+
+
+@unittest.skipIf(decode.numpy is None, "NumPy isn't installed")
+class NumpyTest(unittest.TestCase):
+
+
+    """
+    Checks that function gives the same values, of the same size, with and
+    without NumPy.
+    """
+    def assertParity(self, function, *args):
+        vectorised = function(*args)
+        plain = withoutNumpy(function, *args)
+        self.assertIsInstance(vectorised, decode.numpy.ndarray)
+        self.assertEqual(vectorised.dtype.itemsize, plain.itemsize)
+        self.assertEqual(vectorised.tolist(), plain.tolist())
+
+
+    def testWordsFromBytes(self):
+        self.assertParity(decode.wordsFromBytes, WORDS.tobytes())
+
+
+    def testTemps(self):
+        self.assertParity(decode.decodeTemps, WORDS)
+
+
+    def testAlertFlags(self):
+        self.assertParity(decode.decodeAlertFlags, WORDS)
+
+
+    def testLimits(self):
+        self.assertParity(decode.decodeLimits, WORDS)
@@ -0,0 +1,201 @@
+"""
+LinuxI2C against a fake i2c-dev driver.
+"""
+
+import unittest
+
+from mcp9808 import FakeDevice
+from mcp9808.bus import BusManager
+from mcp9808.linux import LinuxI2C, I2C_M_RD, I2C_RDWR_IOCTL_MAX_MSGS, \
+    I2C_SLAVE
+
+from .kernel import FakeKernel
+
+
+"""
+A FakeDevice reading temperature °C.
+"""
+def device(temperature):
+    device = FakeDevice()
+    device.registers[0x05] = int(temperature * 16)
+    return device
+
+
+class CombinedReadTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.kernel = FakeKernel({0x18: device(20)})
+        self.kernel.__enter__()
+        self.addCleanup(self.kernel.__exit__)
+        self.transport = LinuxI2C(1)
+
+
+    def slaves(self):
+        return [request for (request, nmsgs) in self.kernel.ioctls
+                if request == I2C_SLAVE]
+
+
+    def testRead(self):
+        self.assertTrue(self.transport.combined)
+        self.assertEqual(self.transport.read(0x18, 0x05, 2), b"\x01\x40")
+        # A pointer write and a data read in one ioctl, with no I2C_SLAVE
+        self.assertEqual(self.kernel.messages,
+                         [[(0x18, 0, 1), (0x18, I2C_M_RD, 2)]])
+        self.assertEqual(self.kernel.pointers, {0x18: 0x05})
+        self.assertEqual(self.slaves(), [])
+
+
+    def testReadInto(self):
+        buffer = bytearray(2)
+        self.transport.readInto(0x18, 0x05, buffer)
+        self.assertEqual(buffer, b"\x01\x40")
+        self.assertEqual(self.kernel.batches(), [2])
+
+
+    def testLongRead(self):
+        buffer = bytearray(40)
+        self.transport.readInto(0x18, 0x05, buffer)
+        self.assertEqual(self.kernel.messages,
+                         [[(0x18, 0, 1), (0x18, I2C_M_RD, 40)]])
+        self.assertEqual(buffer[:2], b"\x01\x40")
+
+
+    def testMissingDevice(self):
+        with self.assertRaises(OSError):
+            self.transport.read(0x19, 0x05, 2)
+
+
+    def testNotSupported(self):
+        # Without plain I2C support the adapter gets write() then read()
+        self.kernel.functionality = 0
+        transport = LinuxI2C(1)
+        self.assertFalse(transport.combined)
+        self.assertEqual(transport.read(0x18, 0x05, 2), b"\x01\x40")
+        self.assertEqual(transport.read(0x18, 0x05, 2), b"\x01\x40")
+        self.assertEqual(self.kernel.batches(), [])
+        # Pointed at the device once, not for every read
+        self.assertEqual(self.slaves(), [I2C_SLAVE])
+
+
+class ReadManyTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.kernel = FakeKernel({0x18: device(20), 0x19: device(21.5)})
+        self.kernel.__enter__()
+        self.addCleanup(self.kernel.__exit__)
+        self.transport = LinuxI2C(1)
+
+
+    def testOneIoctl(self):
+        data = self.transport.readMany([(0x18, 0x05, 2), (0x19, 0x05, 2)])
+        self.assertEqual(data, [b"\x01\x40", b"\x01\x58"])
+        self.assertEqual(self.kernel.messages,
+                         [[(0x18, 0, 1), (0x18, I2C_M_RD, 2),
+                           (0x19, 0, 1), (0x19, I2C_M_RD, 2)]])
+
+
+    def testBatches(self):
+        # 21 registers fit in an ioctl
+        requests = [(0x18, 0x05, 2), (0x19, 0x05, 2)] * 22
+        data = self.transport.readMany(requests)
+        self.assertEqual(data, [b"\x01\x40", b"\x01\x58"] * 22)
+        self.assertEqual(self.kernel.batches(),
+                         [I2C_RDWR_IOCTL_MAX_MSGS, I2C_RDWR_IOCTL_MAX_MSGS, 4])
+
+
+    def testMissingDevice(self):
+        with self.assertRaises(OSError):
+            self.transport.readMany([(0x18, 0x05, 2), (0x1A, 0x05, 2)])
+
+
+    def testNotCombined(self):
+        transport = LinuxI2C(1, combined = False)
+        data = transport.readMany([(0x18, 0x05, 2), (0x19, 0x05, 2)])
+        self.assertEqual(data, [b"\x01\x40", b"\x01\x58"])
+        self.assertEqual(self.kernel.batches(), [])
+
+
+    def testBusManager(self):
+        bus = BusManager(self.transport)
+        bus.addSensor(0x18, checkID = False)
+        bus.addSensor(0x19, checkID = False)
+        self.assertEqual(bus.readTemps(), [20, 21.5])
+        self.assertEqual(self.kernel.batches(), [4])
+
+
+class ReadManyIntoTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.kernel = FakeKernel({0x18: device(20), 0x19: device(21.5)})
+        self.kernel.__enter__()
+        self.addCleanup(self.kernel.__exit__)
+        self.transport = LinuxI2C(1)
+        self.requests = [(0x18, 0x05, 2), (0x19, 0x05, 2)]
+
+
+    def testReadsIntoBuffer(self):
+        buffer = bytearray(4)
+        self.transport.readManyInto(self.requests, buffer)
+        self.assertEqual(buffer, b"\x01\x40\x01\x58")
+        self.assertEqual(self.kernel.batches(), [4])
+
+
+    def testSetUpOnce(self):
+        buffer = bytearray(4)
+        self.transport.readManyInto(self.requests, buffer)
+        ioctls = self.transport._manyIoctls
+        self.kernel.devices[0x18].registers[0x05] = 0x0190
+        self.transport.readManyInto(self.requests, buffer)
+        self.assertIs(self.transport._manyIoctls, ioctls)
+        self.assertEqual(buffer[:2], b"\x01\x90")
+
+        # A different buffer or set of requests is set up again
+        other = bytearray(2)
+        self.transport.readManyInto(self.requests[1:], other)
+        self.assertIsNot(self.transport._manyIoctls, ioctls)
+        self.assertEqual(other, b"\x01\x58")
+
+
+    def testBatches(self):
+        requests = [(0x18, 0x05, 2)] * 30
+        buffer = bytearray(60)
+        self.transport.readManyInto(requests, buffer)
+        self.assertEqual(self.kernel.batches(), [I2C_RDWR_IOCTL_MAX_MSGS, 18])
+        self.assertEqual(buffer, b"\x01\x40" * 30)
+
+
+    def testNotCombined(self):
+        transport = LinuxI2C(1, combined = False)
+        buffer = bytearray(4)
+        transport.readManyInto(self.requests, buffer)
+        self.assertEqual(buffer, b"\x01\x40\x01\x58")
+        self.assertEqual(self.kernel.batches(), [])
+
+
+class ShortReadTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.kernel = FakeKernel({0x18: device(20)})
+        self.kernel.__enter__()
+        self.addCleanup(self.kernel.__exit__)
+        self.transport = LinuxI2C(1, combined = False)
+        self.kernel.shortRead = 1
+
+
+    def testRead(self):
+        with self.assertRaises(OSError):
+            self.transport.read(0x18, 0x05, 2)
+
+
+    def testReadInto(self):
+        with self.assertRaises(OSError):
+            self.transport.readInto(0x18, 0x05, bytearray(2))
+
+
+    def testFullRead(self):
+        self.kernel.shortRead = None
+        self.assertEqual(self.transport.read(0x18, 0x05, 2), b"\x01\x40")
@@ -0,0 +1,172 @@
+"""
+MuxBus and TCA9548 on a fake bus with muxes on it.
+"""
+
+import os, tempfile, unittest
+
+from mcp9808 import FakeDevice, FakeTransport
+from mcp9808.buslock import BusLock
+from mcp9808.mux import MuxBus
+
+
+"""
+A PCA9548/TCA9548 for the fake bus: a control register of channel bits, and
+the devices on each channel.
+"""
+class FakeMux:
+
+
+    def __init__(self):
+        self.mask = 0
+        self.channels = {channel: {} for channel in range(8)}
+
+
+    def write(self, register, values):
+        # The control byte arrives where a register pointer would
+        self.mask = register
+
+
+"""
+A FakeTransport that also reaches the devices on the open channels of any
+FakeMux in devices.
+"""
+class FakeMuxTransport(FakeTransport):
+
+
+    def _device(self, address):
+        if address not in self.devices:
+            for mux in self.devices.values():
+                if not isinstance(mux, FakeMux):
+                    continue
+                for channel, devices in mux.channels.items():
+                    if mux.mask & (1 << channel) and address in devices:
+                        self.transactions += 1
+                        return devices[address]
+        return FakeTransport._device(self, address)
+
+
+"""
+A FakeDevice reading temperature °C.
+"""
+def device(temperature):
+    device = FakeDevice()
+    device.registers[0x05] = int(temperature * 16)
+    return device
+
+
+class MuxTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.muxDevice = FakeMux()
+        self.transport = FakeMuxTransport({0x70: self.muxDevice})
+        self.bus = MuxBus(self.transport)
+        self.mux = self.bus.addMux(0x70)
+
+
+    def testSameAddressOnTwoChannels(self):
+        self.muxDevice.channels[0][0x18] = device(20)
+        self.muxDevice.channels[1][0x18] = device(25)
+        first = self.bus.addSensor(0x18, self.mux, 0)
+        second = self.bus.addSensor(0x18, self.mux, 1)
+        self.assertEqual(first.readTemp(), 20)
+        self.assertEqual(second.readTemp(), 25)
+        self.assertEqual(self.bus.readTemps(), [20, 25])
+
+
+    def testOtherProcessSwitchesMux(self):
+        # With the lock shared between processes, what this process last
+        # selected can't be trusted once it has let go of the lock
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        self.transport._lock = BusLock(path)
+        self.addCleanup(self.transport._lock.close)
+
+        self.muxDevice.channels[0][0x18] = device(20)
+        self.muxDevice.channels[1][0x18] = device(25)
+        sensor = self.bus.addSensor(0x18, self.mux, 0, checkID = False)
+        self.assertEqual(sensor.readTemp(), 20)
+        self.muxDevice.mask = 0b10
+        self.assertEqual(sensor.readTemp(), 20)
+
+        # Within one hold of the lock the selection is still remembered
+        with self.transport.lock:
+            sensor.readTemp()
+            switches = self.mux.switches
+            sensor.readTemp()
+            self.assertEqual(self.mux.switches, switches)
+
+
+    def testSelectionRememberedWithoutProcessLock(self):
+        self.muxDevice.channels[0][0x18] = device(20)
+        sensor = self.bus.addSensor(0x18, self.mux, 0, checkID = False)
+        sensor.readTemp()
+        sensor.readTemp()
+        self.assertEqual(self.mux.switches, 1)
+
+
+class PlanTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.muxDevices = [FakeMux(), FakeMux()]
+        self.transport = FakeMuxTransport({0x70: self.muxDevices[0],
+                                           0x71: self.muxDevices[1],
+                                           0x1A: device(30)})
+        self.bus = MuxBus(self.transport)
+        self.first = self.bus.addMux(0x70)
+        self.second = self.bus.addMux(0x71)
+        for mux, channel, address, temperature in (
+                (0, 0, 0x18, 20), (0, 1, 0x18, 21), (0, 2, 0x19, 22),
+                (1, 3, 0x18, 23)):
+            self.muxDevices[mux].channels[channel][address] = \
+                device(temperature)
+            self.bus.addSensor(address, self.bus.muxes[mux], channel,
+                               checkID = False)
+        self.bus.addSensor(0x1A, checkID = False)
+
+
+    def testGroups(self):
+        # Channels 0 and 2 have different addresses so are opened together,
+        # and the direct sensor joins the first group it doesn't clash with
+        self.assertEqual(self.bus.plan(),
+                         [(self.first, 0b101, [0, 2, 4]),
+                          (self.first, 0b010, [1]),
+                          (self.second, 0b1000, [3])])
+
+
+    def testWithoutCombine(self):
+        self.bus.combine = False
+        self.assertEqual(self.bus.plan(),
+                         [(self.first, 0b001, [0, 4]),
+                          (self.first, 0b010, [1]),
+                          (self.first, 0b100, [2]),
+                          (self.second, 0b1000, [3])])
+
+
+    def testDirectClash(self):
+        # Something at 0x18 on every group, so a direct 0x18 needs every mux
+        # switched off
+        self.bus.addSensor(0x18, checkID = False)
+        self.assertEqual(self.bus.plan()[-1], (None, 0, [5]))
+
+
+    def testStartsFromSelected(self):
+        self.first.selected = 0b010
+        self.assertEqual(self.bus.plan(),
+                         [(self.first, 0b010, [1]),
+                          (self.second, 0b1000, [3]),
+                          (self.first, 0b101, [0, 2, 4])])
+
+
+    def testSweepSelectsEachChannelOnce(self):
+        self.assertEqual(self.bus.readTemps(), [20, 21, 22, 23, 30])
+        self.assertEqual(self.bus.plan()[0], (self.second, 0b1000, [3]))
+        first = self.first.switches
+        second = self.second.switches
+        self.assertEqual(self.bus.readTemps(), [20, 21, 22, 23, 30])
+        # The second mux was left open, so it is read first without being
+        # selected again, then switched off for the first mux's two groups
+        self.assertEqual(self.second.switches, second + 1)
+        self.assertEqual(self.first.switches, first + 2)
@@ -0,0 +1,137 @@
+"""
+Regression tests for the background sampler and the window tracker.
+"""
+
+import errno, unittest
+
+from mcp9808 import FakeTransport, MCP9808
+from mcp9808.sampler import BackgroundSampler
+from mcp9808.simulator import SimulatedMCP9808
+from mcp9808.tracking import WindowTracker
+
+from .clock import FakeClock, simulatedSensor
+
+
+class SamplerBackoffTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.transport = FakeTransport({})
+        self.sensor = MCP9808(0x18, self.transport, checkID = False)
+        self.waits = []
+        # Runs the sampling loop on this thread, stopping after stopAfter
+        # waits or the first published value
+        self.stopAfter = 8
+        self.sampler = BackgroundSampler(self.sensor, maxBackoff = 1.0,
+                                         clock = self.clock, wait = self.wait)
+        publish = self.sampler._publish
+        def published(value):
+            publish(value)
+            self.sampler._stop.set()
+        self.sampler._publish = published
+
+
+    def wait(self, seconds):
+        self.waits.append(seconds)
+        self.clock.advance(seconds)
+        if len(self.waits) >= self.stopAfter:
+            self.sampler._stop.set()
+
+
+    def testMissingSensorBacksOff(self):
+        self.sampler._run()
+        # One conversion time, doubling up to maxBackoff
+        self.assertEqual(self.waits, [0.25, 0.5, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+        # One read of the resolution at the start, then one per wait
+        self.assertEqual(self.transport.transactions, 9)
+        self.assertEqual(self.sampler.errors, 8)
+        self.assertEqual(self.sampler.error.errno, errno.EREMOTEIO)
+
+
+    def testRecoversWhenSensorAppears(self):
+        device = SimulatedMCP9808(21.5, clock = self.clock)
+        wait = self.wait
+        def appear(seconds):
+            wait(seconds)
+            if len(self.waits) == 3:
+                self.transport.devices[0x18] = device
+        self.sampler.wait = appear
+        self.stopAfter = 20
+        self.sampler._run()
+        sequence, sample = self.sampler.latest
+        self.assertEqual(sequence, 1)
+        self.assertEqual(sample.temperature, 21.5)
+        self.assertEqual(self.sampler.errors, 3)
+
+
+    def testThread(self):
+        # The real thing, on its own thread with the real clock
+        sampler = BackgroundSampler(self.sensor, maxBackoff = 0.01)
+        sampler.start()
+        sampler.stop()
+        self.assertIsNone(sampler._thread)
+
+
+class TrackerTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.temperature = 25.125
+        self.sensor, self.device, self.clock = simulatedSensor(
+            lambda t: self.temperature)
+        self.clock.advance()
+        self.tracker = WindowTracker(self.sensor, delta = 0.5)
+
+
+    def moveTo(self, temperature):
+        self.temperature = temperature
+        self.clock.advance()
+
+
+    def testWindowRoundsOutwards(self):
+        changes = self.tracker.start()
+        self.assertEqual([sample.temperature for sensor, sample in changes],
+                         [25.125])
+        self.assertEqual(self.sensor._readTUpper(), 25.75)
+        self.assertEqual(self.sensor.readTLower(), 24.5)
+
+
+    def testNoAlertWithinDelta(self):
+        # Rounding tUpper in to 25.5 would raise the alert here while
+        # check() saw no change, leaving the alert stuck on
+        self.tracker.start()
+        self.moveTo(25.5625)
+        self.assertEqual(self.tracker.check(), [])
+        self.assertFalse(self.device.alertAsserted())
+
+
+    def testRecentres(self):
+        self.tracker.start()
+        self.moveTo(25.8125)
+        self.assertTrue(self.device.alertAsserted())
+        changes = self.tracker.check()
+        self.assertEqual([sample.temperature for sensor, sample in changes],
+                         [25.8125])
+        self.assertEqual(self.sensor._readTUpper(), 26.5)
+        self.assertEqual(self.sensor.readTLower(), 25.25)
+        self.clock.advance()
+        self.assertFalse(self.device.alertAsserted())
+        self.assertEqual(self.tracker.check(), [])
+
+
+    def testFallingAndNegative(self):
+        self.tracker.start()
+        self.moveTo(-3.0625)
+        changes = self.tracker.check()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(self.sensor._readTUpper(), -2.5)
+        self.assertEqual(self.sensor.readTLower(), -3.75)
+
+
+    def testClampsToLimitRange(self):
+        self.temperature = -19.9375
+        self.clock.advance()
+        self.tracker.start()
+        self.assertEqual(self.sensor.readTLower(), -20)
+        self.assertEqual(self.sensor._readTUpper(), -19.25)
@@ -0,0 +1,129 @@
+"""
+RetryPolicy tries, backoff, deadline and bus recovery, on a fake clock.
+"""
+
+import errno, unittest
+
+from mcp9808 import FakeDevice, FakeTransport, MCP9808
+from mcp9808.retry import RetryPolicy
+
+from .clock import FakeClock
+
+
+"""
+A transport that records the retries and recoveries asked of it.
+"""
+class RecordingTransport:
+
+
+    def __init__(self):
+        self.retries = []
+        self.recoveries = 0
+
+
+    def noteRetry(self, address, register):
+        self.retries.append((address, register))
+
+
+    def recover(self):
+        self.recoveries = self.recoveries + 1
+
+
+"""
+A function that fails failures times before returning "ok".  Each call
+takes a millisecond of clock time.
+"""
+class Flaky:
+
+
+    def __init__(self, clock, failures):
+        self.clock = clock
+        self.failures = failures
+        self.calls = 0
+
+
+    def __call__(self):
+        self.calls = self.calls + 1
+        self.clock.advance(0.001)
+        if self.calls <= self.failures:
+            raise OSError(errno.EREMOTEIO, "No ACK")
+        return "ok"
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sleeps = []
+        self.transport = RecordingTransport()
+
+
+    def policy(self, **kwargs):
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.clock.advance(seconds)
+        return RetryPolicy(clock = self.clock, sleep = sleep, **kwargs)
+
+
+    def testBackoff(self):
+        policy = self.policy(attempts = 5, backoff = 0.001, maxBackoff = 0.003,
+                             recoverAfter = 0)
+        function = Flaky(self.clock, 4)
+        self.assertEqual(policy.call(self.transport, [(0x18, 5)], function),
+                         "ok")
+        self.assertEqual(function.calls, 5)
+        self.assertEqual(self.sleeps, [0.001, 0.002, 0.003, 0.003])
+        self.assertEqual(self.transport.retries, [(0x18, 5)] * 4)
+        self.assertEqual(self.transport.recoveries, 0)
+
+
+    def testAttempts(self):
+        policy = self.policy(attempts = 3)
+        function = Flaky(self.clock, 5)
+        with self.assertRaises(OSError):
+            policy.call(self.transport, [(0x18, 5)], function)
+        self.assertEqual(function.calls, 3)
+        self.assertEqual(len(self.sleeps), 2)
+
+
+    def testDeadline(self):
+        # Tries at 1 ms, then waits of 10, 20, 40 ms: the third retry would
+        # start past 50 ms, so it isn't made
+        policy = self.policy(attempts = 10, backoff = 0.01, maxBackoff = 1,
+                             deadline = 0.05)
+        function = Flaky(self.clock, 10)
+        with self.assertRaises(OSError):
+            policy.call(self.transport, [], function)
+        self.assertEqual(self.sleeps, [0.01, 0.02])
+        self.assertEqual(function.calls, 3)
+        self.assertLessEqual(self.clock.now, 0.05)
+
+
+    def testRecover(self):
+        policy = self.policy(attempts = 5, recoverAfter = 2)
+        function = Flaky(self.clock, 4)
+        policy.call(self.transport, [(0x18, 5)], function)
+        # Asked after the second, third and fourth failures in a row
+        self.assertEqual(self.transport.recoveries, 3)
+
+
+    def testRecoverFailing(self):
+        def recover():
+            raise OSError(errno.ENODEV, "Gone")
+        self.transport.recover = recover
+        policy = self.policy(attempts = 3, recoverAfter = 1)
+        self.assertEqual(policy.call(self.transport, [],
+                                     Flaky(self.clock, 2)), "ok")
+
+
+    def testSensor(self):
+        # Every register access of a sensor goes through its policy
+        transport = FakeTransport({0x18: FakeDevice()})
+        sensor = MCP9808(0x18, transport, retry = self.policy())
+        device = transport.devices.pop(0x18)
+        with self.assertRaises(OSError):
+            sensor.readTemp()
+        self.assertEqual(len(self.sleeps), 2)
+        transport.devices[0x18] = device
+        self.assertEqual(sensor.readTemp(), 20)
@@ -0,0 +1,86 @@
+"""
+SampleLog writing, growing and reopening, and reading it back.
+"""
+
+import os, shutil, tempfile, time, unittest
+
+from mcp9808 import samplelog
+from mcp9808.samplelog import GROW_RECORDS, SampleLog, SampleLogReader
+
+
+class SampleLogTest(unittest.TestCase):
+
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "samples.log")
+
+
+    def testGrowAndReopen(self):
+        with SampleLog(self.path) as log:
+            for i in range(GROW_RECORDS + 10):
+                log.append(i & 0x1FFF, 0x18, float(i))
+            self.assertGreater(log.capacity, GROW_RECORDS)
+        # Trimmed to what was written
+        self.assertEqual(os.path.getsize(self.path), samplelog.HEADER.size
+                         + (GROW_RECORDS + 10) * samplelog.RECORD.size)
+
+        with SampleLog(self.path) as log:
+            self.assertEqual(len(log), GROW_RECORDS + 10)
+            log.append(0x0140, 0x19, float(GROW_RECORDS + 10))
+
+        reader = SampleLogReader(self.path)
+        self.addCleanup(reader.close)
+        records = list(reader.iterRecords())
+        self.assertEqual(len(records), GROW_RECORDS + 11)
+        self.assertEqual(records[0], (0.0, 0, 0x18))
+        self.assertEqual(records[-1], (GROW_RECORDS + 10.0, 0x0140, 0x19))
+
+
+    def testTimeRange(self):
+        with SampleLog(self.path) as log:
+            for i in range(100):
+                log.append(i, 0x18, 1000.0 + i)
+        reader = SampleLogReader(self.path)
+        self.addCleanup(reader.close)
+        self.assertEqual([raw for (t, raw, a) in reader.iterRecords(1010, 1013)],
+                         [10, 11, 12])
+        if samplelog.numpy is not None:
+            records = reader.timeRange(1010, 1013)
+            self.assertEqual(list(records["raw"]), [10, 11, 12])
+
+
+    def testTimestampsNeverGoBack(self):
+        # As if the clock was stepped back since the log was last written
+        future = time.time() + 3600
+        with SampleLog(self.path) as log:
+            log.append(0x0140, 0x18, future)
+        with SampleLog(self.path) as log:
+            log.append(0x0141, 0x18)
+            log.append(0x0142, 0x18)
+        reader = SampleLogReader(self.path)
+        self.addCleanup(reader.close)
+        timestamps = [t for (t, raw, a) in reader.iterRecords()]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(len(list(reader.iterRecords(future))), 3)
+
+
+    def testOutOfOrderTimestamp(self):
+        with SampleLog(self.path) as log:
+            log.append(0x0140, 0x18, 100.0)
+            with self.assertRaises(ValueError):
+                log.append(0x0140, 0x18, 99.0)
+            self.assertEqual(len(log), 1)
+
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "needs /proc")
+    def testNotALog(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a sample log at all, just some text" * 4)
+        descriptors = len(os.listdir("/proc/self/fd"))
+        with self.assertRaises(ValueError):
+            SampleLog(self.path)
+        with self.assertRaises(ValueError):
+            SampleLogReader(self.path)
+        self.assertEqual(len(os.listdir("/proc/self/fd")), descriptors)
@@ -0,0 +1,73 @@
+"""
+ConversionScheduler against the simulator's conversion timing.
+"""
+
+import unittest
+
+from mcp9808.scheduler import ConversionScheduler
+from mcp9808.simulator import ramp
+
+from .clock import simulatedSensor
+
+
+class SchedulerTest(unittest.TestCase):
+
+
+    def setUp(self):
+        # 0.25°C a conversion, so every conversion reads differently
+        self.sensor, self.device, self.clock = simulatedSensor(ramp(20, 1))
+        self.clock.advance()
+
+
+    def scheduler(self, **kwargs):
+        return ConversionScheduler(self.sensor, clock = self.clock,
+                                   sleep = self.clock.advance, **kwargs)
+
+
+    """
+    Read for seconds of simulated time and return the fresh samples.  Stops
+    on a fresh sample, so the last conversion isn't left half counted.
+    """
+    def readFor(self, scheduler, seconds = 100):
+        end = self.clock() + seconds
+        samples = []
+        fresh = False
+        while self.clock() < end or not fresh:
+            sample = scheduler.read()
+            fresh = sample.fresh
+            if fresh:
+                samples.append(sample)
+        return samples
+
+
+    def testEveryConversionOnce(self):
+        scheduler = self.scheduler()
+        samples = self.readFor(scheduler)
+        self.assertEqual(len(samples), self.device.conversions)
+        self.assertEqual(scheduler.repeats, 0)
+        temperatures = [sample.temperature for sample in samples]
+        self.assertEqual(len(set(temperatures)), len(temperatures))
+
+
+    def testSteadyTemperature(self):
+        self.device.waveform = lambda t: 21.5
+        scheduler = self.scheduler()
+        samples = self.readFor(scheduler)
+        self.assertEqual(len(samples), self.device.conversions)
+
+
+    def testSlowSensor(self):
+        # The sensor takes 2% longer than the scheduler expects, so now and
+        # then a read is early and the grid has to move to catch up
+        scheduler = self.scheduler()
+        scheduler.conversionTime = scheduler.conversionTime / 1.02
+        samples = self.readFor(scheduler)
+        self.assertEqual(len(samples), self.device.conversions)
+        self.assertLess(scheduler.repeats, len(samples) / 3)
+
+
+    def testRepeatIsNotFresh(self):
+        scheduler = self.scheduler()
+        self.assertTrue(scheduler.readNow().fresh)
+        self.assertFalse(scheduler.readNow().fresh)
+        self.assertEqual(scheduler.repeats, 1)
@@ -0,0 +1,118 @@
+"""
+InstrumentedTransport counting and timing on the fake bus.
+"""
+
+import unittest
+
+from mcp9808 import FakeDevice, FakeTransport, MCP9808
+from mcp9808.retry import RetryPolicy
+from mcp9808.stats import InstrumentedTransport
+
+
+"""
+A clock that moves on a millisecond every time it is read, so every
+transaction takes a millisecond.
+"""
+class TickingClock:
+
+
+    def __init__(self):
+        self.now = 0.0
+
+
+    def __call__(self):
+        self.now = self.now + 0.001
+        return self.now
+
+
+class InstrumentedTransportTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.inner = FakeTransport({0x18: FakeDevice(), 0x19: FakeDevice()})
+        self.transport = InstrumentedTransport(self.inner, TickingClock())
+        self.calls = []
+        self.transport.addHook(lambda *args: self.calls.append(args))
+
+
+    def testRead(self):
+        self.assertEqual(self.transport.read(0x18, 0x05, 2), b"\x01\x40")
+        buffer = bytearray(2)
+        self.transport.readInto(0x18, 0x05, buffer)
+        self.assertEqual(buffer, b"\x01\x40")
+        stats = self.transport.snapshot()["registers"]["0x18:0x5"]
+        self.assertEqual(stats["reads"], 2)
+        self.assertEqual(stats["bytes"], 4)
+        self.assertEqual(stats["errors"], 0)
+        self.assertAlmostEqual(stats["meanTime"], 0.001)
+        # A millisecond is under 1024 µs
+        self.assertEqual(stats["histogram"], {1024: 2})
+        self.assertEqual([call[:4] for call in self.calls],
+                         [("read", 0x18, 0x05, 2)] * 2)
+
+
+    def testError(self):
+        with self.assertRaises(OSError):
+            self.transport.read(0x1A, 0x05, 2)
+        stats = self.transport.registers[(0x1A, 0x05)]
+        self.assertEqual((stats.reads, stats.bytes, stats.errors), (1, 0, 1))
+        self.assertIsInstance(self.calls[0][5], OSError)
+
+
+    def testWrite(self):
+        self.transport.write(0x18, 0x01, [0x01, 0x00])
+        self.assertEqual(self.inner.devices[0x18].registers[0x01], 0x0100)
+        stats = self.transport.registers[(0x18, 0x01)]
+        self.assertEqual((stats.writes, stats.bytes), (1, 2))
+        self.assertEqual(self.calls[0][0], "write")
+
+
+    def testBatch(self):
+        requests = [(0x18, 0x05, 2), (0x19, 0x05, 2)]
+        self.assertEqual(self.transport.readMany(requests),
+                         [b"\x01\x40", b"\x01\x40"])
+        buffer = bytearray(4)
+        self.transport.readManyInto(requests, buffer)
+        self.assertEqual(buffer, b"\x01\x40\x01\x40")
+        snapshot = self.transport.snapshot()
+        self.assertEqual(snapshot["batches"], 2)
+        # The batch's time is shared between its registers
+        stats = snapshot["registers"]["0x19:0x5"]
+        self.assertEqual(stats["reads"], 2)
+        self.assertAlmostEqual(stats["totalTime"], 0.001)
+        self.assertEqual(snapshot["totals"]["reads"], 4)
+        self.assertEqual(snapshot["totals"]["bytes"], 8)
+
+
+    def testFailedBatch(self):
+        with self.assertRaises(OSError):
+            self.transport.readMany([(0x18, 0x05, 2), (0x1A, 0x05, 2)])
+        self.assertEqual(self.transport.registers[(0x18, 0x05)].errors, 1)
+        self.assertEqual(self.transport.registers[(0x1A, 0x05)].errors, 1)
+        self.assertEqual(self.transport.snapshot()["totals"]["errors"], 2)
+
+
+    def testRetries(self):
+        sensor = MCP9808(0x18, self.transport, checkID = False,
+                         retry = RetryPolicy(sleep = lambda seconds: None))
+        device = self.inner.devices.pop(0x18)
+        with self.assertRaises(OSError):
+            sensor.readTemp()
+        stats = self.transport.registers[(0x18, 0x05)]
+        self.assertEqual((stats.reads, stats.errors, stats.retries), (3, 3, 2))
+        self.inner.devices[0x18] = device
+        self.assertEqual(sensor.readTemp(), 20)
+
+
+    def testPassedThrough(self):
+        self.assertIs(self.transport.lock, self.inner.lock)
+        self.assertIs(self.transport.devices, self.inner.devices)
+
+
+    def testReset(self):
+        self.transport.readMany([(0x18, 0x05, 2)])
+        self.transport.reset()
+        snapshot = self.transport.snapshot()
+        self.assertEqual(snapshot["registers"], {})
+        self.assertEqual(snapshot["batches"], 0)
+        self.assertEqual(snapshot["totals"]["reads"], 0)